@@ -0,0 +1,41 @@
+"""Índices compostos para os filtros e ordenações dos routers
+
+Revision ID: 0002_query_indexes
+Revises: 0001_initial
+Create Date: 2026-10-18 00:00:00
+
+- orders: listagem por usuário / status / geral ordenada por (created_at, id)
+- order_items: carregamento dos itens por pedido e checagens por produto
+- products: categoria + id (cursor), categoria + preço e preço
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0002_query_indexes"
+down_revision: Union[str, None] = "0001_initial"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_orders_user_id_created_at_id", "orders", ["user_id", "created_at", "id"]),
+    ("ix_orders_status_created_at_id", "orders", ["status", "created_at", "id"]),
+    ("ix_orders_created_at_id", "orders", ["created_at", "id"]),
+    ("ix_order_items_order_id", "order_items", ["order_id"]),
+    ("ix_order_items_product_id", "order_items", ["product_id"]),
+    ("ix_products_category_id_id", "products", ["category_id", "id"]),
+    ("ix_products_category_id_price", "products", ["category_id", "price"]),
+    ("ix_products_price", "products", ["price"]),
+]
+
+
+def upgrade() -> None:
+    # if_not_exists: bancos criados com create_all já podem ter parte destes índices
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,68 @@
+"""Índice de busca textual de produtos (GIN no PostgreSQL, FTS5 no SQLite)
+
+Revision ID: 0003_product_search
+Revises: 0002_query_indexes
+Create Date: 2026-10-18 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import inspect
+
+
+revision: str = "0003_product_search"
+down_revision: Union[str, None] = "0002_query_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# DDL congelada (cópia de app.utils.search nesta revisão)
+FTS_TABLE = "products_fts"
+
+_SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        name, description,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name, description ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO products_fts(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+]
+
+_POSTGRES_DDL = [
+    """CREATE INDEX IF NOT EXISTS ix_products_search ON products USING gin (
+        to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))
+    )""",
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for statement in _POSTGRES_DDL:
+            op.execute(statement)
+    elif bind.dialect.name == "sqlite":
+        missing = not inspect(bind).has_table(FTS_TABLE)
+        for statement in _SQLITE_DDL:
+            op.execute(statement)
+        if missing:
+            op.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_products_search")
+    elif bind.dialect.name == "sqlite":
+        for trigger in ("ai", "ad", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
@@ -0,0 +1,112 @@
+"""Tabela de facetas do catálogo mantida por triggers em products
+
+Revision ID: 0004_product_facets
+Revises: 0003_product_search
+Create Date: 2026-10-18 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004_product_facets"
+down_revision: Union[str, None] = "0003_product_search"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# DDL congelada (cópia de app.utils.facets nesta revisão)
+FACETS_TABLE = "product_facets"
+PRICE_BUCKETS = [0, 50, 100, 250, 500, 1000, 2500, 5000]
+
+def _bucket_sql(price: str) -> str:
+    whens = " ".join(f"WHEN {price} < {upper} THEN {i}" for i, upper in enumerate(PRICE_BUCKETS[1:]))
+    return f"(CASE {whens} ELSE {len(PRICE_BUCKETS) - 1} END)"
+
+def _in_stock_sql(stock: str) -> str:
+    return f"(CASE WHEN {stock} > 0 THEN 1 ELSE 0 END)"
+
+def _add_sql(row: str) -> str:
+    return f"""INSERT INTO product_facets (category_id, price_bucket, product_count, in_stock_count)
+        VALUES ({row}.category_id, {_bucket_sql(f"{row}.price")}, 1, {_in_stock_sql(f"{row}.stock")})
+        ON CONFLICT (category_id, price_bucket) DO UPDATE SET
+            product_count = product_facets.product_count + 1,
+            in_stock_count = product_facets.in_stock_count + excluded.in_stock_count"""
+
+def _remove_sql(row: str) -> str:
+    return f"""UPDATE product_facets SET
+            product_count = product_count - 1,
+            in_stock_count = in_stock_count - {_in_stock_sql(f"{row}.stock")}
+        WHERE category_id = {row}.category_id AND price_bucket = {_bucket_sql(f"{row}.price")}"""
+
+_CHANGED = (
+    f"old.category_id <> new.category_id"
+    f" OR {_bucket_sql('old.price')} <> {_bucket_sql('new.price')}"
+    f" OR {_in_stock_sql('old.stock')} <> {_in_stock_sql('new.stock')}"
+)
+
+_SQLITE_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS product_facets_ai AFTER INSERT ON products BEGIN
+        {_add_sql("new")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS product_facets_ad AFTER DELETE ON products BEGIN
+        {_remove_sql("old")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS product_facets_au AFTER UPDATE OF price, stock, category_id ON products
+    WHEN {_CHANGED} BEGIN
+        {_remove_sql("old")};
+        {_add_sql("new")};
+    END""",
+]
+
+_POSTGRES_DDL = [
+    f"""CREATE OR REPLACE FUNCTION product_facets_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            {_remove_sql("OLD")};
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            {_add_sql("NEW")};
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS product_facets_aid ON products",
+    """CREATE TRIGGER product_facets_aid AFTER INSERT OR DELETE ON products
+        FOR EACH ROW EXECUTE FUNCTION product_facets_sync()""",
+    "DROP TRIGGER IF EXISTS product_facets_au ON products",
+    f"""CREATE TRIGGER product_facets_au AFTER UPDATE OF price, stock, category_id ON products
+        FOR EACH ROW WHEN ({_CHANGED}) EXECUTE FUNCTION product_facets_sync()""",
+]
+
+_REBUILD = [
+    "DELETE FROM product_facets",
+    f"""INSERT INTO product_facets (category_id, price_bucket, product_count, in_stock_count)
+        SELECT category_id, {_bucket_sql("price")}, count(*), sum({_in_stock_sql("stock")})
+        FROM products GROUP BY category_id, {_bucket_sql("price")}""",
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        FACETS_TABLE,
+        sa.Column("category_id", sa.Integer(), primary_key=True),
+        sa.Column("price_bucket", sa.Integer(), primary_key=True),
+        sa.Column("product_count", sa.Integer(), nullable=False),
+        sa.Column("in_stock_count", sa.Integer(), nullable=False),
+    )
+    ddl = {"sqlite": _SQLITE_DDL, "postgresql": _POSTGRES_DDL}.get(op.get_bind().dialect.name, [])
+    for statement in ddl + _REBUILD:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(f"DROP TRIGGER IF EXISTS {FACETS_TABLE}_aid ON products")
+        op.execute(f"DROP TRIGGER IF EXISTS {FACETS_TABLE}_au ON products")
+        op.execute(f"DROP FUNCTION IF EXISTS {FACETS_TABLE}_sync()")
+    elif bind.dialect.name == "sqlite":
+        for trigger in ("ai", "ad", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {FACETS_TABLE}_{trigger}")
+    op.drop_table(FACETS_TABLE)
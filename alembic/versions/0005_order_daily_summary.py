@@ -0,0 +1,63 @@
+"""Agregado diário de pedidos por status e categoria (painéis de admin)
+
+Revision ID: 0005_order_daily_summary
+Revises: 0004_product_facets
+Create Date: 2026-10-18 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0005_order_daily_summary"
+down_revision: Union[str, None] = "0004_product_facets"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# O tipo orderstatus já existe no PostgreSQL (0001_initial)
+order_status = postgresql.ENUM(
+    "PENDING", "PAID", "SHIPPED", "DELIVERED", "CANCELLED", name="orderstatus", create_type=False
+)
+
+# Recálculo congelado (categoria atual do produto); {day} depende do dialeto.
+# category_id = 0: total do dia/status, cada pedido conta uma vez
+_PER_CATEGORY = """
+    INSERT INTO order_daily_summary (day, status, category_id, order_count, units, revenue)
+    SELECT {day}, orders.status, products.category_id, count(DISTINCT orders.id),
+           sum(order_items.quantity), sum(order_items.price * order_items.quantity)
+    FROM orders
+    JOIN order_items ON order_items.order_id = orders.id
+    JOIN products ON products.id = order_items.product_id
+    GROUP BY {day}, orders.status, products.category_id
+"""
+_TOTALS = """
+    INSERT INTO order_daily_summary (day, status, category_id, order_count, units, revenue)
+    SELECT {day}, orders.status, 0, count(DISTINCT orders.id),
+           sum(order_items.quantity), sum(order_items.price * order_items.quantity)
+    FROM orders
+    JOIN order_items ON order_items.order_id = orders.id
+    GROUP BY {day}, orders.status
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "order_daily_summary",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("status", order_status, primary_key=True),
+        sa.Column("category_id", sa.Integer(), primary_key=True),
+        sa.Column("order_count", sa.Integer(), nullable=False),
+        sa.Column("units", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Float(), nullable=False),
+    )
+    bind = op.get_bind()
+    # date() no SQLite devolve 'YYYY-MM-DD', o mesmo formato do tipo Date
+    day = "date(orders.created_at)" if bind.dialect.name == "sqlite" else "CAST(orders.created_at AS DATE)"
+    op.execute(_PER_CATEGORY.format(day=day))
+    op.execute(_TOTALS.format(day=day))
+
+
+def downgrade() -> None:
+    op.drop_table("order_daily_summary")
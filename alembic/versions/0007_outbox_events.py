@@ -0,0 +1,36 @@
+"""Outbox transacional de eventos de pedidos
+
+Revision ID: 0007_outbox_events
+Revises: 0006_idempotency_keys
+Create Date: 2026-10-18 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0007_outbox_events"
+down_revision: Union[str, None] = "0006_idempotency_keys"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "outbox_events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("topic", sa.String(length=100), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("failed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_outbox_events_available_at", "outbox_events", ["available_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_events_available_at", table_name="outbox_events")
+    op.drop_table("outbox_events")
@@ -0,0 +1,59 @@
+"""Categoria do produto gravada em order_items no checkout
+
+Revision ID: 0008_order_item_category
+Revises: 0007_outbox_events
+Create Date: 2026-10-18 00:00:00
+
+order_daily_summary passa a usar a categoria do item em vez da categoria
+atual do produto; itens existentes recebem a categoria atual e o agregado
+é recalculado.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0008_order_item_category"
+down_revision: Union[str, None] = "0007_outbox_events"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Recálculo congelado (categoria gravada no item); {day} depende do dialeto.
+# category_id = 0: total do dia/status, cada pedido conta uma vez
+_PER_CATEGORY = """
+    INSERT INTO order_daily_summary (day, status, category_id, order_count, units, revenue)
+    SELECT {day}, orders.status, order_items.category_id, count(DISTINCT orders.id),
+           sum(order_items.quantity), sum(order_items.price * order_items.quantity)
+    FROM orders
+    JOIN order_items ON order_items.order_id = orders.id
+    WHERE order_items.category_id IS NOT NULL
+    GROUP BY {day}, orders.status, order_items.category_id
+"""
+_TOTALS = """
+    INSERT INTO order_daily_summary (day, status, category_id, order_count, units, revenue)
+    SELECT {day}, orders.status, 0, count(DISTINCT orders.id),
+           sum(order_items.quantity), sum(order_items.price * order_items.quantity)
+    FROM orders
+    JOIN order_items ON order_items.order_id = orders.id
+    GROUP BY {day}, orders.status
+"""
+
+
+def upgrade() -> None:
+    op.add_column("order_items", sa.Column("category_id", sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE order_items SET category_id = "
+        "(SELECT products.category_id FROM products WHERE products.id = order_items.product_id)"
+    )
+    bind = op.get_bind()
+    # date() no SQLite devolve 'YYYY-MM-DD', o mesmo formato do tipo Date
+    day = "date(orders.created_at)" if bind.dialect.name == "sqlite" else "CAST(orders.created_at AS DATE)"
+    op.execute("DELETE FROM order_daily_summary")
+    op.execute(_PER_CATEGORY.format(day=day))
+    op.execute(_TOTALS.format(day=day))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("order_items") as batch:
+        batch.drop_column("category_id")
@@ -0,0 +1,35 @@
+"""Status já somado em order_daily_summary (agregado atualizado pela outbox)
+
+Revision ID: 0009_order_summarized_status
+Revises: 0008_order_item_category
+Create Date: 2026-10-18 00:00:00
+
+Pedidos existentes já estão no agregado (recalculado em 0008) com o
+status atual.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0009_order_summarized_status"
+down_revision: Union[str, None] = "0008_order_item_category"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# O tipo orderstatus já existe no PostgreSQL (0001_initial)
+order_status = postgresql.ENUM(
+    "PENDING", "PAID", "SHIPPED", "DELIVERED", "CANCELLED", name="orderstatus", create_type=False
+)
+
+
+def upgrade() -> None:
+    op.add_column("orders", sa.Column("summarized_status", order_status, nullable=True))
+    op.execute("UPDATE orders SET summarized_status = status")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("orders") as batch:
+        batch.drop_column("summarized_status")
@@ -1,19 +1,88 @@
+from typing import Dict
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str 
+    ASYNC_MODE: bool = False  # usa AsyncSession e routers async
+    ASYNC_DATABASE_URL: str = ""  # vazio: deriva de DATABASE_URL (asyncpg/aiosqlite)
+
+    # Pool de conexões (por processo/réplica)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800  # segundos; -1 desativa
+    DB_POOL_PRE_PING: bool = True
+
+    # Readiness (/ready)
+    READINESS_TIMEOUT_SECONDS: float = 0.5  # prazo do SELECT 1 (inclui a espera por conexão)
+    READINESS_CACHE_SECONDS: float = 2.0  # resultado reaproveitado entre probes
+    READINESS_MAX_POOL_SATURATION: float = 1.0  # checked_out / (pool_size + max_overflow)
     
     # JWT
     SECRET_KEY: str 
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_CACHE_TTL_SECONDS: int = 30  # 0 desativa o cache do usuário autenticado
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # Hashing de senha (bcrypt)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: str = "process"  # process | thread
+    PASSWORD_HASH_WORKERS: int = 2  # 0 executa no próprio worker do request
+    PASSWORD_HASH_MAX_PENDING: int = 8
     
     # App
     APP_NAME: str = "E-commerce API"
     APP_VERSION: str = "1.0.0"
 
     ALLOWED_ORIGINS: str = "*"
+
+    # Performance
+    ORDER_LOADING_STRATEGY: str = "selectin"  # selectin | joined | lazy (lazy não funciona com ASYNC_MODE)
+    FAST_JSON_RESPONSES: bool = False  # orjson + listagens serializadas direto das colunas (requer orjson)
+    REQUEST_METRICS: bool = True  # SQL/tempo de banco/serialização por request, histogramas por rota em /metrics
+    SERVER_TIMING: bool = True  # devolve o resumo do request no header Server-Timing
+
+    # Idempotency-Key em POST /orders
+    IDEMPOTENCY_TTL_SECONDS: int = 86400  # por quanto tempo um retry devolve a resposta gravada
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 300  # intervalo mínimo entre limpezas de chaves expiradas (por processo)
+    IDEMPOTENCY_PURGE_BATCH: int = 500  # chaves expiradas removidas por limpeza
+
+    # Eventos de pedidos (outbox transacional + assinantes em background)
+    OUTBOX_WORKER: str = "inline"  # inline (task asyncio na API) | none (rodar python -m app.worker à parte)
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0  # espera máxima quando a fila está vazia
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_RETRY_BACKOFF_SECONDS: float = 2.0  # dobra a cada tentativa
+    STOCK_LOW_THRESHOLD: int = 5  # alerta quando um pedido deixa o produto com estoque abaixo disso
+
+    # Compressão das respostas (br/zstd só se os pacotes brotli/zstandard estiverem instalados)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_ENCODINGS: str = "zstd,br,gzip"  # ordem de preferência do servidor
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; respostas menores saem sem compressão
+    COMPRESSION_CONTENT_TYPES: str = "application/json,application/x-ndjson,text/csv,text/html,text/plain"
+    COMPRESSION_GZIP_LEVEL: int = 6  # 1-9
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11
+    COMPRESSION_ZSTD_LEVEL: int = 3  # 1-22
+
+    # Cache do catálogo (o estoque exibido pode ficar até CACHE_TTL_SECONDS desatualizado)
+    CACHE_BACKEND: str = "memory"  # memory | redis | none
+    CACHE_TTL_SECONDS: int = 60
+    CACHE_MAX_ENTRIES: int = 1024
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Cache HTTP (ETag): Cache-Control por rota (JSON no .env; vazio omite o header)
+    HTTP_CACHE_CONTROL: Dict[str, str] = {
+        "products.list": "public, no-cache",
+        "products.item": "public, no-cache",
+        "categories.list": "public, no-cache",
+        "categories.item": "public, no-cache",
+    }
+
+    # Importação em massa de produtos (registros por INSERT/commit)
+    BULK_IMPORT_BATCH_SIZE: int = 1000
     
     class Config:
         env_file = ".env"
@@ -2,9 +2,26 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.utils.instrumentation import instrument_engine
+from app.utils.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+
+def engine_options(url: str, poolclass) -> dict:
+    """Opções de pool vindas do Settings (SQLite em memória usa o pool padrão)"""
+    if url.startswith("sqlite") and ":memory:" in url:
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
 
 # Engine do banco
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, InstrumentedQueuePool))
+if settings.REQUEST_METRICS:
+    instrument_engine(engine)
 
 # Session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -18,4 +35,34 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Stack assíncrona (opcional, ASYNC_MODE=true)
+def async_database_url(url: str) -> str:
+    """Converte a URL síncrona para o driver assíncrono equivalente"""
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if url.startswith(("postgresql://", "postgresql+psycopg2://")):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    return url
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+def get_async_engine():
+    """Cria o engine assíncrono sob demanda (o driver só é importado se usado)"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+        _async_engine = create_async_engine(url, **engine_options(url, InstrumentedAsyncQueuePool))
+        if settings.REQUEST_METRICS:
+            instrument_engine(_async_engine.sync_engine)
+        _AsyncSessionLocal = async_sessionmaker(bind=_async_engine, autoflush=False)
+    return _async_engine
+
+async def get_async_db():
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
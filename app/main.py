@@ -1,17 +1,32 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import engine, Base
+from app.database import engine, Base, get_async_engine
 from app.models import User, Category, Product
 from app.routers import auth, categories, products
 from app.routers import auth, categories, products, orders
+from app.utils.cache import catalog_cache
+from app.utils.compression import CompressionMiddleware
+from app.utils.events import build_outbox_worker
+from app.utils.facets import ensure_facets
+from app.utils.health import ReadinessProbe
+from app.utils.instrumentation import RequestMetricsMiddleware, prometheus_text, request_metrics
+from app.utils.order_summary import ensure_order_summary
+from app.utils.pool import pool_metrics
+from app.utils.search import ensure_search_index
+from app.utils.serialization import default_response_class
 
 Base.metadata.create_all(bind=engine)
+ensure_search_index(engine)
+ensure_facets(engine)
+ensure_order_summary(engine)
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
-    description="API REST completa para e-commerce com autenticação JWT"
+    description="API REST completa para e-commerce com autenticação JWT",
+    default_response_class=default_response_class()
 )
 
 app.add_middleware(
@@ -22,11 +37,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=settings.COMPRESSION_ENCODINGS.split(","),
+        levels={
+            "gzip": settings.COMPRESSION_GZIP_LEVEL,
+            "br": settings.COMPRESSION_BROTLI_QUALITY,
+            "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+        },
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        content_types=settings.COMPRESSION_CONTENT_TYPES.split(","),
+    )
+
+if settings.REQUEST_METRICS:
+    # Por último: o mais externo, para medir também CORS e compressão
+    app.add_middleware(RequestMetricsMiddleware, server_timing=settings.SERVER_TIMING)
+
+if settings.ASYNC_MODE:
+    # Mesmos endpoints, executados com AsyncSession e driver assíncrono
+    from app.routers import aio
+    auth, categories, products, orders = aio.auth, aio.categories, aio.products, aio.orders
+
 app.include_router(auth.router)
 app.include_router(categories.router)
 app.include_router(products.router)
 app.include_router(orders.router)
 
+outbox_worker = build_outbox_worker(engine)
+
+if settings.OUTBOX_WORKER == "inline":
+    @app.on_event("startup")
+    async def start_outbox_worker():
+        outbox_worker.start()
+
+    @app.on_event("shutdown")
+    async def stop_outbox_worker():
+        await outbox_worker.stop()
+
 @app.get("/")
 def read_root():
     return {
@@ -35,6 +83,59 @@ def read_root():
         "docs": "/docs"
     }
 
+def _pool_engines():
+    engines = [("sync", engine)]
+    if settings.ASYNC_MODE:
+        engines.append(("async", get_async_engine()))
+    return engines
+
+readiness_probe = ReadinessProbe(
+    engine,
+    _pool_engines,
+    catalog_cache,
+    timeout=settings.READINESS_TIMEOUT_SECONDS,
+    ttl=settings.READINESS_CACHE_SECONDS,
+    max_saturation=settings.READINESS_MAX_POOL_SATURATION,
+)
+
 @app.get("/health")
 def health_check():
-    return {"status": "ok", "database": "connected"}
\ No newline at end of file
+    """Liveness: o processo responde (não consulta o banco)"""
+    return {"status": "ok"}
+
+@app.get("/ready")
+def readiness_check():
+    """Readiness: SELECT 1 com prazo, saturação do pool e estado do cache (503 se indisponível)"""
+    ready, report = readiness_probe.check()
+    return JSONResponse(report, status_code=200 if ready else 503)
+
+@app.get("/cache/stats")
+def cache_stats():
+    """Contadores de hit/miss do cache do catálogo"""
+    return catalog_cache.stats()
+
+@app.get("/metrics/pool")
+def database_pool_metrics():
+    """Estado do pool de conexões e histograma do tempo de espera por conexão"""
+    metrics = {"sync": pool_metrics(engine)}
+    if settings.ASYNC_MODE:
+        metrics["async"] = pool_metrics(get_async_engine())
+    return metrics
+
+@app.get("/metrics/requests")
+def request_metrics_snapshot():
+    """Histogramas por rota e o statement SQL mais lento visto em cada uma"""
+    return request_metrics.snapshot()
+
+@app.get("/metrics/outbox")
+def outbox_metrics():
+    """Fila de eventos de pedidos: pendentes, descartados e entregas deste processo"""
+    return outbox_worker.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Métricas no formato do Prometheus (requests por rota, pool e cache do catálogo)"""
+    return PlainTextResponse(
+        prometheus_text(pool=pool_metrics(engine), cache=catalog_cache.stats()),
+        media_type="text/plain; version=0.0.4"
+    )
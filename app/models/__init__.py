@@ -1,6 +1,11 @@
 from app.models.user import User
 from app.models.category import Category
 from app.models.product import Product
+from app.models.product_facet import ProductFacet
 from app.models.order import Order, OrderItem, OrderStatus
+from app.models.order_summary import OrderDailySummary
+from app.models.idempotency import IdempotencyKey
+from app.models.outbox import OutboxEvent
 
-__all__ = ["User", "Category", "Product", "Order", "OrderItem", "OrderStatus"]
\ No newline at end of file
+__all__ = ["User", "Category", "Product", "ProductFacet", "Order", "OrderItem", "OrderStatus", "OrderDailySummary",
+           "IdempotencyKey", "OutboxEvent"]
\ No newline at end of file
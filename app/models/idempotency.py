@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, String, Text
+from datetime import datetime
+from app.database import Base
+
+class IdempotencyKey(Base):
+    """
+    Resposta gravada para um Idempotency-Key (app.utils.idempotency).
+
+    key é o hash de (usuário, header); a linha é inserida na mesma
+    transação do pedido, então só existe se o pedido foi criado.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(32), primary_key=True)
+    request_hash = Column(String(32), nullable=False)
+    response = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Date, Float, Integer, Enum as SQLEnum
+from app.database import Base
+from app.models.order import OrderStatus
+
+class OrderDailySummary(Base):
+    """
+    Agregado diário de pedidos por (dia, status, categoria).
+
+    Atualizado incrementalmente pelo worker da outbox a partir dos eventos
+    de pedido (app.utils.order_summary). category_id = 0 é a linha com o total do
+    dia/status: um pedido com itens de várias categorias conta uma vez nela.
+    """
+    __tablename__ = "order_daily_summary"
+
+    day = Column(Date, primary_key=True)
+    status = Column(SQLEnum(OrderStatus), primary_key=True)
+    category_id = Column(Integer, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
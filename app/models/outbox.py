@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text
+from datetime import datetime
+from app.database import Base
+
+class OutboxEvent(Base):
+    """
+    Evento gravado na mesma transação que o originou (outbox transacional).
+
+    O OutboxWorker (app.utils.events) entrega os eventos aos assinantes e
+    apaga os entregues; falhas voltam para a fila com backoff até
+    OUTBOX_MAX_ATTEMPTS e então ficam marcadas em failed_at.
+    """
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True)
+    topic = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    available_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    failed_at = Column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index, Text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -15,4 +15,12 @@ class Product(Base):
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
-    category = relationship("Category", back_populates="products")
\ No newline at end of file
+    category = relationship("Category", back_populates="products")
+    
+    __table_args__ = (
+        # Paginação por cursor (id) filtrando por categoria
+        Index("ix_products_category_id_id", "category_id", "id"),
+        # Filtros de get_products: categoria + faixa de preço, ou só preço
+        Index("ix_products_category_id_price", "category_id", "price"),
+        Index("ix_products_price", "price"),
+    )
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer
+from app.database import Base
+
+class ProductFacet(Base):
+    """
+    Contagem de produtos por (categoria, faixa de preço).
+
+    Mantida por triggers em products (app.utils.facets), inclusive para
+    UPDATEs em massa como a reserva de estoque.
+    """
+    __tablename__ = "product_facets"
+
+    category_id = Column(Integer, primary_key=True)
+    price_bucket = Column(Integer, primary_key=True)
+    product_count = Column(Integer, nullable=False, default=0)
+    in_stock_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,3 @@
+from app.routers.aio import auth, categories, products, orders
+
+__all__ = ["auth", "categories", "products", "orders"]
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import timedelta
+
+from app.database import get_async_db
+from app.models.user import User
+from app.schemas.user import UserCreate, UserLogin, User as UserSchema, Token
+from app.utils.security import (
+    PasswordPoolBusy, create_access_token, get_password_hash, run_password_task_async, verify_password
+)
+from app.utils.dependencies import AuthenticatedUser, get_current_user_async
+from app.utils.instrumentation import TimedRoute
+from app.config import settings
+
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=TimedRoute)
+
+async def _password_task(fn, *args):
+    try:
+        return await run_password_task_async(fn, *args)
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado. Tente novamente em instantes",
+            headers={"Retry-After": "1"},
+        )
+
+@router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(User).filter(User.email == user.email))
+    if result.scalars().first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email já cadastrado"
+        )
+    
+    hashed_password = await _password_task(get_password_hash, user.password)
+    new_user = User(
+        email=user.email,
+        full_name=user.full_name,
+        hashed_password=hashed_password
+    )
+    
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    
+    return new_user
+
+@router.post("/login", response_model=Token)
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(User).filter(User.email == user_credentials.email))
+    user = result.scalars().first()
+    
+    if not user or not await _password_task(verify_password, user_credentials.password, user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Email ou senha incorretos",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Usuário inativo"
+        )
+    
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user.email},
+        expires_delta=access_token_expires
+    )
+    
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.get("/me", response_model=UserSchema)
+async def get_me(current_user: AuthenticatedUser = Depends(get_current_user_async)):
+    """
+    Retorna dados do usuário logado
+    """
+    return current_user
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, Request, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+
+from app.database import get_async_db
+from app.routers import categories
+from app.routers.aio.common import run_endpoint
+from app.schemas.category import Category as CategorySchema, CategoryCreate, CategoryUpdate
+from app.schemas.pagination import CursorPage
+from app.utils.dependencies import get_current_admin_user_async
+from app.utils.instrumentation import TimedRoute
+
+router = APIRouter(prefix="/categories", tags=["Categories"], route_class=TimedRoute)
+
+@router.get("/", response_model=Union[List[CategorySchema], CursorPage[CategorySchema]])
+async def get_categories(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Paginação por cursor (vazio para a primeira página)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_endpoint(
+        db, categories.get_categories, Union[List[CategorySchema], CursorPage[CategorySchema]],
+        request=request, response=response, skip=skip, limit=limit, cursor=cursor
+    )
+
+@router.get("/{category_id}", response_model=CategorySchema)
+async def get_category(
+    category_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_endpoint(
+        db, categories.get_category, CategorySchema,
+        category_id=category_id, request=request, response=response
+    )
+
+@router.post("/", response_model=CategorySchema, status_code=status.HTTP_201_CREATED)
+async def create_category(
+    category: CategoryCreate,
+    db: AsyncSession = Depends(get_async_db),
+    _current_user = Depends(get_current_admin_user_async)
+):
+    return await run_endpoint(
+        db, categories.create_category, CategorySchema,
+        category=category, _current_user=_current_user
+    )
+
+@router.put("/{category_id}", response_model=CategorySchema)
+async def update_category(
+    category_id: int,
+    category_update: CategoryUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_admin_user_async)
+):
+    return await run_endpoint(
+        db, categories.update_category, CategorySchema,
+        category_id=category_id, category_update=category_update, current_user=current_user
+    )
+
+@router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_category(
+    category_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_admin_user_async)
+):
+    return await run_endpoint(
+        db, categories.delete_category,
+        category_id=category_id, current_user=current_user
+    )
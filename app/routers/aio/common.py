@@ -0,0 +1,37 @@
+from functools import lru_cache
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.utils.instrumentation import serialization_timer
+
+@lru_cache(maxsize=None)
+def _adapter(response_model) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+async def run_endpoint(db: AsyncSession, endpoint, response_model=None, **kwargs):
+    """
+    Executa um endpoint síncrono com a AsyncSession via run_sync.
+
+    A lógica (filtros, cache, reserva de estoque...) é a mesma dos routers
+    síncronos, mas o I/O do banco passa pelo driver assíncrono. A resposta
+    é serializada ainda dentro do run_sync, porque lazy loads fora dele não
+    são permitidos com AsyncSession.
+
+    O endpoint precisa carregar (eager) tudo o que o response_model lê: um
+    lazy load durante a validação do Pydantic troca de greenlet no meio do
+    código nativo e corrompe a validação sob concorrência.
+    """
+    def call(session):
+        result = endpoint(db=session, **kwargs)
+        # Response pronta (FAST_JSON_RESPONSES) já está serializada
+        if response_model is None or result is None or isinstance(result, Response):
+            return result
+        adapter = _adapter(response_model)
+        with serialization_timer():
+            return adapter.dump_python(
+                adapter.validate_python(result, from_attributes=True),
+                mode="json"
+            )
+
+    return await db.run_sync(call)
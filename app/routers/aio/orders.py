@@ -0,0 +1,129 @@
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+
+from app.database import get_async_db
+from app.models.order import OrderStatus
+from app.routers import orders
+from app.routers.aio.common import run_endpoint
+from app.schemas.order import (
+    CategoryOrderSummary, DailyOrderSummary, OrderCreate, OrderResponse, OrderStatusUpdate
+)
+from app.schemas.pagination import CursorPage
+from app.utils.dependencies import AuthenticatedUser, get_current_user_async, get_current_admin_user_async
+from app.utils.export import MEDIA_TYPES, order_export_query, stream_order_export_async
+from app.utils.instrumentation import TimedRoute
+
+router = APIRouter(prefix="/orders", tags=["Orders"], route_class=TimedRoute)
+
+@router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
+async def create_order(
+    order_data: OrderCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(
+        None, max_length=255, description="Retries com a mesma chave devolvem o pedido já criado"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_async)
+):
+    return await run_endpoint(
+        db, orders.create_order, OrderResponse,
+        order_data=order_data, response=response, idempotency_key=idempotency_key, current_user=current_user
+    )
+
+@router.get("/", response_model=Union[List[OrderResponse], CursorPage[OrderResponse]])
+async def get_my_orders(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Paginação por cursor (vazio para a primeira página)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_async)
+):
+    """Lista pedidos do usuário logado"""
+    return await run_endpoint(
+        db, orders.get_my_orders, Union[List[OrderResponse], CursorPage[OrderResponse]],
+        skip=skip, limit=limit, cursor=cursor, current_user=current_user
+    )
+
+@router.get("/{order_id}", response_model=OrderResponse)
+async def get_order(
+    order_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthenticatedUser = Depends(get_current_user_async)
+):
+    return await run_endpoint(
+        db, orders.get_order, OrderResponse,
+        order_id=order_id, current_user=current_user
+    )
+
+@router.get("/admin/all", response_model=Union[List[OrderResponse], CursorPage[OrderResponse]])
+async def get_all_orders(
+    skip: int = 0,
+    limit: int = 100,
+    status: OrderStatus = None,
+    cursor: Optional[str] = Query(None, description="Paginação por cursor (vazio para a primeira página)"),
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: AuthenticatedUser = Depends(get_current_admin_user_async)
+):
+    return await run_endpoint(
+        db, orders.get_all_orders, Union[List[OrderResponse], CursorPage[OrderResponse]],
+        skip=skip, limit=limit, status=status, cursor=cursor, _current_user=_current_user
+    )
+
+@router.get("/admin/export")
+async def export_orders(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: OrderStatus = None,
+    created_from: Optional[datetime] = Query(None, description="Inclusivo"),
+    created_to: Optional[datetime] = Query(None, description="Exclusivo"),
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: AuthenticatedUser = Depends(get_current_admin_user_async)
+):
+    query = order_export_query(status, created_from, created_to)
+    return StreamingResponse(
+        stream_order_export_async(db.bind, query, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{format}"'}
+    )
+
+@router.get("/admin/analytics/daily", response_model=List[DailyOrderSummary])
+async def get_daily_analytics(
+    date_from: Optional[date] = Query(None, description="Inclusivo"),
+    date_to: Optional[date] = Query(None, description="Inclusivo"),
+    status: OrderStatus = None,
+    category_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: AuthenticatedUser = Depends(get_current_admin_user_async)
+):
+    return await run_endpoint(
+        db, orders.get_daily_analytics, List[DailyOrderSummary],
+        date_from=date_from, date_to=date_to, status=status, category_id=category_id,
+        _current_user=_current_user
+    )
+
+@router.get("/admin/analytics/categories", response_model=List[CategoryOrderSummary])
+async def get_category_analytics(
+    date_from: Optional[date] = Query(None, description="Inclusivo"),
+    date_to: Optional[date] = Query(None, description="Inclusivo"),
+    status: OrderStatus = None,
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: AuthenticatedUser = Depends(get_current_admin_user_async)
+):
+    return await run_endpoint(
+        db, orders.get_category_analytics, List[CategoryOrderSummary],
+        date_from=date_from, date_to=date_to, status=status, _current_user=_current_user
+    )
+
+@router.put("/{order_id}/status", response_model=OrderResponse)
+async def update_order_status(
+    order_id: int,
+    status_update: OrderStatusUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    _current_user: AuthenticatedUser = Depends(get_current_admin_user_async)
+):
+    return await run_endpoint(
+        db, orders.update_order_status, OrderResponse,
+        order_id=order_id, status_update=status_update, _current_user=_current_user
+    )
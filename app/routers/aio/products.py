@@ -0,0 +1,128 @@
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, Request, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Union
+
+from app.config import settings
+from app.database import get_async_db
+from app.routers import products
+from app.routers.aio.common import run_endpoint
+from app.schemas.pagination import CursorPage
+from app.schemas.stock import StockAdjustmentBatch, StockLevel
+from app.schemas.product import (
+    Product as ProductSchema, ProductCreate, ProductFacets, ProductImportReport, ProductUpdate,
+    ProductWithCategory
+)
+from app.utils.bulk import import_format, import_records, iter_lines, iter_records, upsert_products
+from app.utils.cache import catalog_cache
+from app.utils.dependencies import get_current_admin_user_async
+from app.utils.instrumentation import TimedRoute
+
+router = APIRouter(prefix="/products", tags=["Products"], route_class=TimedRoute)
+
+@router.get("/", response_model=Union[List[ProductWithCategory], CursorPage[ProductWithCategory]])
+async def get_products(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    category_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Paginação por cursor (vazio para a primeira página)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_endpoint(
+        db, products.get_products, Union[List[ProductWithCategory], CursorPage[ProductWithCategory]],
+        request=request, response=response, skip=skip, limit=limit, category_id=category_id,
+        min_price=min_price, max_price=max_price, search=search, cursor=cursor
+    )
+
+@router.get("/facets", response_model=ProductFacets)
+async def get_product_facets(
+    category_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    search: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_endpoint(
+        db, products.get_product_facets, ProductFacets,
+        category_id=category_id, min_price=min_price, max_price=max_price, search=search
+    )
+
+@router.get("/{product_id}", response_model=ProductWithCategory)
+async def get_product(
+    product_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await run_endpoint(
+        db, products.get_product, ProductWithCategory,
+        product_id=product_id, request=request, response=response
+    )
+
+@router.post("/", response_model=ProductSchema, status_code=status.HTTP_201_CREATED)
+async def create_product(
+    product: ProductCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_admin_user_async)
+):
+    return await run_endpoint(
+        db, products.create_product, ProductSchema,
+        product=product, current_user=current_user
+    )
+
+@router.post("/import", response_model=ProductImportReport)
+async def import_products(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Padrão: pelo Content-Type"),
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_admin_user_async)
+):
+    records = iter_records(iter_lines(request.stream()), import_format(request.headers.get("content-type"), format))
+    report = await import_records(
+        records,
+        lambda batch: db.run_sync(upsert_products, batch),
+        batch_size or settings.BULK_IMPORT_BATCH_SIZE,
+    )
+    if report.inserted or report.updated:
+        catalog_cache.invalidate("products")
+    return asdict(report)
+
+@router.patch("/stock", response_model=List[StockLevel])
+async def adjust_products_stock(
+    batch: StockAdjustmentBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_admin_user_async)
+):
+    return await run_endpoint(
+        db, products.adjust_products_stock, List[StockLevel],
+        batch=batch, current_user=current_user
+    )
+
+@router.put("/{product_id}", response_model=ProductSchema)
+async def update_product(
+    product_id: int,
+    product_update: ProductUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_admin_user_async)
+):
+    return await run_endpoint(
+        db, products.update_product, ProductSchema,
+        product_id=product_id, product_update=product_update, current_user=current_user
+    )
+
+@router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_product(
+    product_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_admin_user_async)
+):
+    return await run_endpoint(
+        db, products.delete_product,
+        product_id=product_id, current_user=current_user
+    )
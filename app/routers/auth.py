@@ -5,11 +5,24 @@ from datetime import timedelta
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, User as UserSchema, Token
-from app.utils.security import get_password_hash, verify_password, create_access_token
-from app.utils.dependencies import get_current_user
+from app.utils.security import (
+    PasswordPoolBusy, create_access_token, get_password_hash, run_password_task, verify_password
+)
+from app.utils.dependencies import AuthenticatedUser, get_current_user
+from app.utils.instrumentation import TimedRoute
 from app.config import settings
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=TimedRoute)
+
+def _password_task(fn, *args):
+    try:
+        return run_password_task(fn, *args)
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado. Tente novamente em instantes",
+            headers={"Retry-After": "1"},
+        )
 
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
 def register(user: UserCreate, db: Session = Depends(get_db)):
@@ -20,7 +33,7 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
             detail="Email já cadastrado"
         )
     
-    hashed_password = get_password_hash(user.password)
+    hashed_password = _password_task(get_password_hash, user.password)
     new_user = User(
         email=user.email,
         full_name=user.full_name,
@@ -37,7 +50,7 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
 def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.email == user_credentials.email).first()
     
-    if not user or not verify_password(user_credentials.password, user.hashed_password):
+    if not user or not _password_task(verify_password, user_credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email ou senha incorretos",
@@ -59,7 +72,7 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserSchema)
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: AuthenticatedUser = Depends(get_current_user)):
     """
     Retorna dados do usuário logado
     """
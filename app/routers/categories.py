@@ -1,32 +1,73 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 
+from app.config import settings
 from app.database import get_db
 from app.models.category import Category
 from app.schemas.category import Category as CategorySchema, CategoryCreate, CategoryUpdate
+from app.schemas.pagination import CursorPage
+from app.utils.cache import catalog_cache
 from app.utils.dependencies import get_current_admin_user
+from app.utils.http_cache import cached_representation, conditional_response, etag_for
+from app.utils.instrumentation import TimedRoute
+from app.utils.pagination import keyset_page
+from app.utils.serialization import CATEGORY_COLUMNS, category_dict, json_response
 
-router = APIRouter(prefix="/categories", tags=["Categories"])
+router = APIRouter(prefix="/categories", tags=["Categories"], route_class=TimedRoute)
 
-@router.get("/", response_model=List[CategorySchema])
+@router.get("/", response_model=Union[List[CategorySchema], CursorPage[CategorySchema]])
 def get_categories(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Paginação por cursor (vazio para a primeira página)"),
     db: Session = Depends(get_db)
 ):
-    categories = db.query(Category).offset(skip).limit(limit).all()
-    return categories
+    cache_key = catalog_cache.key(
+        "categories", "list",
+        skip=skip if cursor is None else None,
+        limit=limit,
+        cursor=cursor,
+    )
+    fast = settings.FAST_JSON_RESPONSES
+    
+    def build():
+        if fast:
+            query = db.query(*CATEGORY_COLUMNS)
+            if cursor is not None:
+                rows, next_cursor = keyset_page(query, [Category.id], cursor, limit)
+                return {"items": [category_dict(row) for row in rows], "next_cursor": next_cursor}
+            return [category_dict(row) for row in query.offset(skip).limit(limit)]
+        
+        if cursor is not None:
+            categories, next_cursor = keyset_page(db.query(Category), [Category.id], cursor, limit)
+            return CursorPage[CategorySchema].model_validate(
+                {"items": categories, "next_cursor": next_cursor}
+            ).model_dump(mode="json")
+        categories = db.query(Category).offset(skip).limit(limit).all()
+        return [CategorySchema.model_validate(c).model_dump(mode="json") for c in categories]
+    
+    data, etag = cached_representation(cache_key, build)
+    return conditional_response(request, response, "categories.list", data, etag, fast=fast)
 
 @router.get("/{category_id}", response_model=CategorySchema)
-def get_category(category_id: int, db: Session = Depends(get_db)):
-    category = db.query(Category).filter(Category.id == category_id).first()
+def get_category(
+    category_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    category = db.query(*CATEGORY_COLUMNS).filter(Category.id == category_id).first()
     if not category:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Categoria não encontrada"
         )
-    return category
+    # Categoria não tem updated_at: a ETag vem da própria linha (nome, descrição, id)
+    data = category_dict(category)
+    return conditional_response(request, response, "categories.item", data, etag_for(data))
 
 @router.post("/", response_model=CategorySchema, status_code=status.HTTP_201_CREATED)
 def create_category(
@@ -44,6 +85,7 @@ def create_category(
     new_category = Category(**category.dict())
     db.add(new_category)
     db.commit()
+    catalog_cache.invalidate("categories")
     db.refresh(new_category)
     return new_category
 
@@ -65,6 +107,8 @@ def update_category(
         setattr(category, key, value)
     
     db.commit()
+    # Produtos embutem a categoria (ProductWithCategory)
+    catalog_cache.invalidate("categories", "products")
     db.refresh(category)
     return category
 
@@ -89,4 +133,5 @@ def delete_category(
     
     db.delete(category)
     db.commit()
+    catalog_cache.invalidate("categories")
     return None
@@ -1,34 +1,89 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import date, datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional, Union
 
+from app.config import settings
 from app.database import get_db
-from app.models.user import User
 from app.models.order import Order, OrderItem, OrderStatus
-from app.models.product import Product
-from app.schemas.order import OrderCreate, OrderResponse, OrderStatusUpdate
-from app.utils.dependencies import get_current_user, get_current_admin_user
+from app.schemas.order import (
+    CategoryOrderSummary, DailyOrderSummary, OrderCreate, OrderResponse, OrderStatusUpdate
+)
+from app.schemas.pagination import CursorPage
+from app.utils.dependencies import AuthenticatedUser, get_current_user, get_current_admin_user
+from app.utils.events import enqueue
+from app.utils.export import MEDIA_TYPES, order_export_query, stream_order_export
+from app.utils.idempotency import (
+    IdempotencyKeyReusedError, claim_key, request_fingerprint, save_response, scoped_key, stored_response
+)
+from app.utils.instrumentation import TimedRoute
+from app.utils.order_summary import category_summary, daily_summary
+from app.utils.pagination import keyset_page
+from app.utils.serialization import ORDER_COLUMNS, json_response, order_dicts
+from app.utils.stock import InsufficientStockError, lock_products, reserve_stock
 
-router = APIRouter(prefix="/orders", tags=["Orders"])
+router = APIRouter(prefix="/orders", tags=["Orders"], route_class=TimedRoute)
 
-@router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
-def create_order(
-    order_data: OrderCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
+def order_load_options(strategy: str = None):
+    """
+    Opções de carregamento de Order.items e OrderItem.product.
+
+    - selectin: 1 query para os pedidos + 1 para itens e produtos
+    - joined: tudo em uma única query com JOIN
+    - lazy: comportamento padrão do ORM (N+1)
+    """
+    strategy = strategy or settings.ORDER_LOADING_STRATEGY
+    if strategy == "selectin":
+        return [selectinload(Order.items).joinedload(OrderItem.product)]
+    if strategy == "joined":
+        return [joinedload(Order.items).joinedload(OrderItem.product)]
+    if strategy == "lazy":
+        return []
+    raise ValueError(f"Estratégia de carregamento inválida: {strategy}")
+
+def _list_orders(db: Session, query, skip: int, limit: int, cursor: Optional[str]):
+    """Paginação (offset ou cursor) comum às listagens de pedidos"""
+    if settings.FAST_JSON_RESPONSES:
+        # Colunas + uma query de itens, sem objetos ORM nem validação Pydantic
+        query = query.with_entities(*ORDER_COLUMNS)
+        if cursor is not None:
+            rows, next_cursor = keyset_page(
+                query, [Order.created_at, Order.id], cursor, limit, descending=True
+            )
+            return json_response({"items": order_dicts(db, rows), "next_cursor": next_cursor})
+        return json_response(order_dicts(db, query.offset(skip).limit(limit).all()))
+    
+    query = query.options(*order_load_options())
+    if cursor is not None:
+        orders, next_cursor = keyset_page(
+            query, [Order.created_at, Order.id], cursor, limit, descending=True
+        )
+        return {"items": orders, "next_cursor": next_cursor}
+    
+    return query.offset(skip).limit(limit).all()
+
+def _place_order(db: Session, order_data: OrderCreate, current_user: AuthenticatedUser) -> int:
+    """Valida e reserva o estoque, grava o pedido e os itens (sem commit); retorna o id"""
+    # Carrega (e trava, em ordem de id) todos os produtos do carrinho em uma única query
+    products = lock_products(db, {item.product_id for item in order_data.items})
+    
     total = 0
-    order_items_data = []
+    order_items = []
+    requested = {}
     
     for item in order_data.items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
+        product = products.get(item.product_id)
         if not product:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Produto {item.product_id} não encontrado"
             )
         
-        if product.stock < item.quantity:
+        # Soma a quantidade caso o mesmo produto apareça em mais de uma linha
+        requested[product.id] = requested.get(product.id, 0) + item.quantity
+        if product.stock < requested[product.id]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Estoque insuficiente para {product.name}. Disponível: {product.stock}"
@@ -37,13 +92,23 @@ def create_order(
         subtotal = product.price * item.quantity
         total += subtotal
         
-        order_items_data.append({
-            "product": product,
+        order_items.append({
             "product_id": product.id,
             "quantity": item.quantity,
-            "price": product.price
+            "price": product.price,
+            # Categoria no momento da compra (agregado diário não muda se o produto for recategorizado)
+            "category_id": product.category_id
         })
     
+    # Reserva atômica: protege contra checkouts concorrentes do mesmo produto
+    try:
+        reserve_stock(db, requested)
+    except InsufficientStockError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.detail
+        )
+    
     new_order = Order(
         user_id=current_user.id,
         total=total,
@@ -51,45 +116,101 @@ def create_order(
     )
     db.add(new_order)
     db.flush()
+    order_id = new_order.id
     
-    for item_data in order_items_data:
-        order_item = OrderItem(
-            order_id=new_order.id,
-            product_id=item_data["product_id"],
-            quantity=item_data["quantity"],
-            price=item_data["price"]
-        )
-        db.add(order_item)
-        
-        product = item_data["product"]
-        product.stock -= item_data["quantity"]
+    # Insere todos os itens em um único INSERT (executemany)
+    for order_item in order_items:
+        order_item["order_id"] = order_id
+    db.execute(insert(OrderItem), order_items)
+    # product.stock ainda é o valor lido sob lock, antes da reserva
+    enqueue(db, "order.created", {
+        "order_id": order_id,
+        "user_id": current_user.id,
+        "total": total,
+        "items": [
+            {"product_id": product_id, "quantity": quantity, "stock_after": products[product_id].stock - quantity}
+            for product_id, quantity in requested.items()
+        ],
+    })
+    return order_id
+
+@router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
+def create_order(
+    order_data: OrderCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(
+        None, max_length=255, description="Retries com a mesma chave devolvem o pedido já criado"
+    ),
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    key = None
+    if idempotency_key:
+        key = scoped_key(current_user.id, idempotency_key)
+        fingerprint = request_fingerprint(order_data)
+        try:
+            replay = stored_response(db, key, fingerprint)
+            if replay is None and not claim_key(db, key, fingerprint):
+                # Duplicado concorrente: o INSERT esperou a transação que tinha a chave
+                replay = stored_response(db, key, fingerprint)
+                if replay is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Pedido com esta Idempotency-Key ainda em processamento"
+                    )
+        except IdempotencyKeyReusedError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=e.detail
+            )
+        if replay is not None:
+            response.headers["Idempotent-Replayed"] = "true"
+            return replay
     
-    db.commit()
-    db.refresh(new_order)
+    try:
+        order_id = _place_order(db, order_data, current_user)
+    except HTTPException:
+        if key is not None:
+            # Libera a chave reservada junto com o resto da transação
+            db.rollback()
+        raise
+    
+    if key is None:
+        db.commit()
+    
+    # Recarrega o pedido com itens e produtos em número fixo de queries
+    new_order = db.query(Order).options(
+        *order_load_options()
+    ).filter(Order.id == order_id).one()
+    
+    if key is not None:
+        # A resposta é gravada no mesmo commit do pedido
+        data = OrderResponse.model_validate(new_order).model_dump(mode="json")
+        save_response(db, key, data)
+        db.commit()
+        return data
     
     return new_order  # ← product_name vem automaticamente da propriedade!
 
-@router.get("/", response_model=List[OrderResponse])
+@router.get("/", response_model=Union[List[OrderResponse], CursorPage[OrderResponse]])
 def get_my_orders(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Paginação por cursor (vazio para a primeira página)"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """Lista pedidos do usuário logado"""
-    orders = db.query(Order).filter(
-        Order.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
-    
-    return orders
+    query = db.query(Order).filter(Order.user_id == current_user.id)
+    return _list_orders(db, query, skip, limit, cursor)
 
 @router.get("/{order_id}", response_model=OrderResponse)
 def get_order(
     order_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = db.query(Order).options(*order_load_options()).filter(Order.id == order_id).first()
     
     if not order:
         raise HTTPException(
@@ -105,31 +226,76 @@ def get_order(
     
     return order
 
-@router.get("/admin/all", response_model=List[OrderResponse])
+@router.get("/admin/all", response_model=Union[List[OrderResponse], CursorPage[OrderResponse]])
 def get_all_orders(
     skip: int = 0,
     limit: int = 100,
     status: OrderStatus = None,
+    cursor: Optional[str] = Query(None, description="Paginação por cursor (vazio para a primeira página)"),
     db: Session = Depends(get_db),
-    _current_user: User = Depends(get_current_admin_user)
+    _current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
     query = db.query(Order)
     
     if status:
         query = query.filter(Order.status == status)
     
-    orders = query.offset(skip).limit(limit).all()
-    
-    return orders
+    return _list_orders(db, query, skip, limit, cursor)
+
+@router.get("/admin/export")
+def export_orders(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status: OrderStatus = None,
+    created_from: Optional[datetime] = Query(None, description="Inclusivo"),
+    created_to: Optional[datetime] = Query(None, description="Exclusivo"),
+    db: Session = Depends(get_db),
+    _current_user: AuthenticatedUser = Depends(get_current_admin_user)
+):
+    """Exporta pedidos em streaming (NDJSON: um pedido por linha; CSV: um item por linha)"""
+    query = order_export_query(status, created_from, created_to)
+    return StreamingResponse(
+        stream_order_export(db.get_bind(), query, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{format}"'}
+    )
+
+@router.get("/admin/analytics/daily", response_model=List[DailyOrderSummary])
+def get_daily_analytics(
+    date_from: Optional[date] = Query(None, description="Inclusivo"),
+    date_to: Optional[date] = Query(None, description="Inclusivo"),
+    status: OrderStatus = None,
+    category_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    _current_user: AuthenticatedUser = Depends(get_current_admin_user)
+):
+    """
+    Receita, pedidos e unidades por dia e status (lidos de order_daily_summary).
+
+    O agregado é atualizado pelo worker da outbox: pedidos recentes aparecem
+    depois que os eventos deles são entregues.
+    """
+    return daily_summary(db, date_from, date_to, status, category_id)
+
+@router.get("/admin/analytics/categories", response_model=List[CategoryOrderSummary])
+def get_category_analytics(
+    date_from: Optional[date] = Query(None, description="Inclusivo"),
+    date_to: Optional[date] = Query(None, description="Inclusivo"),
+    status: OrderStatus = None,
+    db: Session = Depends(get_db),
+    _current_user: AuthenticatedUser = Depends(get_current_admin_user)
+):
+    """Receita, pedidos e unidades por categoria no período"""
+    return category_summary(db, date_from, date_to, status)
 
 @router.put("/{order_id}/status", response_model=OrderResponse)
 def update_order_status(
     order_id: int,
     status_update: OrderStatusUpdate,
     db: Session = Depends(get_db),
-    _current_user: User = Depends(get_current_admin_user)
+    _current_user: AuthenticatedUser = Depends(get_current_admin_user)
 ):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    # Trava o pedido: trocas concorrentes de status são aplicadas uma de cada vez
+    order = db.query(Order).filter(Order.id == order_id).with_for_update().first()
     
     if not order:
         raise HTTPException(
@@ -137,8 +303,28 @@ def update_order_status(
             detail="Pedido não encontrado"
         )
     
-    order.status = status_update.status
+    previous = order.status
+    if previous != status_update.status:
+        # UPDATE condicional: sem FOR UPDATE (SQLite), só uma troca concorrente
+        # sai do mesmo status anterior e publica o evento
+        changed = db.execute(
+            update(Order)
+            .where(Order.id == order_id, Order.status == previous)
+            .values(status=status_update.status)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not changed:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="O status do pedido foi alterado por outra requisição; tente novamente"
+            )
+        enqueue(db, "order.status_changed", {
+            "order_id": order.id, "user_id": order.user_id,
+            "previous": previous.value, "status": status_update.status.value,
+        })
     db.commit()
-    db.refresh(order)
+    
+    order = db.query(Order).options(*order_load_options()).filter(Order.id == order_id).one()
     
     return order
@@ -1,51 +1,141 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional, Union
 
+from app.config import settings
 from app.database import get_db
 from app.models.product import Product
 from app.models.category import Category
-from app.schemas.product import Product as ProductSchema, ProductCreate, ProductUpdate, ProductWithCategory
+from app.schemas.product import (
+    Product as ProductSchema, ProductCreate, ProductFacets, ProductImportReport, ProductUpdate,
+    ProductWithCategory
+)
+from app.schemas.pagination import CursorPage
+from app.schemas.stock import StockAdjustmentBatch, StockLevel
+from app.utils.bulk import import_format, import_records, iter_lines, iter_records, upsert_products
+from app.utils.cache import catalog_cache
 from app.utils.dependencies import get_current_admin_user
+from app.utils.facets import product_facets
+from app.utils.http_cache import cached_representation, conditional_response
+from app.utils.instrumentation import TimedRoute
+from app.utils.pagination import keyset_page
+from app.utils.search import apply_search
+from app.utils.serialization import json_response, product_dict, product_rows
+from app.utils.stock import InsufficientStockError, UnknownProductsError, adjust_stock, fold_adjustments
 
-router = APIRouter(prefix="/products", tags=["Products"])
+router = APIRouter(prefix="/products", tags=["Products"], route_class=TimedRoute)
 
-@router.get("/", response_model=List[ProductWithCategory])
+@router.get("/", response_model=Union[List[ProductWithCategory], CursorPage[ProductWithCategory]])
 def get_products(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     category_id: Optional[int] = None,
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Paginação por cursor (vazio para a primeira página)"),
     db: Session = Depends(get_db)
 ):
-    query = db.query(Product)
+    # A chave inclui o conjunto normalizado de filtros (mesma semântica da query)
+    cache_key = catalog_cache.key(
+        "products", "list",
+        skip=skip if cursor is None else None,
+        limit=limit,
+        cursor=cursor,
+        category_id=category_id or None,
+        min_price=min_price or None,
+        max_price=max_price or None,
+        search=search.lower() if search else None,
+    )
+    fast = settings.FAST_JSON_RESPONSES
     
-    if category_id:
-        query = query.filter(Product.category_id == category_id)
+    def build():
+        query = db.query(Product)
+        
+        if category_id:
+            query = query.filter(Product.category_id == category_id)
+        
+        if min_price:
+            query = query.filter(Product.price >= min_price)
+        
+        if max_price:
+            query = query.filter(Product.price <= max_price)
+        
+        if search:
+            # Busca textual em nome e descrição; por relevância, exceto no modo cursor (ordem por id)
+            query = apply_search(query, search, db.get_bind().dialect.name, rank=cursor is None)
+        
+        if fast:
+            # Só as colunas da resposta, sem objetos ORM nem validação Pydantic
+            query = product_rows(query)
+            if cursor is not None:
+                rows, next_cursor = keyset_page(query, [Product.id], cursor, limit)
+                return {"items": [product_dict(row) for row in rows], "next_cursor": next_cursor}
+            return [product_dict(row) for row in query.offset(skip).limit(limit)]
+        
+        query = query.options(joinedload(Product.category))
+        if cursor is not None:
+            products, next_cursor = keyset_page(query, [Product.id], cursor, limit)
+            return CursorPage[ProductWithCategory].model_validate(
+                {"items": products, "next_cursor": next_cursor}
+            ).model_dump(mode="json")
+        products = query.offset(skip).limit(limit).all()
+        return [ProductWithCategory.model_validate(p).model_dump(mode="json") for p in products]
     
-    if min_price:
-        query = query.filter(Product.price >= min_price)
-    
-    if max_price:
-        query = query.filter(Product.price <= max_price)
-    
-    if search:
-        query = query.filter(Product.name.ilike(f"%{search}%"))
+    # Listagens só têm ETag: exclusões não mudam nenhum updated_at da página
+    data, etag = cached_representation(cache_key, build)
+    return conditional_response(request, response, "products.list", data, etag, fast=fast)
+
+@router.get("/facets", response_model=ProductFacets)
+def get_product_facets(
+    category_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    search: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Contagem por categoria, faixas de preço e em estoque para os filtros de GET /products/"""
+    cache_key = catalog_cache.key(
+        "products", "facets",
+        category_id=category_id or None,
+        min_price=min_price or None,
+        max_price=max_price or None,
+        search=search.lower() if search else None,
+    )
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
-    products = query.offset(skip).limit(limit).all()
-    return products
+    data = product_facets(
+        db, category_id=category_id, min_price=min_price, max_price=max_price, search=search
+    )
+    catalog_cache.set(cache_key, data)
+    return data
 
 @router.get("/{product_id}", response_model=ProductWithCategory)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Produto não encontrado"
-        )
-    return product
+def get_product(
+    product_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
+    def build():
+        product = db.query(Product).options(
+            joinedload(Product.category)
+        ).filter(Product.id == product_id).first()
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Produto não encontrado"
+            )
+        return ProductWithCategory.model_validate(product).model_dump(mode="json")
+    
+    data, etag = cached_representation(catalog_cache.key("products", "item", id=product_id), build)
+    return conditional_response(request, response, "products.item", data, etag)
 
 @router.post("/", response_model=ProductSchema, status_code=status.HTTP_201_CREATED)
 def create_product(
@@ -63,9 +153,58 @@ def create_product(
     new_product = Product(**product.dict())
     db.add(new_product)
     db.commit()
+    catalog_cache.invalidate("products")
     db.refresh(new_product)
     return new_product
 
+@router.post("/import", response_model=ProductImportReport)
+async def import_products(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Padrão: pelo Content-Type"),
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_admin_user)
+):
+    """
+    Importação em massa (NDJSON ou CSV, lido em streaming).
+
+    Registros sem id criam produtos; com id atualizam os campos enviados.
+    Cada lote é gravado e commitado separadamente; erros vêm por linha.
+    """
+    records = iter_records(iter_lines(request.stream()), import_format(request.headers.get("content-type"), format))
+    report = await import_records(
+        records,
+        lambda batch: run_in_threadpool(upsert_products, db, batch),
+        batch_size or settings.BULK_IMPORT_BATCH_SIZE,
+    )
+    if report.inserted or report.updated:
+        catalog_cache.invalidate("products")
+    return asdict(report)
+
+@router.patch("/stock", response_model=List[StockLevel])
+def adjust_products_stock(
+    batch: StockAdjustmentBatch,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_admin_user)
+):
+    """
+    Ajuste de estoque em lote (delta relativo ou valor absoluto), em uma
+    única transação. Retorna o estoque resultante de cada produto.
+    """
+    try:
+        deltas, levels = fold_adjustments(
+            (adjustment.product_id, adjustment.delta, adjustment.stock) for adjustment in batch.adjustments
+        )
+        result = adjust_stock(db, deltas, levels)
+    except UnknownProductsError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.detail)
+    except (InsufficientStockError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    db.commit()
+    catalog_cache.invalidate("products")
+    return [{"product_id": product_id, "stock": stock} for product_id, stock in sorted(result.items())]
+
 @router.put("/{product_id}", response_model=ProductSchema)
 def update_product(
     product_id: int,
@@ -92,6 +231,7 @@ def update_product(
         setattr(product, key, value)
     
     db.commit()
+    catalog_cache.invalidate("products")
     db.refresh(product)
     return product
 
@@ -110,4 +250,5 @@ def delete_product(
     
     db.delete(product)
     db.commit()
+    catalog_cache.invalidate("products")
     return None
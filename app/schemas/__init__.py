@@ -1,11 +1,15 @@
 from app.schemas.user import User, UserCreate, UserLogin, Token
 from app.schemas.category import Category, CategoryCreate, CategoryUpdate
-from app.schemas.product import Product, ProductCreate, ProductUpdate, ProductWithCategory
+from app.schemas.product import Product, ProductCreate, ProductUpdate, ProductWithCategory, ProductFacets, ProductImportReport
 from app.schemas.order import OrderCreate, OrderResponse, OrderStatusUpdate, OrderItemResponse
+from app.schemas.pagination import CursorPage
+from app.schemas.stock import StockAdjustment, StockAdjustmentBatch, StockLevel
 
 __all__ = [
     "User", "UserCreate", "UserLogin", "Token",
     "Category", "CategoryCreate", "CategoryUpdate",
-    "Product", "ProductCreate", "ProductUpdate", "ProductWithCategory",
-    "OrderCreate", "OrderResponse", "OrderStatusUpdate", "OrderItemResponse"
+    "Product", "ProductCreate", "ProductUpdate", "ProductWithCategory", "ProductFacets", "ProductImportReport",
+    "OrderCreate", "OrderResponse", "OrderStatusUpdate", "OrderItemResponse",
+    "CursorPage",
+    "StockAdjustment", "StockAdjustmentBatch", "StockLevel"
 ]
\ No newline at end of file
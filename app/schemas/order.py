@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List
-from datetime import datetime
+from datetime import date, datetime
 from app.models.order import OrderStatus
 
 class OrderItemCreate(BaseModel):
@@ -33,4 +33,17 @@ class OrderResponse(BaseModel):
         from_attributes = True
 
 class OrderStatusUpdate(BaseModel):
-    status: OrderStatus
\ No newline at end of file
+    status: OrderStatus
+
+class DailyOrderSummary(BaseModel):
+    day: date
+    status: OrderStatus
+    orders: int
+    units: int
+    revenue: float
+
+class CategoryOrderSummary(BaseModel):
+    category_id: int
+    orders: int
+    units: int
+    revenue: float
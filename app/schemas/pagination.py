@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+class CursorPage(BaseModel, Generic[T]):
+    """Página retornada na paginação por cursor"""
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class ProductBase(BaseModel):
@@ -33,5 +33,32 @@ class ProductWithCategory(Product):
     """Product com informações da categoria"""
     category: "Category"
 
+class CategoryFacet(BaseModel):
+    category_id: int
+    count: int
+    in_stock: int
+
+class PriceBucketFacet(BaseModel):
+    """Faixa [min, max); max None é a faixa aberta"""
+    min: float
+    max: Optional[float] = None
+    count: int
+    in_stock: int
+
+class ProductFacets(BaseModel):
+    total: int
+    in_stock: int
+    categories: List[CategoryFacet]
+    price_buckets: List[PriceBucketFacet]
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+class ProductImportReport(BaseModel):
+    inserted: int
+    updated: int
+    errors: List[ImportRowError]
+
 from app.schemas.category import Category
 ProductWithCategory.model_rebuild()
\ No newline at end of file
@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+
+class StockAdjustment(BaseModel):
+    """Ajuste relativo (delta) ou absoluto (stock) de um produto"""
+    product_id: int
+    delta: Optional[int] = Field(None, description="Soma ao estoque atual (+n / -n)")
+    stock: Optional[int] = Field(None, ge=0, description="Define o estoque")
+
+    @model_validator(mode="after")
+    def check_one_operation(self):
+        if (self.delta is None) == (self.stock is None):
+            raise ValueError("Informe delta ou stock (apenas um)")
+        return self
+
+class StockAdjustmentBatch(BaseModel):
+    adjustments: List[StockAdjustment] = Field(min_length=1, max_length=10000)
+
+class StockLevel(BaseModel):
+    product_id: int
+    stock: int
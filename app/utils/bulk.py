@@ -0,0 +1,233 @@
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.product import Product
+from app.schemas.product import ProductCreate, ProductUpdate
+
+# Importação em massa de produtos
+#
+# Cada registro é (número da linha, dict). Sem "id" o registro é validado
+# com ProductCreate e inserido; com "id" é validado com ProductUpdate,
+# mesclado com o produto atual e gravado com INSERT ... ON CONFLICT (id)
+# DO UPDATE. Por lote: 1 SELECT de categorias, 1 SELECT (FOR UPDATE) dos
+# produtos existentes, 1 INSERT multi-row e 1 upsert multi-row, e commit.
+
+UPSERT_COLUMNS = ["name", "description", "price", "stock", "category_id", "image_url", "updated_at"]
+# null explícito só limpa colunas opcionais; nas demais é ignorado
+NULLABLE_COLUMNS = {"description", "image_url"}
+
+Record = Tuple[int, dict]
+
+@dataclass
+class ImportReport:
+    inserted: int = 0
+    updated: int = 0
+    errors: List[dict] = field(default_factory=list)
+
+    def error(self, row: int, message: str) -> None:
+        self.errors.append({"row": row, "error": message})
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'registro'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+def _upsert(dialect: str):
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"Importação em massa não suportada para {dialect}"
+        )
+    statement = dialect_insert(Product)
+    return statement.on_conflict_do_update(
+        index_elements=[Product.id],
+        set_={column: statement.excluded[column] for column in UPSERT_COLUMNS}
+    )
+
+def upsert_products(db: Session, records: List[Record]) -> ImportReport:
+    """Valida e grava um lote; erros de validação não impedem o resto do lote"""
+    report = ImportReport()
+    creates: List[Tuple[int, dict]] = []
+    updates: Dict[int, List[Tuple[int, dict]]] = {}
+
+    for row, data in records:
+        product_id = data.pop("id", None)
+        try:
+            if product_id in (None, ""):
+                creates.append((row, ProductCreate.model_validate(data).model_dump()))
+            else:
+                changes = ProductUpdate.model_validate(data).model_dump(exclude_unset=True)
+                updates.setdefault(int(product_id), []).append((row, changes))
+        except ValidationError as e:
+            report.error(row, _validation_message(e))
+        except ValueError:
+            report.error(row, f"id: valor inválido '{product_id}'")
+
+    # Categorias resolvidas uma vez por lote
+    category_ids = {values["category_id"] for _, values in creates}
+    category_ids |= {
+        changes["category_id"]
+        for rows in updates.values() for _, changes in rows
+        if changes.get("category_id") is not None
+    }
+    known_categories = {
+        category_id for (category_id,) in db.query(Category.id).filter(Category.id.in_(category_ids))
+    } if category_ids else set()
+
+    existing = {}
+    if updates:
+        existing = {
+            row.id: dict(row._mapping)
+            for row in db.query(
+                Product.id, *[getattr(Product, column) for column in UPSERT_COLUMNS]
+            ).filter(Product.id.in_(updates.keys())).order_by(Product.id).with_for_update()
+        }
+
+    now = datetime.utcnow()
+    new_rows = []
+    for row, values in creates:
+        if values["category_id"] not in known_categories:
+            report.error(row, f"Categoria {values['category_id']} não encontrada")
+            continue
+        new_rows.append({**values, "created_at": now, "updated_at": now})
+
+    merged_rows = []
+    for product_id, rows in updates.items():
+        merged = existing.get(product_id)
+        if merged is None:
+            for row, _ in rows:
+                report.error(row, f"Produto {product_id} não encontrado")
+            continue
+        applied = 0
+        # Linhas repetidas do mesmo id são aplicadas em ordem (a última vence)
+        for row, changes in rows:
+            if changes.get("category_id") is not None and changes["category_id"] not in known_categories:
+                report.error(row, f"Categoria {changes['category_id']} não encontrada")
+                continue
+            merged.update({
+                key: value for key, value in changes.items()
+                if value is not None or key in NULLABLE_COLUMNS
+            })
+            applied += 1
+        if applied:
+            merged["updated_at"] = now
+            merged_rows.append(merged)
+            report.updated += applied
+
+    try:
+        if new_rows:
+            db.execute(insert(Product), new_rows)
+        if merged_rows:
+            db.execute(_upsert(db.get_bind().dialect.name), merged_rows)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        failed = {row for row, _ in records} - {error["row"] for error in report.errors}
+        for row in sorted(failed):
+            report.error(row, f"Falha ao gravar o lote: {e.__class__.__name__}")
+        report.updated = 0
+        return report
+
+    report.inserted = len(new_rows)
+    return report
+
+def import_format(content_type: Optional[str], fmt: Optional[str] = None) -> str:
+    """Formato explícito (?format=) ou pelo Content-Type; padrão NDJSON"""
+    if fmt:
+        return fmt
+    return "csv" if content_type and content_type.split(";")[0].strip() == "text/csv" else "ndjson"
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Linhas de texto de um corpo recebido em pedaços"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+    if buffer:
+        yield buffer.decode("utf-8")
+
+async def iter_records(lines: AsyncIterator[str], fmt: str) -> AsyncIterator[Record]:
+    """Registros (linha, dict) de NDJSON ou CSV com cabeçalho"""
+    if fmt == "ndjson":
+        number = 0
+        async for line in lines:
+            number += 1
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                yield number, None
+                continue
+            yield number, data if isinstance(data, dict) else None
+        return
+
+    header: Optional[List[str]] = None
+    pending = ""
+    number = 0
+    async for line in lines:
+        pending += line + "\n"
+        # Campo entre aspas com quebra de linha: o registro continua na próxima
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending.rstrip("\r\n"), ""
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        number += 1
+        if len(values) != len(header):
+            yield number, None
+            continue
+        # Célula vazia = campo ausente (mantém o valor atual / default)
+        yield number, {key: value for key, value in zip(header, values) if value != ""}
+    if pending.strip():
+        # Aspas não fechadas até o fim do arquivo
+        yield number + 1, None
+
+async def import_records(
+    records: AsyncIterator[Record],
+    run_batch: Callable[[List[Record]], Awaitable[ImportReport]],
+    batch_size: int,
+) -> ImportReport:
+    """Agrupa os registros em lotes de batch_size e acumula o relatório"""
+    report = ImportReport()
+    batch: List[Record] = []
+
+    async def flush():
+        result = await run_batch(batch)
+        report.inserted += result.inserted
+        report.updated += result.updated
+        report.errors.extend(result.errors)
+        batch.clear()
+
+    async for row, data in records:
+        if data is None:
+            report.error(row, "Registro malformado")
+            continue
+        batch.append((row, data))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    report.errors.sort(key=lambda error: error["row"])
+    return report
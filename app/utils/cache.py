@@ -0,0 +1,182 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import settings
+
+class CacheBackend:
+    """
+    Interface mínima de armazenamento do cache.
+
+    Os valores são estruturas JSON (dict/list/str/number), então qualquer
+    store chave-valor com TTL e INCR (ex.: Redis) pode ser plugado.
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def incr(self, key: str) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+class MemoryCache(CacheBackend):
+    """LRU em memória com expiração por TTL"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        # Contadores de geração ficam fora do LRU e nunca expiram
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._counters.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class RedisCache(CacheBackend):
+    """Backend para um cliente compatível com redis-py"""
+
+    def __init__(self, client, prefix: str = "ecommerce:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl or None)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+class Cache:
+    """
+    Cache de leituras do catálogo com contadores de hit/miss.
+
+    A invalidação é feita por namespace: cada namespace ("products",
+    "categories") tem um contador de geração que faz parte da chave.
+    Incrementar o contador invalida todas as entradas de uma vez, inclusive
+    as listagens com qualquer combinação de filtros.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def key(self, namespace: str, name: str, **params) -> str:
+        generation = 0
+        if self.enabled:
+            generation = self.backend.get(f"{namespace}:generation") or 0
+        normalized = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+        return f"{namespace}:{generation}:{name}:{normalized}"
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.enabled:
+            self.backend.set(key, value, self.ttl)
+
+    def invalidate(self, *namespaces: str) -> None:
+        if not self.enabled:
+            return
+        for namespace in namespaces:
+            self.backend.incr(f"{namespace}:generation")
+
+    def clear(self) -> None:
+        if self.enabled:
+            self.backend.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.enabled else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+def build_cache() -> Cache:
+    """Cria o cache conforme CACHE_BACKEND (memory, redis ou none)"""
+    if settings.CACHE_BACKEND == "none":
+        return Cache(None, settings.CACHE_TTL_SECONDS)
+    if settings.CACHE_BACKEND == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requer o pacote 'redis' instalado")
+        backend = RedisCache(redis.Redis.from_url(settings.REDIS_URL))
+        return Cache(backend, settings.CACHE_TTL_SECONDS)
+    if settings.CACHE_BACKEND == "memory":
+        return Cache(MemoryCache(settings.CACHE_MAX_ENTRIES), settings.CACHE_TTL_SECONDS)
+    raise ValueError(f"CACHE_BACKEND inválido: {settings.CACHE_BACKEND}")
+
+catalog_cache = build_cache()
@@ -0,0 +1,172 @@
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Compressão das respostas (gzip; br e zstd se os pacotes estiverem instalados)
+#
+# Middleware ASGI no molde do GZipMiddleware do Starlette, com allowlist
+# de content-type e codificação negociada pelo Accept-Encoding. Respostas
+# de um só pedaço abaixo de minimum_size saem sem compressão; respostas em
+# streaming (exportações) são comprimidas pedaço a pedaço, com flush a cada
+# pedaço para o cliente não esperar o fim da exportação.
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush()
+
+class _Brotli:
+    def __init__(self, level: int):
+        import brotli
+        self._c = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+class _Zstd:
+    def __init__(self, level: int):
+        import zstandard
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._c = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data) + self._c.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+def _installed(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+ENCODERS = {"gzip": _Gzip}
+if _installed("brotli"):
+    ENCODERS["br"] = _Brotli
+if _installed("zstandard"):
+    ENCODERS["zstd"] = _Zstd
+
+def available_encodings(preferred: Iterable[str]) -> List[str]:
+    """As codificações configuradas cujo pacote está instalado, na ordem de preferência"""
+    return [encoding for encoding in preferred if encoding in ENCODERS]
+
+def negotiate(accept_encoding: str, encodings: List[str]) -> Optional[str]:
+    """Maior q do Accept-Encoding; empate desfeito pela ordem de preferência do servidor"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                continue
+        weights[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def _allowed(content_type: str, content_types: List[str]) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return any(
+        media_type == allowed or (allowed.endswith("/*") and media_type.startswith(allowed[:-1]))
+        for allowed in content_types
+    )
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: List[str],
+        levels: Dict[str, int],
+        minimum_size: int = 1024,
+        content_types: List[str] = (),
+    ):
+        self.app = app
+        self.encodings = available_encodings(encodings)
+        self.levels = levels
+        self.minimum_size = minimum_size
+        self.content_types = [content_type.lower() for content_type in content_types]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, encoding, send))
+
+class _CompressingSend:
+    """Segura o http.response.start até o primeiro pedaço do corpo para decidir"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    def _should_compress(self, headers: Headers, body: bytes, more_body: bool) -> bool:
+        if self.start["status"] < 200 or self.start["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        if not _allowed(headers.get("content-type", ""), self.middleware.content_types):
+            return False
+        if not more_body:
+            return len(body) >= self.middleware.minimum_size
+        content_length = headers.get("content-length")
+        return content_length is None or int(content_length) >= self.middleware.minimum_size
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            headers = Headers(raw=self.start["headers"])
+            if not self._should_compress(headers, body, more_body):
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.compressor = ENCODERS[self.encoding](self.middleware.levels[self.encoding])
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            del headers["Content-Length"]
+            if not more_body:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(self.start)
+
+        chunk = self.compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -1,16 +1,79 @@
+from dataclasses import dataclass
+from datetime import datetime
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from app.config import settings
+from app.database import get_async_db, get_db
 from app.models.user import User
+from app.utils.cache import MemoryCache
 from app.utils.security import verify_token
 
 security = HTTPBearer()
 
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Snapshot imutável do usuário autenticado (seguro para compartilhar entre requests)"""
+    id: int
+    email: str
+    full_name: str
+    is_active: bool
+    is_admin: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+            created_at=user.created_at
+        )
+
+# Cache de curta duração: evita um SELECT em users a cada request autenticado
+principal_cache = MemoryCache(settings.AUTH_CACHE_MAX_ENTRIES)
+
+_EVICTIONS = "principal_evictions"
+
+def invalidate_user(email: str) -> None:
+    """
+    Remove o usuário do cache (ex.: desativado ou promovido a admin).
+
+    O cache é por processo: outras réplicas continuam com o snapshot antigo
+    por até AUTH_CACHE_TTL_SECONDS.
+    """
+    principal_cache.delete(email)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_user(mapper, connection, target):
+    # No flush só anota: antes do commit um request concorrente ainda leria
+    # (e recolocaria no cache) a linha antiga
+    session = object_session(target)
+    if session is None:
+        return
+    evictions = session.info.setdefault(_EVICTIONS, set())
+    evictions.add(target.email)
+    # Se o email mudou, a entrada antiga também precisa sair
+    evictions.update(inspect(target).attrs.email.history.deleted or ())
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    for email in session.info.pop(_EVICTIONS, ()):
+        invalidate_user(email)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_evictions(session):
+    session.info.pop(_EVICTIONS, None)
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> AuthenticatedUser:
     """
     Obtém o usuário atual baseado no token JWT
     """
@@ -24,12 +87,17 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.email == email).first()
+    user = principal_cache.get(email)
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Usuário não encontrado"
-        )
+        db_user = db.query(User).filter(User.email == email).first()
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Usuário não encontrado"
+            )
+        user = AuthenticatedUser.from_user(db_user)
+        if settings.AUTH_CACHE_TTL_SECONDS:
+            principal_cache.set(email, user, settings.AUTH_CACHE_TTL_SECONDS)
     
     if not user.is_active:
         raise HTTPException(
@@ -40,8 +108,8 @@ def get_current_user(
     return user
 
 def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: AuthenticatedUser = Depends(get_current_user)
+) -> AuthenticatedUser:
     """
     Verifica se o usuário atual é admin
     """
@@ -51,3 +119,16 @@ def get_current_admin_user(
             detail="Permissão negada. Apenas administradores."
         )
     return current_user
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthenticatedUser:
+    """Versão de get_current_user para os routers async (ASYNC_MODE)"""
+    return await db.run_sync(lambda session: get_current_user(credentials, session))
+
+async def get_current_admin_user_async(
+    current_user: AuthenticatedUser = Depends(get_current_user_async)
+) -> AuthenticatedUser:
+    return get_current_admin_user(current_user)
@@ -0,0 +1,224 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import delete, event, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.outbox import OutboxEvent
+
+# Eventos de pedidos (outbox transacional)
+#
+# create_order e update_order_status só gravam uma linha em outbox_events
+# na transação do pedido: o custo do request é um INSERT, independente de
+# quantos assinantes existam. O OutboxWorker lê a fila em lotes (FOR UPDATE
+# SKIP LOCKED no PostgreSQL, então várias réplicas podem drenar juntas),
+# entrega cada evento aos assinantes do EventBus fora do request e apaga os
+# entregues. A entrega é at-least-once: um assinante que falha faz o evento
+# inteiro voltar para a fila com backoff, então assinantes devem ser
+# idempotentes. Assinantes que escrevem no banco usam event.db, a sessão
+# do worker: as escritas (em um savepoint por evento) são commitadas junto
+# com a remoção do evento da fila. O worker acorda logo após o commit que
+# enfileirou eventos (mesmo processo) ou a cada OUTBOX_POLL_INTERVAL_SECONDS.
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Event:
+    id: int
+    topic: str
+    payload: dict
+    created_at: datetime
+    attempts: int
+    db: Optional[Session] = None
+
+Handler = Callable[[Event], None]
+
+class EventBus:
+    """Assinantes em processo por tópico"""
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+
+    def subscribe(self, topic: str, handler: Optional[Handler] = None):
+        """bus.subscribe(topic, handler) ou @bus.subscribe(topic)"""
+        if handler is None:
+            return lambda func: self.subscribe(topic, func)
+        self._handlers[topic].append(handler)
+        return handler
+
+    def unsubscribe(self, topic: str, handler: Handler) -> None:
+        self._handlers[topic].remove(handler)
+
+    def dispatch(self, event: Event) -> None:
+        for handler in list(self._handlers.get(event.topic, ())):
+            handler(event)
+
+event_bus = EventBus()
+
+_PENDING = "outbox_pending"
+_wakeups: List[Callable[[], None]] = []
+
+def enqueue(db: Session, topic: str, payload: dict) -> None:
+    """Grava o evento na transação atual; ele só existe se o commit acontecer"""
+    now = datetime.utcnow()
+    db.add(OutboxEvent(
+        topic=topic, payload=json.dumps(payload, separators=(",", ":"), default=str),
+        created_at=now, available_at=now
+    ))
+    db.info[_PENDING] = True
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session):
+    if session.info.pop(_PENDING, False):
+        for wake in list(_wakeups):
+            wake()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING, None)
+
+class OutboxWorker:
+    def __init__(
+        self,
+        engine,
+        bus: EventBus,
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+        max_attempts: int = 5,
+        retry_backoff: float = 2.0,
+    ):
+        self.engine = engine
+        self.bus = bus
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.delivered = 0
+        self.retried = 0
+        self.discarded = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def drain_once(self) -> int:
+        """Entrega um lote; retorna quantos eventos foram lidos"""
+        now = datetime.utcnow()
+        with Session(self.engine) as db:
+            rows = db.query(OutboxEvent).filter(
+                OutboxEvent.failed_at.is_(None), OutboxEvent.available_at <= now
+            ).order_by(OutboxEvent.id).limit(self.batch_size).with_for_update(skip_locked=True).all()
+
+            delivered = []
+            for row in rows:
+                try:
+                    # Savepoint: um assinante que falha não deixa escritas parciais
+                    with db.begin_nested():
+                        self.bus.dispatch(Event(row.id, row.topic, json.loads(row.payload), row.created_at,
+                                                row.attempts, db))
+                    delivered.append(row.id)
+                except Exception as e:
+                    row.attempts += 1
+                    row.last_error = f"{type(e).__name__}: {e}"[:1000]
+                    if row.attempts >= self.max_attempts:
+                        row.failed_at = now
+                        self.discarded += 1
+                        logger.error("Evento %s (%s) descartado após %s tentativas: %s",
+                                     row.id, row.topic, row.attempts, row.last_error)
+                    else:
+                        row.available_at = now + timedelta(seconds=self.retry_backoff * 2 ** (row.attempts - 1))
+                        self.retried += 1
+
+            if delivered:
+                db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(delivered)))
+            db.commit()
+            self.delivered += len(delivered)
+            return len(rows)
+
+    def drain(self) -> int:
+        """Entrega lotes até a fila (dos eventos disponíveis agora) esvaziar"""
+        total = 0
+        while True:
+            fetched = self.drain_once()
+            total += fetched
+            if fetched < self.batch_size:
+                return total
+
+    def notify(self) -> None:
+        """Acorda o worker (pode ser chamado de qualquer thread)"""
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._wake.set)
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        _wakeups.append(self.notify)
+        try:
+            while True:
+                try:
+                    # Em thread: handlers síncronos e o banco não travam o event loop
+                    await asyncio.to_thread(self.drain)
+                except Exception:
+                    logger.exception("Falha ao drenar a outbox")
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+        finally:
+            _wakeups.remove(self.notify)
+            self._loop = None
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        with Session(self.engine) as db:
+            pending, failed = db.query(
+                func.count(OutboxEvent.id).filter(OutboxEvent.failed_at.is_(None)),
+                func.count(OutboxEvent.id).filter(OutboxEvent.failed_at.isnot(None)),
+            ).one()
+        return {
+            "running": self._task is not None,
+            "pending": pending,
+            "failed": failed,
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "discarded": self.discarded,
+        }
+
+def build_outbox_worker(engine) -> OutboxWorker:
+    return OutboxWorker(
+        engine,
+        event_bus,
+        batch_size=settings.OUTBOX_BATCH_SIZE,
+        poll_interval=settings.OUTBOX_POLL_INTERVAL_SECONDS,
+        max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+        retry_backoff=settings.OUTBOX_RETRY_BACKOFF_SECONDS,
+    )
+
+@event_bus.subscribe("order.created")
+def alert_low_stock(event: Event) -> None:
+    """Assinante padrão: avisa quando o pedido deixa um produto com pouco estoque"""
+    for item in event.payload["items"]:
+        if item["stock_after"] < settings.STOCK_LOW_THRESHOLD:
+            logger.warning(
+                "Estoque baixo: produto %s com %s unidade(s) após o pedido %s",
+                item["product_id"], item["stock_after"], event.payload["order_id"]
+            )
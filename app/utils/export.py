@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Iterator, Optional
+
+from sqlalchemy import select
+
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+
+# Exportação de pedidos em streaming
+#
+# Uma única query (pedidos ⟕ itens ⟕ produtos) lida com cursor do lado do
+# servidor em partições de YIELD_PER linhas. Nada de ORM/Pydantic: cada
+# partição vira um pedaço de texto e é descartada, então a memória não
+# cresce com o tamanho da exportação.
+
+YIELD_PER = 1000
+
+CSV_COLUMNS = [
+    "order_id", "user_id", "status", "total", "created_at", "updated_at",
+    "item_id", "product_id", "product_name", "quantity", "price",
+]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+def order_export_query(
+    status: Optional[OrderStatus] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    query = select(
+        Order.id, Order.user_id, Order.status, Order.total, Order.created_at, Order.updated_at,
+        OrderItem.id.label("item_id"), OrderItem.product_id, Product.name.label("product_name"),
+        OrderItem.quantity, OrderItem.price,
+    ).outerjoin(OrderItem, OrderItem.order_id == Order.id).outerjoin(
+        Product, Product.id == OrderItem.product_id
+    )
+    if status:
+        query = query.where(Order.status == status)
+    if created_from:
+        query = query.where(Order.created_at >= created_from)
+    if created_to:
+        query = query.where(Order.created_at < created_to)
+    return query.order_by(Order.created_at, Order.id, OrderItem.id)
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+class NdjsonEncoder:
+    """Um pedido por linha, com os itens aninhados (formato de OrderResponse)"""
+
+    def __init__(self):
+        self._order = None
+
+    def header(self) -> str:
+        return ""
+
+    def feed(self, rows) -> str:
+        lines = []
+        for row in rows:
+            if self._order is None or self._order["id"] != row.id:
+                if self._order is not None:
+                    lines.append(json.dumps(self._order))
+                self._order = {
+                    "id": row.id,
+                    "user_id": row.user_id,
+                    "status": row.status.value if row.status else None,
+                    "total": row.total,
+                    "created_at": _iso(row.created_at),
+                    "updated_at": _iso(row.updated_at),
+                    "items": [],
+                }
+            if row.item_id is not None:
+                self._order["items"].append({
+                    "id": row.item_id,
+                    "product_id": row.product_id,
+                    "product_name": row.product_name or "Produto removido",
+                    "quantity": row.quantity,
+                    "price": row.price,
+                })
+        # O último pedido da partição pode continuar na próxima
+        return "".join(line + "\n" for line in lines)
+
+    def close(self) -> str:
+        return json.dumps(self._order) + "\n" if self._order is not None else ""
+
+class CsvEncoder:
+    """Uma linha por item, com as colunas do pedido repetidas"""
+
+    def header(self) -> str:
+        return self._write([CSV_COLUMNS])
+
+    def feed(self, rows) -> str:
+        return self._write(
+            [
+                row.id, row.user_id, row.status.value if row.status else "", row.total,
+                _iso(row.created_at), _iso(row.updated_at), row.item_id, row.product_id,
+                None if row.item_id is None else row.product_name or "Produto removido",
+                row.quantity, row.price,
+            ]
+            for row in rows
+        )
+
+    def close(self) -> str:
+        return ""
+
+    @staticmethod
+    def _write(rows) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue()
+
+def export_encoder(fmt: str):
+    return CsvEncoder() if fmt == "csv" else NdjsonEncoder()
+
+def stream_order_export(bind, query, fmt: str) -> Iterator[bytes]:
+    """
+    Gera a exportação em pedaços. Abre a própria conexão: a sessão do
+    request é fechada antes do corpo do StreamingResponse ser enviado.
+    """
+    encoder = export_encoder(fmt)
+    with bind.connect() as conn:
+        result = conn.execution_options(yield_per=YIELD_PER).execute(query)
+        yield encoder.header().encode()
+        for partition in result.partitions():
+            chunk = encoder.feed(partition)
+            if chunk:
+                yield chunk.encode()
+        yield encoder.close().encode()
+
+async def stream_order_export_async(bind, query, fmt: str) -> AsyncIterator[bytes]:
+    """Mesma exportação com AsyncEngine (ASYNC_MODE)"""
+    encoder = export_encoder(fmt)
+    async with bind.connect() as conn:
+        result = await conn.stream(query.execution_options(yield_per=YIELD_PER))
+        yield encoder.header().encode()
+        async for partition in result.partitions():
+            chunk = encoder.feed(partition)
+            if chunk:
+                yield chunk.encode()
+        yield encoder.close().encode()
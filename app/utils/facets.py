@@ -0,0 +1,183 @@
+from typing import Optional
+from sqlalchemy import DDL, case, event, func, inspect, text
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.models.product_facet import ProductFacet
+from app.utils.search import apply_search
+
+# Facetas do catálogo (contagem por categoria, faixas de preço e em estoque)
+#
+# product_facets guarda uma linha por (categoria, faixa de preço), mantida
+# por triggers em products. Sem filtro de preço/busca as facetas saem
+# dessa tabela em O(categorias × faixas); com filtros, de um único
+# GROUP BY sobre products usando os mesmos índices de get_products.
+
+# Limite inferior de cada faixa; a última é aberta
+PRICE_BUCKETS = [0, 50, 100, 250, 500, 1000, 2500, 5000]
+
+FACETS_TABLE = ProductFacet.__tablename__
+
+def _bucket_sql(price: str) -> str:
+    whens = " ".join(f"WHEN {price} < {upper} THEN {i}" for i, upper in enumerate(PRICE_BUCKETS[1:]))
+    return f"(CASE {whens} ELSE {len(PRICE_BUCKETS) - 1} END)"
+
+def _in_stock_sql(stock: str) -> str:
+    return f"(CASE WHEN {stock} > 0 THEN 1 ELSE 0 END)"
+
+def _add_sql(row: str) -> str:
+    return f"""INSERT INTO {FACETS_TABLE} (category_id, price_bucket, product_count, in_stock_count)
+        VALUES ({row}.category_id, {_bucket_sql(f"{row}.price")}, 1, {_in_stock_sql(f"{row}.stock")})
+        ON CONFLICT (category_id, price_bucket) DO UPDATE SET
+            product_count = {FACETS_TABLE}.product_count + 1,
+            in_stock_count = {FACETS_TABLE}.in_stock_count + excluded.in_stock_count"""
+
+def _remove_sql(row: str) -> str:
+    return f"""UPDATE {FACETS_TABLE} SET
+            product_count = product_count - 1,
+            in_stock_count = in_stock_count - {_in_stock_sql(f"{row}.stock")}
+        WHERE category_id = {row}.category_id AND price_bucket = {_bucket_sql(f"{row}.price")}"""
+
+# Só dispara quando a linha muda de faixa, de categoria ou de "em estoque":
+# decrementos comuns de estoque não tocam a tabela (sem contenção no checkout)
+_CHANGED = (
+    f"old.category_id <> new.category_id"
+    f" OR {_bucket_sql('old.price')} <> {_bucket_sql('new.price')}"
+    f" OR {_in_stock_sql('old.stock')} <> {_in_stock_sql('new.stock')}"
+)
+
+_SQLITE_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS {FACETS_TABLE}_ai AFTER INSERT ON products BEGIN
+        {_add_sql("new")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FACETS_TABLE}_ad AFTER DELETE ON products BEGIN
+        {_remove_sql("old")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FACETS_TABLE}_au AFTER UPDATE OF price, stock, category_id ON products
+    WHEN {_CHANGED} BEGIN
+        {_remove_sql("old")};
+        {_add_sql("new")};
+    END""",
+]
+
+_POSTGRES_DDL = [
+    f"""CREATE OR REPLACE FUNCTION {FACETS_TABLE}_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            {_remove_sql("OLD")};
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            {_add_sql("NEW")};
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    f"DROP TRIGGER IF EXISTS {FACETS_TABLE}_aid ON products",
+    f"""CREATE TRIGGER {FACETS_TABLE}_aid AFTER INSERT OR DELETE ON products
+        FOR EACH ROW EXECUTE FUNCTION {FACETS_TABLE}_sync()""",
+    f"DROP TRIGGER IF EXISTS {FACETS_TABLE}_au ON products",
+    f"""CREATE TRIGGER {FACETS_TABLE}_au AFTER UPDATE OF price, stock, category_id ON products
+        FOR EACH ROW WHEN ({_CHANGED}) EXECUTE FUNCTION {FACETS_TABLE}_sync()""",
+]
+
+_REBUILD = [
+    f"DELETE FROM {FACETS_TABLE}",
+    f"""INSERT INTO {FACETS_TABLE} (category_id, price_bucket, product_count, in_stock_count)
+        SELECT category_id, {_bucket_sql("price")}, count(*), sum({_in_stock_sql("stock")})
+        FROM products GROUP BY category_id, {_bucket_sql("price")}""",
+]
+
+for statement in _SQLITE_DDL:
+    event.listen(Product.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in _POSTGRES_DDL:
+    event.listen(Product.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+def facets_ddl(dialect: str):
+    return {"sqlite": _SQLITE_DDL, "postgresql": _POSTGRES_DDL}.get(dialect, [])
+
+def rebuild_facets(conn) -> None:
+    """Recalcula product_facets a partir de products"""
+    for statement in _REBUILD:
+        conn.execute(text(statement))
+
+def ensure_facets(engine) -> None:
+    """
+    Cria os triggers em um banco já existente e popula product_facets
+    se a tabela está vazia (acabou de ser criada por create_all).
+    """
+    ddl = facets_ddl(engine.dialect.name)
+    if not ddl:
+        return
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        if not inspector.has_table("products") or not inspector.has_table(FACETS_TABLE):
+            return
+        for statement in ddl:
+            conn.execute(text(statement))
+        empty = conn.execute(text(f"SELECT 1 FROM {FACETS_TABLE} LIMIT 1")).first() is None
+        if empty and conn.execute(text("SELECT 1 FROM products LIMIT 1")).first() is not None:
+            rebuild_facets(conn)
+
+def _price_bucket(price):
+    return case(
+        *[(price < upper, i) for i, upper in enumerate(PRICE_BUCKETS[1:])],
+        else_=len(PRICE_BUCKETS) - 1
+    )
+
+def _facet_rows(
+    db: Session,
+    category_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    search: Optional[str] = None,
+):
+    """Linhas (category_id, price_bucket, product_count, in_stock_count)"""
+    if not (min_price or max_price or search):
+        query = db.query(
+            ProductFacet.category_id, ProductFacet.price_bucket,
+            ProductFacet.product_count, ProductFacet.in_stock_count
+        ).filter(ProductFacet.product_count > 0)
+        if category_id:
+            query = query.filter(ProductFacet.category_id == category_id)
+        return query.all()
+
+    bucket = _price_bucket(Product.price)
+    query = db.query(
+        Product.category_id, bucket,
+        func.count(Product.id),
+        func.sum(case((Product.stock > 0, 1), else_=0))
+    )
+    if category_id:
+        query = query.filter(Product.category_id == category_id)
+    if min_price:
+        query = query.filter(Product.price >= min_price)
+    if max_price:
+        query = query.filter(Product.price <= max_price)
+    if search:
+        query = apply_search(query, search, db.get_bind().dialect.name, rank=False)
+    return query.group_by(Product.category_id, bucket).all()
+
+def product_facets(db: Session, **filters) -> dict:
+    """Facetas para o mesmo conjunto de filtros de get_products, em uma query"""
+    categories = {}
+    buckets = [[0, 0] for _ in PRICE_BUCKETS]
+    for category_id, price_bucket, count, in_stock in _facet_rows(db, **filters):
+        category = categories.setdefault(category_id, [0, 0])
+        category[0] += count
+        category[1] += in_stock
+        buckets[price_bucket][0] += count
+        buckets[price_bucket][1] += in_stock
+
+    upper_bounds = PRICE_BUCKETS[1:] + [None]
+    return {
+        "total": sum(count for count, _ in buckets),
+        "in_stock": sum(in_stock for _, in_stock in buckets),
+        "categories": [
+            {"category_id": category_id, "count": count, "in_stock": in_stock}
+            for category_id, (count, in_stock) in sorted(categories.items())
+        ],
+        "price_buckets": [
+            {"min": lower, "max": upper, "count": count, "in_stock": in_stock}
+            for lower, upper, (count, in_stock) in zip(PRICE_BUCKETS, upper_bounds, buckets)
+        ],
+    }
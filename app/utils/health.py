@@ -0,0 +1,104 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.utils.cache import Cache
+from app.utils.pool import pool_metrics
+
+# Readiness (/ready)
+#
+# SELECT 1 em uma thread dedicada com prazo estrito: um pool esgotado ou um
+# banco travado fazem a checagem falhar em READINESS_TIMEOUT_SECONDS, em vez
+# de segurar o probe por DB_POOL_TIMEOUT. No máximo uma checagem fica em
+# andamento e o resultado é reaproveitado por READINESS_CACHE_SECONDS, então
+# os probes do orquestrador não viram carga no banco. O /ready não tem
+# autenticação: o relatório só traz status fixos por checagem, e o detalhe
+# das falhas (DSN, host, erro do driver) vai para o log.
+
+logger = logging.getLogger(__name__)
+
+def pool_saturation(engine) -> dict:
+    metrics = pool_metrics(engine)
+    if "wait_ms" not in metrics:
+        return {"pool": metrics.get("pool"), "saturation": None}
+    capacity = metrics["size"] + metrics["max_overflow"]
+    return {
+        "checked_out": metrics["checked_out"],
+        "capacity": capacity,
+        "saturation": round(metrics["checked_out"] / capacity, 4) if capacity else None,
+        "timeouts": metrics["timeouts"],
+    }
+
+def cache_warmth(cache: Cache) -> dict:
+    stats = cache.stats()
+    entries = len(cache.backend) if hasattr(cache.backend, "__len__") else None
+    return {"backend": stats["backend"], "entries": entries, "hit_ratio": stats["hit_ratio"]}
+
+class ReadinessProbe:
+    def __init__(
+        self,
+        engine,
+        pool_engines: Callable[[], List[Tuple[str, object]]],
+        cache: Cache,
+        timeout: float,
+        ttl: float,
+        max_saturation: float,
+    ):
+        self.engine = engine
+        self.pool_engines = pool_engines
+        self.cache = cache
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_saturation = max_saturation
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readiness")
+        self._pending: Optional[Future] = None
+        self._result: Optional[Tuple[bool, dict]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _select_one(self) -> float:
+        started = time.perf_counter()
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return (time.perf_counter() - started) * 1000
+
+    def _check_database(self) -> dict:
+        if self._pending is not None and not self._pending.done():
+            # A checagem anterior ainda está presa no banco: não empilha outra
+            return {"ok": False, "status": "busy"}
+        self._pending = self._executor.submit(self._select_one)
+        try:
+            return {"ok": True, "status": "ok", "latency_ms": round(self._pending.result(timeout=self.timeout), 2)}
+        except FutureTimeout:
+            logger.warning("Readiness: SELECT 1 excedeu %ss", self.timeout)
+            return {"ok": False, "status": "timeout"}
+        except Exception:
+            logger.exception("Readiness: banco indisponível")
+            return {"ok": False, "status": "unavailable"}
+
+    def check(self) -> Tuple[bool, dict]:
+        """(pronto, relatório); probes concorrentes esperam e reaproveitam a mesma checagem"""
+        with self._lock:
+            if self._result is not None and time.monotonic() - self._checked_at < self.ttl:
+                return self._result
+            database = self._check_database()
+            pools = {name: pool_saturation(engine) for name, engine in self.pool_engines()}
+            saturated = [
+                name for name, pool in pools.items()
+                if pool["saturation"] is not None and pool["saturation"] >= self.max_saturation
+            ]
+            ready = database["ok"] and not saturated
+            report = {
+                "status": "ready" if ready else "unavailable",
+                "checks": {
+                    "database": database,
+                    "pool": dict(pools, saturated=saturated),
+                    "cache": cache_warmth(self.cache),
+                },
+            }
+            self._result, self._checked_at = (ready, report), time.monotonic()
+            return self._result
@@ -0,0 +1,70 @@
+import hashlib
+import json
+from typing import Any, Callable, Dict, Tuple
+
+from fastapi import Request, Response, status
+
+from app.config import settings
+from app.utils.cache import catalog_cache
+from app.utils.serialization import json_response
+
+# Requisições condicionais (ETag / If-None-Match) no catálogo
+#
+# A ETag é um hash fraco da representação JSON e fica guardada junto com
+# ela no cache do catálogo: um If-None-Match que bate devolve 304 sem
+# consultar o banco nem serializar nada. Como o hash cobre o corpo inteiro,
+# qualquer mudança (inclusive em updated_at ou na categoria embutida)
+# gera outra ETag. Não há Last-Modified: updated_at do produto não cobre a
+# categoria embutida, e um If-Modified-Since daria 304 falso.
+
+def etag_for(data: Any) -> str:
+    raw = json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+    return f'W/"{hashlib.blake2b(raw, digest_size=12).hexdigest()}"'
+
+def cached_representation(cache_key: str, build: Callable[[], Any]) -> Tuple[Any, str]:
+    """(dados, etag) do cache do catálogo, construindo e guardando se ausente"""
+    entry = catalog_cache.get(cache_key)
+    if entry is None:
+        data = build()
+        entry = {"data": data, "etag": etag_for(data)}
+        catalog_cache.set(cache_key, entry)
+    return entry["data"], entry["etag"]
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Comparação fraca (RFC 9110): ignora o prefixo W/
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    return if_none_match is not None and _etag_matches(if_none_match, etag)
+
+def validator_headers(route: str, etag: str) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    cache_control = settings.HTTP_CACHE_CONTROL.get(route)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    route: str,
+    data: Any,
+    etag: str,
+    fast: bool = False,
+):
+    """
+    304 se o cliente já tem a representação; senão os dados com ETag e o
+    Cache-Control configurado para a rota.
+    """
+    headers = validator_headers(route, etag)
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if fast:
+        return json_response(data, headers=headers)
+    response.headers.update(headers)
+    return data
+
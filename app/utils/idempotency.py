@@ -0,0 +1,110 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.idempotency import IdempotencyKey
+
+# Idempotency-Key em POST /orders
+#
+# A chave é reservada com INSERT ... ON CONFLICT DO NOTHING no início da
+# transação do pedido e a resposta é gravada na mesma linha antes do
+# commit: ou o pedido e a resposta existem juntos, ou nenhum dos dois.
+# Um retry encontra a resposta com um SELECT pela chave primária e não
+# toca em produtos nem em estoque. Um duplicado concorrente bloqueia no
+# INSERT até a transação em andamento terminar (lock da chave única no
+# PostgreSQL, lock de escrita no SQLite) e então devolve a mesma resposta.
+# Se o pedido falhar, o rollback libera a chave para uma nova tentativa.
+# Em outros bancos a chave é reservada com um INSERT simples em savepoint:
+# o duplicado espera no índice único e recebe IntegrityError.
+
+class IdempotencyKeyReusedError(Exception):
+    """A mesma chave foi enviada com outro corpo de requisição"""
+
+    detail = "Idempotency-Key já usada com outro corpo de requisição"
+
+def scoped_key(user_id: int, key: str) -> str:
+    """Hash de tamanho fixo de (usuário, chave): chaves iguais de usuários diferentes não colidem"""
+    return hashlib.blake2b(f"{user_id}:{key}".encode(), digest_size=16).hexdigest()
+
+def request_fingerprint(payload: BaseModel) -> str:
+    return hashlib.blake2b(payload.model_dump_json().encode(), digest_size=16).hexdigest()
+
+def _cutoff() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+
+def stored_response(db: Session, key: str, fingerprint: str) -> Optional[dict]:
+    """Resposta gravada para a chave, ou None se ela não existe ou expirou"""
+    row = db.query(
+        IdempotencyKey.request_hash, IdempotencyKey.response, IdempotencyKey.created_at
+    ).filter(IdempotencyKey.key == key).first()
+    if row is None or row.response is None:
+        return None
+    if row.created_at < _cutoff():
+        db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+        return None
+    if row.request_hash != fingerprint:
+        raise IdempotencyKeyReusedError()
+    return json.loads(row.response)
+
+_last_purge = 0.0
+_purge_lock = threading.Lock()
+
+def _purge_expired(db: Session) -> None:
+    """Remove um lote de chaves expiradas, no máximo uma vez por intervalo neste processo"""
+    global _last_purge
+    with _purge_lock:
+        now = time.monotonic()
+        if now - _last_purge < settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS:
+            return
+        _last_purge = now
+    expired = select(IdempotencyKey.key).where(
+        IdempotencyKey.created_at < _cutoff()
+    ).limit(settings.IDEMPOTENCY_PURGE_BATCH)
+    db.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired)))
+
+_UPSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+def _claim_portable(db: Session, values: dict) -> bool:
+    """INSERT em savepoint para bancos sem ON CONFLICT: a violação da chave única desfaz só ele"""
+    try:
+        with db.begin_nested():
+            db.execute(insert(IdempotencyKey).values(**values))
+    except IntegrityError:
+        return False
+    return True
+
+def claim_key(db: Session, key: str, fingerprint: str) -> bool:
+    """
+    Reserva a chave na transação atual.
+
+    False: outra transação gravou a chave (se ainda estava em andamento,
+    o INSERT esperou por ela) e stored_response já enxerga a resposta.
+    """
+    _purge_expired(db)
+    values = {"key": key, "request_hash": fingerprint, "created_at": datetime.utcnow()}
+    upsert = _UPSERTS.get(db.get_bind().dialect.name)
+    if upsert is None:
+        return _claim_portable(db, values)
+    result = db.execute(
+        upsert(IdempotencyKey).values(**values).on_conflict_do_nothing(index_elements=["key"])
+    )
+    return result.rowcount == 1
+
+def save_response(db: Session, key: str, data: dict) -> None:
+    """Grava a resposta na linha reservada (chamar antes do commit do pedido)"""
+    db.execute(
+        update(IdempotencyKey).where(IdempotencyKey.key == key).values(
+            response=json.dumps(data, separators=(",", ":"))
+        )
+    )
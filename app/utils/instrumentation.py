@@ -0,0 +1,261 @@
+import asyncio
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import Histogram
+
+# Instrumentação por request (REQUEST_METRICS)
+#
+# Os hooks do SQLAlchemy e o tempo de serialização (TimedRoute e o render
+# do response class) escrevem no RequestStats do request corrente (ContextVar: o threadpool do Starlette e o run_sync
+# da AsyncSession copiam o contexto). O middleware devolve o resumo no
+# header Server-Timing e agrega por rota (template do path, não o path
+# concreto) para o /metrics. O tempo de banco é o do execute de cada
+# statement (o fetch das linhas conta no tempo total, não no db).
+
+DURATION_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+    serialization_ms: float = 0.0
+    # Início do trecho medido pelo TimedRoute (endpoint já retornou)
+    serialization_started: Optional[float] = None
+
+    def record_statement(self, statement: str, elapsed_ms: float) -> None:
+        self.statements += 1
+        self.db_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def server_timing(self, total_ms: float) -> str:
+        return ", ".join([
+            f'db;dur={self.db_ms:.2f};desc="{self.statements} statements"',
+            f"db-slowest;dur={self.slowest_ms:.2f}",
+            f"serialize;dur={self.serialization_ms:.2f}",
+            f"total;dur={total_ms:.2f}",
+        ])
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._instrumentation_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_instrumentation_started", None)
+    if stats is not None and started is not None:
+        stats.record_statement(statement, (time.perf_counter() - started) * 1000)
+
+def instrument_engine(engine) -> None:
+    """Registra os hooks em um Engine síncrono (para AsyncEngine, use .sync_engine)"""
+    if not event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+@contextmanager
+def serialization_timer():
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _current.get()
+        # Dentro do trecho do TimedRoute o tempo já está sendo contado
+        if stats is not None and stats.serialization_started is None:
+            stats.serialization_ms += (time.perf_counter() - started) * 1000
+
+def _endpoint_returned() -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.serialization_started = time.perf_counter()
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    # functools.wraps preserva a assinatura que o FastAPI inspeciona
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            _endpoint_returned()
+            return result
+    else:
+        @functools.wraps(endpoint)
+        def timed(*args, **kwargs):
+            result = endpoint(*args, **kwargs)
+            _endpoint_returned()
+            return result
+    return timed
+
+class TimedRoute(APIRoute):
+    """
+    Route class (APIRouter(route_class=TimedRoute)) que soma ao tempo de
+    serialização o trecho entre o retorno do endpoint e a resposta pronta:
+    validação/serialização do response_model e render do JSON.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            try:
+                return await handler(request)
+            finally:
+                stats = _current.get()
+                if stats is not None and stats.serialization_started is not None:
+                    stats.serialization_ms += (time.perf_counter() - stats.serialization_started) * 1000
+                    stats.serialization_started = None
+
+        return timed_handler
+
+def timed_response_class(response_class):
+    """Subclasse que soma o render() ao tempo de serialização do request"""
+    class TimedResponse(response_class):
+        def render(self, content) -> bytes:
+            with serialization_timer():
+                return super().render(content)
+
+    TimedResponse.__name__ = response_class.__name__
+    return TimedResponse
+
+class RouteMetrics:
+    def __init__(self):
+        self.duration_ms = Histogram(DURATION_BUCKETS_MS)
+        self.db_ms = Histogram(DURATION_BUCKETS_MS)
+        self.serialization_ms = Histogram(DURATION_BUCKETS_MS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+
+class RequestMetrics:
+    """Histogramas por rota ("GET /products/{product_id}")"""
+
+    def __init__(self):
+        self._routes: Dict[str, RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, stats: RequestStats, total_ms: float) -> None:
+        with self._lock:
+            metrics = self._routes.get(route)
+            if metrics is None:
+                metrics = self._routes[route] = RouteMetrics()
+            if stats.slowest_ms > metrics.slowest_ms:
+                metrics.slowest_ms = stats.slowest_ms
+                metrics.slowest_statement = stats.slowest_statement
+        metrics.duration_ms.observe(total_ms)
+        metrics.db_ms.observe(stats.db_ms)
+        metrics.serialization_ms.observe(stats.serialization_ms)
+        metrics.statements.observe(stats.statements)
+
+    def routes(self) -> Dict[str, RouteMetrics]:
+        with self._lock:
+            return dict(self._routes)
+
+    def snapshot(self) -> dict:
+        return {
+            route: {
+                "duration_ms": metrics.duration_ms.snapshot(),
+                "db_ms": metrics.db_ms.snapshot(),
+                "serialization_ms": metrics.serialization_ms.snapshot(),
+                "statements": metrics.statements.snapshot(),
+                "slowest_statement_ms": metrics.slowest_ms,
+                "slowest_statement": metrics.slowest_statement,
+            }
+            for route, metrics in sorted(self.routes().items())
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+request_metrics = RequestMetrics()
+
+def route_name(scope: Scope) -> str:
+    route = scope.get("route")
+    # Paths sem rota (404) não viram séries próprias
+    return f"{scope['method']} {route.path}" if route is not None else "unmatched"
+
+class RequestMetricsMiddleware:
+    def __init__(self, app: ASGIApp, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message):
+            # Em streaming, o Server-Timing cobre só até o início da resposta
+            if message["type"] == "http.response.start" and self.server_timing:
+                total_ms = (time.perf_counter() - started) * 1000
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing(total_ms))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            request_metrics.observe(route_name(scope), stats, (time.perf_counter() - started) * 1000)
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _histogram_lines(name: str, labels: str, snapshot: dict):
+    for bound, count in snapshot["buckets"].items():
+        yield f'{name}_bucket{{{labels}{"," if labels else ""}le="{bound}"}} {count}'
+    suffix = f"{{{labels}}}" if labels else ""
+    yield f"{name}_sum{suffix} {snapshot['sum']}"
+    yield f"{name}_count{suffix} {snapshot['count']}"
+
+def prometheus_text(pool: Optional[dict] = None, cache: Optional[dict] = None) -> str:
+    """Formato de exposição texto do Prometheus (0.0.4)"""
+    lines = []
+    routes = request_metrics.routes()
+    for name, attribute, help_text in (
+        ("http_request_duration_ms", "duration_ms", "Duração do request (ms)"),
+        ("http_request_db_ms", "db_ms", "Tempo em statements SQL por request (ms)"),
+        ("http_request_serialization_ms", "serialization_ms", "Tempo de serialização por request (ms)"),
+        ("http_request_sql_statements", "statements", "Statements SQL por request"),
+    ):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for route, metrics in sorted(routes.items()):
+            lines += _histogram_lines(name, f'route="{_label(route)}"', getattr(metrics, attribute).snapshot())
+
+    lines += ["# HELP http_request_slowest_statement_ms Statement SQL mais lento visto na rota (ms)",
+              "# TYPE http_request_slowest_statement_ms gauge"]
+    lines += [f'http_request_slowest_statement_ms{{route="{_label(route)}"}} {metrics.slowest_ms}'
+              for route, metrics in sorted(routes.items())]
+
+    if pool and "wait_ms" in pool:
+        for key in ("size", "checked_out", "overflow", "max_overflow"):
+            lines += [f"# TYPE db_pool_{key} gauge", f"db_pool_{key} {pool[key]}"]
+        lines += ["# TYPE db_pool_timeouts_total counter", f"db_pool_timeouts_total {pool['timeouts']}"]
+        lines += ["# TYPE db_pool_wait_ms histogram"]
+        lines += _histogram_lines("db_pool_wait_ms", "", pool["wait_ms"])
+
+    if cache:
+        for key in ("hits", "misses"):
+            lines += [f"# TYPE catalog_cache_{key}_total counter", f"catalog_cache_{key}_total {cache[key]}"]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,32 @@
+import threading
+from bisect import bisect_left
+from typing import Sequence
+
+class Histogram:
+    """Histograma cumulativo simples (mesma semântica de buckets do Prometheus)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative = []
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), self._counts):
+                running += count
+                cumulative.append(("+Inf" if bound == float("inf") else bound, running))
+            return {
+                "buckets": dict(cumulative),
+                "sum": self._sum,
+                "count": self._count,
+            }
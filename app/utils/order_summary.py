@@ -0,0 +1,192 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, cast, delete, distinct, func, insert, inspect, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.order_summary import OrderDailySummary
+from app.utils.events import Event, event_bus
+
+# Read model dos painéis de admin (order_daily_summary)
+#
+# O checkout não toca no agregado: a linha ALL_CATEGORIES de (dia, status)
+# é a mesma para todos os pedidos do dia, e atualizá-la na transação do
+# pedido serializaria os checkouts concorrentes até o commit. Os eventos
+# order.created e order.status_changed da outbox levam o pedido ao
+# agregado fora do request (sync_order_summary, na transação do worker):
+# +1 pedido, unidades e receita em (dia, status, categoria) e na linha
+# ALL_CATEGORIES, ou a contribuição movida do status somado para o atual.
+# orders.summarized_status guarda o status já somado, então reentregas
+# (at-least-once) e eventos fora de ordem não contam o pedido duas vezes.
+# A categoria é a gravada em order_items no checkout: recategorizar um
+# produto depois não desloca pedidos antigos entre categorias.
+# As consultas leem O(dias × status × categorias) linhas, independente do
+# volume de orders/order_items. rebuild_order_summary recalcula tudo a
+# partir dos pedidos (migration, massa de benchmark, reconciliação).
+
+ALL_CATEGORIES = 0
+
+# category_id -> (unidades, receita); category_id None = item sem categoria gravada
+Breakdown = Dict[Optional[int], Tuple[int, float]]
+
+def stored_breakdown(db: Session, order_id: int) -> Breakdown:
+    """Breakdown pela categoria gravada nos itens (a mesma usada no checkout)"""
+    rows = db.query(
+        OrderItem.category_id, func.sum(OrderItem.quantity), func.sum(OrderItem.price * OrderItem.quantity)
+    ).filter(OrderItem.order_id == order_id).group_by(OrderItem.category_id).all()
+    return {category_id: (units, revenue) for category_id, units, revenue in rows}
+
+def _delta_rows(day: date, status: OrderStatus, breakdown: Breakdown, sign: int) -> List[dict]:
+    rows = [
+        {"day": day, "status": status, "category_id": category_id,
+         "order_count": sign, "units": sign * units, "revenue": sign * revenue}
+        for category_id, (units, revenue) in breakdown.items()
+        if category_id is not None
+    ]
+    rows.append({
+        "day": day, "status": status, "category_id": ALL_CATEGORIES, "order_count": sign,
+        "units": sign * sum(units for units, _ in breakdown.values()),
+        "revenue": sign * sum(revenue for _, revenue in breakdown.values()),
+    })
+    return rows
+
+def _apply(db: Session, rows: List[dict]) -> None:
+    """Upsert somando os deltas (INSERT ... ON CONFLICT DO UPDATE)"""
+    dialect = db.get_bind().dialect.name
+    upsert = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}[dialect]
+    statement = upsert(OrderDailySummary)
+    statement = statement.on_conflict_do_update(
+        index_elements=["day", "status", "category_id"],
+        set_={
+            "order_count": OrderDailySummary.order_count + statement.excluded.order_count,
+            "units": OrderDailySummary.units + statement.excluded.units,
+            "revenue": OrderDailySummary.revenue + statement.excluded.revenue,
+        },
+    )
+    db.execute(statement, rows)
+
+def sync_order_summary(db: Session, order_id: int) -> None:
+    """Leva a contribuição do pedido do status já somado para o status atual (idempotente)"""
+    order = db.query(
+        Order.created_at, Order.status, Order.summarized_status
+    ).filter(Order.id == order_id).with_for_update().first()
+    if order is None or order.summarized_status == order.status:
+        return
+    # Marca antes de somar: de duas entregas concorrentes, só uma sai do mesmo status somado
+    # (updated_at explícito: o onupdate do modelo não vale para esta escrita interna)
+    changed = db.execute(
+        update(Order).where(
+            Order.id == order_id,
+            Order.summarized_status.is_(None) if order.summarized_status is None
+            else Order.summarized_status == order.summarized_status,
+        ).values(summarized_status=order.status, updated_at=Order.updated_at)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not changed:
+        return
+    breakdown = stored_breakdown(db, order_id)
+    day = order.created_at.date()
+    rows = _delta_rows(day, order.status, breakdown, 1)
+    if order.summarized_status is not None:
+        rows = _delta_rows(day, order.summarized_status, breakdown, -1) + rows
+    _apply(db, rows)
+
+@event_bus.subscribe("order.created")
+@event_bus.subscribe("order.status_changed")
+def summarize_order(event: Event) -> None:
+    """Assinante da outbox: escreve na transação do worker, commitada junto com a entrega"""
+    sync_order_summary(event.db, event.payload["order_id"])
+
+def _day_expression(dialect: str):
+    # date() no SQLite devolve 'YYYY-MM-DD', o mesmo formato do tipo Date
+    return func.date(Order.created_at) if dialect == "sqlite" else cast(Order.created_at, Date)
+
+def rebuild_order_summary(conn) -> None:
+    """Recalcula order_daily_summary a partir de orders/order_items"""
+    day = _day_expression(conn.dialect.name)
+    columns = ["day", "status", "category_id", "order_count", "units", "revenue"]
+    units = func.sum(OrderItem.quantity)
+    revenue = func.sum(OrderItem.price * OrderItem.quantity)
+    per_category = select(
+        day, Order.status, OrderItem.category_id, func.count(distinct(Order.id)), units, revenue
+    ).join(OrderItem, OrderItem.order_id == Order.id).where(
+        OrderItem.category_id.isnot(None)
+    ).group_by(day, Order.status, OrderItem.category_id)
+    totals = select(
+        day, Order.status, literal(ALL_CATEGORIES), func.count(distinct(Order.id)), units, revenue
+    ).join(OrderItem, OrderItem.order_id == Order.id).group_by(day, Order.status)
+
+    conn.execute(delete(OrderDailySummary))
+    conn.execute(insert(OrderDailySummary).from_select(columns, per_category))
+    conn.execute(insert(OrderDailySummary).from_select(columns, totals))
+    # Todos os pedidos passam a estar somados no status atual
+    conn.execute(
+        update(Order).where(
+            Order.summarized_status.is_(None) | (Order.summarized_status != Order.status)
+        ).values(summarized_status=Order.status, updated_at=Order.updated_at)
+    )
+
+def ensure_order_summary(engine) -> None:
+    """Popula order_daily_summary se ela acabou de ser criada em um banco que já tem pedidos"""
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        if not inspector.has_table("orders") or not inspector.has_table(OrderDailySummary.__tablename__):
+            return
+        empty = conn.execute(select(OrderDailySummary.day).limit(1)).first() is None
+        if empty and conn.execute(select(Order.id).limit(1)).first() is not None:
+            rebuild_order_summary(conn)
+
+def _filtered(query, date_from: Optional[date], date_to: Optional[date], status: Optional[OrderStatus]):
+    if date_from:
+        query = query.filter(OrderDailySummary.day >= date_from)
+    if date_to:
+        query = query.filter(OrderDailySummary.day <= date_to)
+    if status:
+        query = query.filter(OrderDailySummary.status == status)
+    return query
+
+def daily_summary(
+    db: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status: Optional[OrderStatus] = None,
+    category_id: Optional[int] = None,
+) -> List[dict]:
+    """Pedidos, unidades e receita por dia e status (todas as categorias ou uma)"""
+    query = db.query(
+        OrderDailySummary.day, OrderDailySummary.status, OrderDailySummary.order_count,
+        OrderDailySummary.units, OrderDailySummary.revenue
+    ).filter(
+        OrderDailySummary.category_id == (category_id or ALL_CATEGORIES),
+        OrderDailySummary.order_count > 0,
+    )
+    query = _filtered(query, date_from, date_to, status)
+    return [
+        {"day": day, "status": row_status, "orders": orders, "units": units, "revenue": round(revenue, 2)}
+        for day, row_status, orders, units, revenue in query.order_by(
+            OrderDailySummary.day, OrderDailySummary.status
+        )
+    ]
+
+def category_summary(
+    db: Session,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    status: Optional[OrderStatus] = None,
+) -> List[dict]:
+    """Pedidos, unidades e receita por categoria no período"""
+    query = db.query(
+        OrderDailySummary.category_id, func.sum(OrderDailySummary.order_count),
+        func.sum(OrderDailySummary.units), func.sum(OrderDailySummary.revenue)
+    ).filter(OrderDailySummary.category_id != ALL_CATEGORIES)
+    query = _filtered(query, date_from, date_to, status)
+    rows = query.group_by(OrderDailySummary.category_id).having(
+        func.sum(OrderDailySummary.order_count) > 0
+    ).order_by(OrderDailySummary.category_id)
+    return [
+        {"category_id": category_id, "orders": orders, "units": units, "revenue": round(revenue, 2)}
+        for category_id, orders, units, revenue in rows
+    ]
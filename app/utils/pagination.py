@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+def encode_cursor(*values: Any) -> str:
+    """Gera um cursor opaco a partir dos valores da chave de ordenação"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, *types: type) -> Optional[tuple]:
+    """
+    Decodifica um cursor gerado por encode_cursor.
+
+    Cursor vazio significa primeira página (retorna None).
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if len(payload) != len(types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for type_, value in zip(types, payload)
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido"
+        )
+
+def keyset_page(query, columns: List, cursor: str, limit: int, descending: bool = False):
+    """
+    Aplica paginação por cursor (keyset) ordenada pelas colunas informadas.
+
+    Em vez de OFFSET, filtra pelas linhas após a última chave vista, o que
+    mantém o custo de qualquer página igual ao da primeira quando existe um
+    índice composto nessas colunas. Retorna (linhas, next_cursor).
+    """
+    after = decode_cursor(cursor, *[column.type.python_type for column in columns])
+    if after is not None:
+        key = tuple_(*columns)
+        query = query.filter(key < after if descending else key > after)
+
+    order_by = [column.desc() if descending else column.asc() for column in columns]
+    rows = query.order_by(*order_by).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(*[getattr(last, column.key) for column in columns])
+    return rows, next_cursor
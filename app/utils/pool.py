@@ -0,0 +1,53 @@
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.utils.metrics import Histogram
+
+# Tempo de espera por uma conexão, em milissegundos
+WAIT_BUCKETS_MS = (0.5, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 30000)
+
+class _PoolMetricsMixin:
+    """
+    Mede o tempo de checkout (espera na fila + criação da conexão) e conta
+    os timeouts do pool ("QueuePool limit ... reached").
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = Histogram(WAIT_BUCKETS_MS)
+        self.timeouts = 0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_histogram.observe((time.perf_counter() - started) * 1000)
+
+    def metrics(self) -> dict:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "timeouts": self.timeouts,
+            "wait_ms": self.wait_histogram.snapshot(),
+        }
+
+class InstrumentedQueuePool(_PoolMetricsMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(_PoolMetricsMixin, AsyncAdaptedQueuePool):
+    pass
+
+def pool_metrics(engine) -> dict:
+    """Métricas do pool de um engine (sync ou async)"""
+    pool = engine.pool
+    if isinstance(pool, _PoolMetricsMixin):
+        return pool.metrics()
+    return {"pool": type(pool).__name__, "status": pool.status()}
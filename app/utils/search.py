@@ -0,0 +1,108 @@
+import re
+from sqlalchemy import DDL, column, event, func, inspect, literal_column, or_, table, text
+from sqlalchemy.orm import Query
+
+from app.models.product import Product
+
+# Índice de busca textual de produtos (nome + descrição)
+#
+# - PostgreSQL: índice GIN sobre to_tsvector('simple', nome || descrição),
+#   sem manutenção manual (é um índice de expressão).
+# - SQLite: tabela FTS5 de conteúdo externo, mantida por triggers de
+#   insert/update/delete em products.
+# - Outros bancos: ILIKE em nome e descrição.
+
+FTS_TABLE = "products_fts"
+
+_products_fts = table(FTS_TABLE, column("rowid"), column("rank"), column(FTS_TABLE))
+
+_SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description,
+        content='products', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON products BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON products BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    # Só nome/descrição: atualizações de estoque não mexem no índice
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, description ON products BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+]
+
+_POSTGRES_DDL = [
+    """CREATE INDEX IF NOT EXISTS ix_products_search ON products USING gin (
+        to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, ''))
+    )""",
+]
+
+for statement in _SQLITE_DDL:
+    event.listen(Product.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in _POSTGRES_DDL:
+    event.listen(Product.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+event.listen(
+    Product.__table__, "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect="sqlite")
+)
+
+def ensure_search_index(engine) -> None:
+    """
+    Cria o índice de busca em um banco já existente (create_all não dispara
+    after_create para tabelas que já existem) e o popula se estava ausente.
+    """
+    dialect = engine.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        return
+    with engine.begin() as conn:
+        if not inspect(conn).has_table("products"):
+            return
+        if dialect == "postgresql":
+            for statement in _POSTGRES_DDL:
+                conn.execute(text(statement))
+            return
+        missing = not inspect(conn).has_table(FTS_TABLE)
+        for statement in _SQLITE_DDL:
+            conn.execute(text(statement))
+        if missing:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+def _terms(search: str):
+    return re.findall(r"\w+", search.lower())
+
+def _search_vector():
+    # Mesma expressão do índice GIN (constantes literais para o planner usar o índice)
+    return func.to_tsvector(
+        literal_column("'simple'"),
+        func.coalesce(Product.name, literal_column("''"))
+        + literal_column("' '")
+        + func.coalesce(Product.description, literal_column("''"))
+    )
+
+def apply_search(query: Query, search: str, dialect: str, rank: bool = True) -> Query:
+    """
+    Filtra produtos pelo termo em nome e descrição, com prefixo em cada
+    palavra ("note" encontra "Notebook"). Com rank=True ordena por relevância.
+    """
+    terms = _terms(search)
+    if not terms or dialect not in ("sqlite", "postgresql"):
+        pattern = f"%{search}%"
+        return query.filter(or_(Product.name.ilike(pattern), Product.description.ilike(pattern)))
+
+    if dialect == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        query = query.join(_products_fts, _products_fts.c.rowid == Product.id).filter(
+            _products_fts.c[FTS_TABLE].op("MATCH")(match)
+        )
+        return query.order_by(_products_fts.c.rank) if rank else query
+
+    ts_query = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{term}:*" for term in terms))
+    vector = _search_vector()
+    query = query.filter(vector.op("@@")(ts_query))
+    return query.order_by(func.ts_rank(vector, ts_query).desc()) if rank else query
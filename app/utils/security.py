@@ -1,5 +1,10 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
+import multiprocessing
+import threading
+from fastapi.concurrency import run_in_threadpool
 from jose import JWTError, jwt
 import bcrypt  
 from app.config import settings
@@ -11,11 +16,67 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         hashed_password.encode('utf-8')
     )
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
     """Gera hash da senha"""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
     return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
 
+class PasswordPoolBusy(Exception):
+    """Todas as vagas do pool de hashing estão ocupadas"""
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+def _get_executor() -> Optional[Executor]:
+    global _executor
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            if settings.PASSWORD_HASH_EXECUTOR == "process":
+                # spawn: fork de um processo com threads (uvicorn) pode travar
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hash"
+                )
+        return _executor
+
+def run_password_task(fn, *args):
+    """
+    Executa uma função de hashing (bcrypt) no pool dedicado.
+
+    No máximo PASSWORD_HASH_MAX_PENDING tarefas ficam em andamento ou na fila;
+    acima disso PasswordPoolBusy é lançada imediatamente, em vez de prender
+    os workers do servidor esperando bcrypt.
+    """
+    if not _pending.acquire(blocking=False):
+        raise PasswordPoolBusy()
+    try:
+        executor = _get_executor()
+        if executor is None:
+            return fn(*args)
+        return executor.submit(fn, *args).result()
+    finally:
+        _pending.release()
+
+async def run_password_task_async(fn, *args):
+    """Versão assíncrona de run_password_task: aguarda o pool sem bloquear o event loop"""
+    if not _pending.acquire(blocking=False):
+        raise PasswordPoolBusy()
+    try:
+        executor = _get_executor()
+        if executor is None:
+            return await run_in_threadpool(fn, *args)
+        return await asyncio.wrap_future(executor.submit(fn, *args))
+    finally:
+        _pending.release()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Cria um token JWT"""
     to_encode = data.copy()
@@ -0,0 +1,109 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Query, Session
+
+from app.config import settings
+from app.models.category import Category
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.utils.instrumentation import timed_response_class
+
+# Caminho rápido de serialização (FAST_JSON_RESPONSES)
+#
+# As listagens leem só as colunas necessárias (sem hidratar objetos ORM),
+# montam dicts já no formato JSON dos schemas (mesmas chaves e ordem de
+# ProductWithCategory, Category e OrderResponse) e devolvem a resposta
+# pronta, sem passar pela validação do response_model. O ORJSONResponse
+# também vira o response class padrão da aplicação.
+
+@lru_cache(maxsize=None)
+def _response_class(fast: bool, timed: bool):
+    response_class = JSONResponse
+    if fast:
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            raise RuntimeError("FAST_JSON_RESPONSES=true requer o pacote 'orjson' instalado")
+        from fastapi.responses import ORJSONResponse
+        response_class = ORJSONResponse
+    return timed_response_class(response_class) if timed else response_class
+
+def default_response_class():
+    """ORJSONResponse se FAST_JSON_RESPONSES estiver ativo (com o render medido se REQUEST_METRICS)"""
+    return _response_class(settings.FAST_JSON_RESPONSES, settings.REQUEST_METRICS)
+
+def json_response(data: Any, headers: Optional[dict] = None):
+    """Resposta já serializada; o FastAPI não revalida Response com o response_model"""
+    return default_response_class()(content=data, headers=headers)
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+PRODUCT_COLUMNS = [
+    Product.name, Product.description, Product.price, Product.stock, Product.category_id,
+    Product.image_url, Product.id, Product.created_at, Product.updated_at,
+    Category.name.label("category_name"), Category.description.label("category_description"),
+]
+
+def product_rows(query: Query) -> Query:
+    """Troca as entidades de uma query de Product pelas colunas de ProductWithCategory"""
+    return query.with_entities(*PRODUCT_COLUMNS).join(Category, Category.id == Product.category_id)
+
+def product_dict(row) -> dict:
+    return {
+        "name": row.name,
+        "description": row.description,
+        "price": row.price,
+        "stock": row.stock,
+        "category_id": row.category_id,
+        "image_url": row.image_url,
+        "id": row.id,
+        "created_at": _iso(row.created_at),
+        "updated_at": _iso(row.updated_at),
+        "category": {
+            "name": row.category_name,
+            "description": row.category_description,
+            "id": row.category_id,
+        },
+    }
+
+CATEGORY_COLUMNS = [Category.name, Category.description, Category.id]
+
+def category_dict(row) -> dict:
+    return {"name": row.name, "description": row.description, "id": row.id}
+
+ORDER_COLUMNS = [Order.id, Order.user_id, Order.total, Order.status, Order.created_at, Order.updated_at]
+
+def order_dicts(db: Session, rows) -> List[dict]:
+    """Pedidos (linhas de ORDER_COLUMNS) com os itens carregados em uma única query"""
+    orders = {
+        row.id: {
+            "id": row.id,
+            "user_id": row.user_id,
+            "total": row.total,
+            "status": row.status.value if row.status else None,
+            "created_at": _iso(row.created_at),
+            "updated_at": _iso(row.updated_at),
+            "items": [],
+        }
+        for row in rows
+    }
+    if orders:
+        items = db.query(
+            OrderItem.id, OrderItem.order_id, OrderItem.product_id, OrderItem.quantity,
+            OrderItem.price, Product.name.label("product_name")
+        ).outerjoin(Product, Product.id == OrderItem.product_id).filter(
+            OrderItem.order_id.in_(orders.keys())
+        ).order_by(OrderItem.id)
+        for item in items:
+            orders[item.order_id]["items"].append({
+                "id": item.id,
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "price": item.price,
+                "product_name": item.product_name or "Produto removido",
+            })
+    return list(orders.values())
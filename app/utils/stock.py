@@ -0,0 +1,181 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import case, update
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+
+@dataclass
+class StockShortage:
+    """Item que não pôde ser reservado"""
+    product_id: int
+    product_name: str
+    requested: int
+    available: int
+
+class InsufficientStockError(Exception):
+    """Uma ou mais linhas do pedido não têm estoque suficiente"""
+
+    def __init__(self, shortages: List[StockShortage]):
+        self.shortages = shortages
+        super().__init__(self.detail)
+
+    @property
+    def detail(self) -> str:
+        return "; ".join(
+            f"Estoque insuficiente para {shortage.product_name}. Disponível: {shortage.available}"
+            for shortage in self.shortages
+        )
+
+class UnknownProductsError(Exception):
+    """Ajuste de estoque para produtos inexistentes"""
+
+    def __init__(self, product_ids: List[int]):
+        self.product_ids = product_ids
+        super().__init__(self.detail)
+
+    @property
+    def detail(self) -> str:
+        return "Produtos não encontrados: " + ", ".join(str(product_id) for product_id in self.product_ids)
+
+def lock_products(db: Session, product_ids) -> Dict[int, Product]:
+    """
+    Carrega os produtos com SELECT ... FOR UPDATE em ordem crescente de id.
+
+    A ordem determinística evita deadlock entre checkouts concorrentes
+    que disputam os mesmos produtos. No SQLite o FOR UPDATE é ignorado
+    (o banco já serializa escritas).
+    """
+    products = db.query(Product).filter(
+        Product.id.in_(product_ids)
+    ).order_by(Product.id).with_for_update().all()
+    return {product.id: product for product in products}
+
+def reserve_stock(db: Session, quantities: Dict[int, int]) -> None:
+    """
+    Decrementa o estoque de forma atômica com um único UPDATE condicional:
+
+        UPDATE products SET stock = stock - :qty WHERE id = :id AND stock >= :qty
+
+    Se alguma linha não puder ser reservada, a transação é desfeita e
+    InsufficientStockError é lançada com o detalhe de cada item.
+
+    Os itens que falharam vêm do RETURNING do próprio UPDATE: reler o
+    estoque depois do rollback pode não achar a falta (outro request
+    repôs o estoque no meio), e o erro sairia sem nenhum produto.
+    """
+    if not quantities:
+        return
+
+    quantity = case(quantities, value=Product.id)
+    statement = (
+        update(Product)
+        .where(Product.id.in_(quantities.keys()), Product.stock >= quantity)
+        .values(stock=Product.stock - quantity)
+        .execution_options(synchronize_session=False)
+    )
+    returning = db.get_bind().dialect.update_returning
+    if returning:
+        failed = set(quantities) - set(db.execute(statement.returning(Product.id)).scalars())
+    else:
+        failed = set() if db.execute(statement).rowcount == len(quantities) else set(quantities)
+
+    if not failed:
+        return
+
+    db.rollback()
+    rows = db.query(Product.id, Product.name, Product.stock).filter(
+        Product.id.in_(failed)
+    ).order_by(Product.id).all()
+    if not returning:
+        # Sem RETURNING: os que estão em falta agora, ou todos se a releitura não achar nenhum
+        rows = [row for row in rows if row.stock < quantities[row.id]] or rows
+    raise InsufficientStockError([
+        StockShortage(
+            product_id=row.id,
+            product_name=row.name,
+            requested=quantities[row.id],
+            available=row.stock
+        )
+        for row in rows
+    ])
+
+def fold_adjustments(
+    adjustments: Iterable[Tuple[int, Optional[int], Optional[int]]]
+) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """
+    Reduz (product_id, delta, stock) a um delta ou um valor absoluto por
+    produto, na ordem recebida: um stock descarta os deltas anteriores e os
+    deltas seguintes são somados a ele.
+    """
+    deltas: Dict[int, int] = {}
+    levels: Dict[int, int] = {}
+    for product_id, delta, stock in adjustments:
+        if stock is not None:
+            deltas.pop(product_id, None)
+            levels[product_id] = stock
+        elif product_id in levels:
+            levels[product_id] += delta
+        else:
+            deltas[product_id] = deltas.get(product_id, 0) + delta
+    negative = sorted(product_id for product_id, stock in levels.items() if stock < 0)
+    if negative:
+        raise ValueError(f"Estoque resultante negativo para os produtos: {', '.join(map(str, negative))}")
+    return deltas, levels
+
+def adjust_stock(db: Session, deltas: Dict[int, int], levels: Dict[int, int]) -> Dict[int, int]:
+    """
+    Aplica deltas e valores absolutos com dois UPDATEs set-based e devolve
+    o estoque resultante por produto. Não faz commit.
+
+    As linhas são travadas na mesma ordem de lock_products (evita deadlock
+    com create_order) e os deltas são relativos ao valor no banco, então
+    baixas concorrentes de pedidos nunca são sobrescritas. Um delta que
+    deixaria o estoque negativo desfaz tudo (InsufficientStockError).
+    """
+    product_ids = sorted(set(deltas) | set(levels))
+    found = {
+        product_id for (product_id,) in db.query(Product.id).filter(
+            Product.id.in_(product_ids)
+        ).order_by(Product.id).with_for_update()
+    }
+    missing = [product_id for product_id in product_ids if product_id not in found]
+    if missing:
+        db.rollback()
+        raise UnknownProductsError(missing)
+
+    result = {}
+    if deltas:
+        delta = case(deltas, value=Product.id)
+        rows = db.execute(
+            update(Product)
+            .where(Product.id.in_(deltas.keys()), Product.stock + delta >= 0)
+            .values(stock=Product.stock + delta)
+            .returning(Product.id, Product.stock)
+            .execution_options(synchronize_session=False)
+        ).all()
+        result.update({row.id: row.stock for row in rows})
+        if len(rows) < len(deltas):
+            db.rollback()
+            shortages = db.query(Product.id, Product.name, Product.stock).filter(
+                Product.id.in_([product_id for product_id in deltas if product_id not in result])
+            ).order_by(Product.id).all()
+            raise InsufficientStockError([
+                StockShortage(
+                    product_id=row.id,
+                    product_name=row.name,
+                    requested=-deltas[row.id],
+                    available=row.stock
+                )
+                for row in shortages
+            ])
+    if levels:
+        rows = db.execute(
+            update(Product)
+            .where(Product.id.in_(levels.keys()))
+            .values(stock=case(levels, value=Product.id))
+            .returning(Product.id, Product.stock)
+            .execution_options(synchronize_session=False)
+        ).all()
+        result.update({row.id: row.stock for row in rows})
+    return result
@@ -0,0 +1,31 @@
+"""
+Worker da outbox em um processo separado (OUTBOX_WORKER=none na API).
+
+Uso:
+    python -m app.worker          # roda até ser interrompido
+    python -m app.worker --once   # entrega o que estiver pendente e sai
+"""
+import argparse
+import asyncio
+import logging
+
+from app.database import engine
+from app.utils.events import build_outbox_worker
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="Drena a fila uma vez e sai")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = build_outbox_worker(engine)
+    if args.once:
+        print(f"✅ {worker.drain()} evento(s) processado(s)")
+        return
+    try:
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: throughput com N conexões concorrentes, modo sync vs async.
+
+Sobe o uvicorn duas vezes (ASYNC_MODE=false e true) sobre o mesmo banco e
+dispara requests com N conexões simultâneas por um intervalo fixo.
+
+Uso:
+    python -m benchmarks.async_throughput --connections 500 --duration 10
+    python -m benchmarks.async_throughput --path "/products/?limit=20"
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+from benchmarks.common import percentile, run_server, seed_catalog
+
+async def load(base_url, path, connections, duration):
+    samples = []
+    errors = 0
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            while True:
+                began = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                samples.append((time.perf_counter() - began) * 1000)
+
+        # Só contam os requests concluídos dentro da janela; o resto é cancelado
+        tasks = [asyncio.create_task(worker()) for _ in range(connections)]
+        await asyncio.sleep(duration)
+        completed = list(samples)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return completed, errors
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite:///./bench_async.db")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--connections", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--path", default="/products/?limit=20")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ["DATABASE_URL"] = args.url
+    seed_catalog(args.url)
+
+    print(f"{args.connections} conexões, {args.duration}s, GET {args.path}")
+    for mode in ("false", "true"):
+        with run_server(args.port, {"ASYNC_MODE": mode, "CACHE_BACKEND": "none"}) as base_url:
+            samples, errors = asyncio.run(load(base_url, args.path, args.connections, args.duration))
+        label = "async" if mode == "true" else "sync"
+        print(f"  {label:<6} rps={len(samples) / args.duration:8.1f}  p50={statistics.median(samples):7.1f} ms  "
+              f"p99={percentile(samples, 99):7.1f} ms  erros={errors}")
+
+if __name__ == "__main__":
+    main()
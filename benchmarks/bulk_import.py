@@ -0,0 +1,99 @@
+"""
+Benchmark: linhas/s da importação em massa vs POST/PUT um a um.
+
+Mede a criação de N produtos e depois a atualização de preço dos mesmos
+N produtos pelos dois caminhos (banco recriado entre as medições).
+
+Uso:
+    python -m benchmarks.bulk_import --rows 5000 --batch-size 1000
+"""
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+from app.models import Category
+from app.utils.dependencies import get_current_admin_user
+
+def reset(engine):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Category), [{"id": i, "name": f"Categoria {i}"} for i in range(1, 11)])
+
+def product(i):
+    return {"name": f"SKU {i}", "description": "Importado", "price": 10.0 + i % 100, "stock": i % 50,
+            "category_id": 1 + i % 10}
+
+def one_by_one(client, rows):
+    began = time.perf_counter()
+    ids = []
+    for i in range(rows):
+        response = client.post("/products/", json=product(i))
+        assert response.status_code == 201, response.text
+        ids.append(response.json()["id"])
+    created = time.perf_counter() - began
+
+    began = time.perf_counter()
+    for product_id in ids:
+        assert client.put(f"/products/{product_id}", json={"price": 99.0}).status_code == 200
+    return created, time.perf_counter() - began
+
+def bulk(client, rows, batch_size):
+    def post(lines):
+        began = time.perf_counter()
+        response = client.post(
+            "/products/import", params={"batch_size": batch_size}, content="\n".join(lines),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+        assert response.status_code == 200 and not response.json()["errors"], response.text
+        return time.perf_counter() - began
+
+    created = post([json.dumps(product(i)) for i in range(rows)])
+    updated = post([json.dumps({"id": i + 1, "price": 99.0}) for i in range(rows)])
+    return created, updated
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite:///./bench_import.db")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    client = TestClient(app)
+
+    results = {}
+    for name, run in (("um a um", lambda: one_by_one(client, args.rows)),
+                      (f"bulk (lote={args.batch_size})", lambda: bulk(client, args.rows, args.batch_size))):
+        reset(engine)
+        results[name] = run()
+
+    print(f"{args.rows} produtos:")
+    print(f"  {'caminho':<22} {'criação':>14} {'atualização':>14}")
+    for name, (created, updated) in results.items():
+        print(f"  {name:<22} {args.rows / created:>10.0f} l/s {args.rows / updated:>10.0f} l/s")
+    app.dependency_overrides.clear()
+
+if __name__ == "__main__":
+    main()
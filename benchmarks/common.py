@@ -0,0 +1,71 @@
+"""Utilitários compartilhados pelos benchmarks"""
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+import httpx
+from sqlalchemy import create_engine, insert
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def router_routes(app) -> set:
+    """(método, path) de todas as rotas declaradas nos routers da aplicação"""
+    from fastapi.routing import APIRoute
+
+    return {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.endpoint.__module__.startswith("app.routers")
+        for method in route.methods
+    }
+
+def seed_catalog(url, products=100, users=(("bench@test.com", "bench123"),)):
+    """Recria o banco com uma categoria, N produtos e os usuários informados"""
+    from app.database import Base
+    from app.models import Category, Product, User
+    from app.utils.security import get_password_hash
+
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": email, "full_name": "Bench", "hashed_password": get_password_hash(password)}
+            for email, password in users
+        ])
+        conn.execute(insert(Category), [{"id": 1, "name": "Bench"}])
+        conn.execute(insert(Product), [
+            {"name": f"Product {i}", "price": 10.0, "stock": 10, "category_id": 1}
+            for i in range(products)
+        ])
+    engine.dispose()
+
+@contextmanager
+def run_server(port, env_overrides, extra_args=()):
+    """Sobe o uvicorn em um subprocesso e espera o /health responder"""
+    env = dict(os.environ, **env_overrides)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--log-level", "warning", *extra_args],
+        env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(base_url + "/health")
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        yield base_url
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
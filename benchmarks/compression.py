@@ -0,0 +1,112 @@
+"""
+Benchmark: bytes na rede e CPU por resposta com cada codificação.
+
+Mede GET /products com tamanhos de página diferentes (descrições longas) e
+a exportação em streaming de pedidos. O cache do catálogo fica ligado, então
+a diferença de CPU em relação a "identity" é o custo da compressão.
+
+Uso:
+    python -m benchmarks.compression --products 500 --orders 2000 --repeat 30
+"""
+import argparse
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base, get_db
+from app.main import app
+from app.models import Category, Order, OrderItem, Product, User
+from app.models.order import OrderStatus
+from app.utils.compression import available_encodings
+from app.utils.dependencies import get_current_admin_user
+
+DESCRIPTION = (
+    "Produto de alta qualidade com garantia de 12 meses, entrega para todo o Brasil "
+    "e troca grátis em até 30 dias. "
+) * 3
+
+def seed(engine, products: int, orders: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "id": 1, "email": "bench@test.com", "full_name": "Bench", "hashed_password": "x", "is_admin": True
+        }])
+        conn.execute(insert(Category), [{"id": i, "name": f"Categoria {i}"} for i in range(1, 11)])
+        conn.execute(insert(Product), [
+            {"id": i, "name": f"Produto {i}", "description": DESCRIPTION, "price": 10.0 + i,
+             "stock": i % 30, "category_id": 1 + i % 10, "image_url": f"https://cdn.example.com/{i}.jpg"}
+            for i in range(1, products + 1)
+        ])
+        conn.execute(insert(Order), [
+            {"id": i, "user_id": 1, "total": 30.0, "status": OrderStatus.PAID,
+             "created_at": start + timedelta(minutes=i), "updated_at": start + timedelta(minutes=i)}
+            for i in range(1, orders + 1)
+        ])
+        conn.execute(insert(OrderItem), [
+            {"order_id": i, "product_id": 1 + (i + j) % products, "quantity": 1, "price": 10.0}
+            for i in range(1, orders + 1) for j in range(2)
+        ])
+
+def measure(client, path, params, encoding, repeat):
+    headers = {"Accept-Encoding": encoding}
+    for _ in range(3):
+        client.get(path, params=params, headers=headers)
+    samples = []
+    for _ in range(repeat):
+        began = time.process_time()
+        response = client.get(path, params=params, headers=headers)
+        samples.append((time.process_time() - began) * 1000)
+        assert response.status_code == 200, response.text
+    return response.num_bytes_downloaded, statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite:///./bench_compression.db")
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    seed(engine, args.products, args.orders)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    client = TestClient(app)
+
+    encodings = available_encodings(settings.COMPRESSION_ENCODINGS.split(","))
+    cases = [(f"GET /products?limit={n}", "/products/", {"limit": n}) for n in (1, 10, 100, 500)]
+    cases.append(("exportação NDJSON (stream)", "/orders/admin/export", {"format": "ndjson"}))
+
+    print(f"mínimo para comprimir: {settings.COMPRESSION_MIN_SIZE} bytes; CPU = mediana de {args.repeat}")
+    for name, path, params in cases:
+        print(f"\n{name}")
+        print(f"  {'codificação':<10} {'bytes':>10} {'razão':>7} {'CPU ms':>8} {'+CPU ms':>8}")
+        base_bytes, base_cpu = measure(client, path, params, "identity", args.repeat)
+        print(f"  {'identity':<10} {base_bytes:>10} {1:>6.1f}x {base_cpu:>8.2f} {0:>+8.2f}")
+        for encoding in encodings:
+            size, cpu = measure(client, path, params, encoding, args.repeat)
+            print(f"  {encoding:<10} {size:>10} {base_bytes / size:>6.1f}x {cpu:>8.2f} {cpu - base_cpu:>+8.2f}")
+    app.dependency_overrides.clear()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: p99 de GET /products/ sozinho e durante uma rajada de logins.
+
+Sobe o uvicorn em um subprocesso com um banco SQLite próprio, mede a
+latência do catálogo sem carga e depois com N clientes fazendo login em
+loop. Compare com o hashing inline com --workers 0.
+
+Uso:
+    python -m benchmarks.login_storm --storm-clients 32 --duration 10
+    python -m benchmarks.login_storm --workers 0
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+
+import httpx
+
+from benchmarks.common import percentile, run_server, seed_catalog
+
+def measure_catalog(base_url, duration):
+    samples = []
+    deadline = time.monotonic() + duration
+    with httpx.Client(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            began = time.perf_counter()
+            client.get("/products/", params={"limit": 20})
+            samples.append((time.perf_counter() - began) * 1000)
+    return samples
+
+def login_storm(base_url, stop, counters):
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        while not stop.is_set():
+            response = client.post("/auth/login", json={"email": "storm@test.com", "password": "storm123"})
+            counters[response.status_code] = counters.get(response.status_code, 0) + 1
+
+def report(label, samples):
+    print(f"  {label:<16} n={len(samples):<6} p50={statistics.median(samples):7.2f} ms  "
+          f"p95={percentile(samples, 95):7.2f} ms  p99={percentile(samples, 99):7.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--storm-clients", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS do servidor")
+    parser.add_argument("--executor", default="process", choices=["process", "thread"])
+    args = parser.parse_args()
+
+    url = "sqlite:///./bench_login_storm.db"
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ["DATABASE_URL"] = url
+    seed_catalog(url, users=[("storm@test.com", "storm123")])
+
+    env = {
+        "CACHE_BACKEND": "none",
+        "PASSWORD_HASH_WORKERS": str(args.workers),
+        "PASSWORD_HASH_EXECUTOR": args.executor,
+    }
+    with run_server(args.port, env) as base_url:
+        print(f"PASSWORD_HASH_WORKERS={args.workers} ({args.executor}), {args.storm_clients} clientes de login")
+        report("catálogo sozinho", measure_catalog(base_url, args.duration))
+
+        stop = threading.Event()
+        counters = {}
+        storm = [
+            threading.Thread(target=login_storm, args=(base_url, stop, counters), daemon=True)
+            for _ in range(args.storm_clients)
+        ]
+        for thread in storm:
+            thread.start()
+        time.sleep(1)
+        report("durante logins", measure_catalog(base_url, args.duration))
+        stop.set()
+        print(f"  respostas de login: {counters}")
+
+if __name__ == "__main__":
+    main()
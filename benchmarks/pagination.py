@@ -0,0 +1,95 @@
+"""
+Benchmark: latência da página N de /orders/admin/all em offset vs cursor.
+
+Uso:
+    python -m benchmarks.pagination --orders 100000 --page 1000 --limit 20
+"""
+import argparse
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+from app.models.order import Order, OrderStatus
+from app.models.user import User
+from app.utils.dependencies import get_current_admin_user
+
+def seed(engine, orders: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "id": 1, "email": "bench@test.com", "full_name": "Bench",
+            "hashed_password": "x", "is_admin": True
+        }])
+        batch = 10_000
+        for offset in range(0, orders, batch):
+            conn.execute(insert(Order), [
+                {
+                    "user_id": 1,
+                    "total": 10.0,
+                    "status": OrderStatus.PENDING,
+                    "created_at": start + timedelta(seconds=i),
+                    "updated_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + batch, orders))
+            ])
+
+def timed(client, params, repeat):
+    samples = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        response = client.get("/orders/admin/all", params=params)
+        samples.append((time.perf_counter() - began) * 1000)
+        assert response.status_code == 200
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite:///./bench_pagination.db")
+    parser.add_argument("--orders", type=int, default=50_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    seed(engine, max(args.orders, args.page * args.limit))
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    client = TestClient(app)
+
+    # Caminha pelos cursores até a página desejada (não entra na medição)
+    cursor = ""
+    for _ in range(args.page - 1):
+        cursor = client.get("/orders/admin/all", params={"cursor": cursor, "limit": args.limit}).json()["next_cursor"]
+
+    offset_ms = timed(client, {"skip": (args.page - 1) * args.limit, "limit": args.limit}, args.repeat)
+    cursor_ms = timed(client, {"cursor": cursor, "limit": args.limit}, args.repeat)
+
+    print(f"página {args.page} (limit={args.limit}):")
+    print(f"  offset: {offset_ms:8.2f} ms")
+    print(f"  cursor: {cursor_ms:8.2f} ms")
+    app.dependency_overrides.clear()
+
+if __name__ == "__main__":
+    main()
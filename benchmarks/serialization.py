@@ -0,0 +1,117 @@
+"""
+Microbenchmark: CPU por request das listagens com e sem FAST_JSON_RESPONSES.
+
+Mede time.process_time() (CPU do processo, não tempo de parede) de cada
+listagem in-process, com o cache do catálogo desligado para que toda
+requisição consulte o banco e serialize a resposta.
+
+Uso:
+    python -m benchmarks.serialization --products 2000 --orders 500 --repeat 50
+"""
+import argparse
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ["CACHE_BACKEND"] = "none"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base, get_db
+from app.main import app
+from app.models import Category, Order, OrderItem, Product, User
+from app.models.order import OrderStatus
+from app.utils.dependencies import AuthenticatedUser, get_current_admin_user, get_current_user
+
+ENDPOINTS = [
+    ("GET /products", "/products/", {"limit": 100}),
+    ("GET /products (cursor)", "/products/", {"limit": 100, "cursor": ""}),
+    ("GET /products (busca)", "/products/", {"limit": 100, "search": "produto"}),
+    ("GET /categories", "/categories/", {}),
+    ("GET /orders", "/orders/", {"limit": 100}),
+    ("GET /orders/admin/all", "/orders/admin/all", {"limit": 100, "cursor": ""}),
+]
+
+def seed(engine, products: int, orders: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{
+            "id": 1, "email": "bench@test.com", "full_name": "Bench", "hashed_password": "x", "is_admin": True
+        }])
+        conn.execute(insert(Category), [
+            {"id": i, "name": f"Categoria {i}", "description": "Benchmark"} for i in range(1, 21)
+        ])
+        conn.execute(insert(Product), [
+            {"id": i, "name": f"Produto {i}", "description": "Descrição do produto para benchmark",
+             "price": 10.0 + i, "stock": i % 30, "category_id": 1 + i % 20,
+             "image_url": f"https://cdn.example.com/{i}.jpg"}
+            for i in range(1, products + 1)
+        ])
+        conn.execute(insert(Order), [
+            {"id": i, "user_id": 1, "total": 30.0, "status": OrderStatus.PAID,
+             "created_at": start + timedelta(minutes=i), "updated_at": start + timedelta(minutes=i)}
+            for i in range(1, orders + 1)
+        ])
+        conn.execute(insert(OrderItem), [
+            {"order_id": i, "product_id": 1 + (i * 3 + j) % products, "quantity": 1, "price": 10.0}
+            for i in range(1, orders + 1) for j in range(3)
+        ])
+
+def cpu_per_request(client, path, params, repeat):
+    for _ in range(3):
+        client.get(path, params=params)
+    samples = []
+    for _ in range(repeat):
+        began = time.process_time()
+        response = client.get(path, params=params)
+        samples.append((time.process_time() - began) * 1000)
+        assert response.status_code == 200, response.text
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite:///./bench_serialization.db")
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    seed(engine, args.products, args.orders)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    user = AuthenticatedUser(
+        id=1, email="bench@test.com", full_name="Bench", is_active=True, is_admin=True, created_at=datetime(2024, 1, 1)
+    )
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_current_admin_user] = lambda: user
+    client = TestClient(app)
+
+    print(f"CPU por request (mediana de {args.repeat}), ms:")
+    print(f"  {'endpoint':<26} {'antes':>8} {'depois':>8} {'ganho':>7}")
+    for name, path, params in ENDPOINTS:
+        settings.FAST_JSON_RESPONSES = False
+        before = cpu_per_request(client, path, params, args.repeat)
+        settings.FAST_JSON_RESPONSES = True
+        after = cpu_per_request(client, path, params, args.repeat)
+        print(f"  {name:<26} {before:>8.2f} {after:>8.2f} {before / after:>6.1f}x")
+    app.dependency_overrides.clear()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+"""
+Suíte de carga: todas as rotas dos routers com clientes concorrentes.
+
+Popula o banco com benchmarks.datagen (ou reaproveita um banco já
+populado com --reuse), dispara --requests requests por workload com
+--concurrency clientes simultâneos in-process (ASGI, sem rede) e/ou contra
+o uvicorn, e grava p50/p95/p99, RPS e SQL por request (lido do header
+Server-Timing) em JSON. O modo compare aponta regressões entre duas
+execuções e sai com código 1.
+
+Uso:
+    python -m benchmarks.suite run --products 100000 --orders 1000000 --output base.json
+    python -m benchmarks.suite run --reuse --mode both --output novo.json
+    python -m benchmarks.suite compare base.json novo.json --threshold 10
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx
+from sqlalchemy import create_engine, func, insert, select
+
+from benchmarks.common import percentile, router_routes, run_server
+
+CUSTOMER_EMAIL = "user2@bench.com"
+SQL_COUNT = re.compile(r'db;[^,]*desc="(\d+) statements"')
+SQL_TOLERANCE = 0.05
+
+@dataclass
+class Context:
+    """Ids do banco populado usados para montar os requests"""
+    rng: random.Random
+    run_id: str
+    category_ids: List[int]
+    product_ids: List[int]
+    orders: int
+    in_stock: List[int]
+    own_orders: List[int]
+    disposable_products: List[int] = field(default_factory=list)
+    disposable_categories: List[int] = field(default_factory=list)
+
+@dataclass
+class Workload:
+    name: str
+    method: str
+    route: str
+    build: Callable[[Context, int], dict]
+    role: Optional[str] = None  # None | customer | admin
+    max_requests: Optional[int] = None  # limita rotas caras (bcrypt)
+
+def _get(path, **params):
+    return lambda ctx, i: {"url": path, "params": params}
+
+def _product(ctx):
+    return ctx.rng.choice(ctx.product_ids)
+
+def _category(ctx):
+    return ctx.rng.choice(ctx.category_ids)
+
+def _export_window(ctx, i):
+    started = datetime(2024, 1, 1) + timedelta(seconds=30 * ctx.rng.randint(1, ctx.orders))
+    return {"url": "/orders/admin/export",
+            "params": {"created_from": started.isoformat(), "created_to": (started + timedelta(hours=1)).isoformat()}}
+
+WORKLOADS = [
+    Workload("auth.me", "GET", "/auth/me", _get("/auth/me"), role="customer"),
+    Workload("auth.login", "POST", "/auth/login",
+             lambda ctx, i: {"url": "/auth/login", "json": {"email": CUSTOMER_EMAIL, "password": "bench123"}},
+             max_requests=50),
+    Workload("auth.register", "POST", "/auth/register",
+             lambda ctx, i: {"url": "/auth/register", "json": {
+                 "email": f"bench-{ctx.run_id}-{i}@bench.com", "full_name": "Bench", "password": "bench123"}},
+             max_requests=50),
+    Workload("categories.list", "GET", "/categories/", _get("/categories/")),
+    Workload("categories.list.cursor", "GET", "/categories/", _get("/categories/", cursor="")),
+    Workload("categories.get", "GET", "/categories/{category_id}",
+             lambda ctx, i: {"url": f"/categories/{_category(ctx)}"}),
+    Workload("products.list", "GET", "/products/", _get("/products/", limit=20)),
+    Workload("products.list.cursor", "GET", "/products/", _get("/products/", limit=20, cursor="")),
+    Workload("products.list.category", "GET", "/products/",
+             lambda ctx, i: {"url": "/products/", "params": {"category_id": _category(ctx),
+                                                             "limit": 20}}),
+    Workload("products.list.price", "GET", "/products/",
+             lambda ctx, i: {"url": "/products/", "params": {"min_price": (low := ctx.rng.randint(5, 4900)),
+                                                             "max_price": low + 50, "limit": 20}}),
+    Workload("products.search", "GET", "/products/",
+             lambda ctx, i: {"url": "/products/", "params": {"search": f"produto {_product(ctx)}", "limit": 20}}),
+    Workload("products.facets", "GET", "/products/facets", _get("/products/facets")),
+    Workload("products.facets.category", "GET", "/products/facets",
+             lambda ctx, i: {"url": "/products/facets", "params": {"category_id": _category(ctx)}}),
+    Workload("products.get", "GET", "/products/{product_id}", lambda ctx, i: {"url": f"/products/{_product(ctx)}"}),
+    Workload("orders.mine", "GET", "/orders/", _get("/orders/", limit=20), role="customer"),
+    Workload("orders.get", "GET", "/orders/{order_id}",
+             lambda ctx, i: {"url": f"/orders/{ctx.rng.choice(ctx.own_orders)}"}, role="customer"),
+    Workload("orders.admin.all", "GET", "/orders/admin/all", _get("/orders/admin/all", limit=20, cursor=""),
+             role="admin"),
+    Workload("orders.admin.status", "GET", "/orders/admin/all",
+             _get("/orders/admin/all", limit=20, cursor="", status="paid"), role="admin"),
+    Workload("orders.admin.export", "GET", "/orders/admin/export", _export_window, role="admin"),
+    Workload("orders.analytics.daily", "GET", "/orders/admin/analytics/daily",
+             _get("/orders/admin/analytics/daily", date_from="2024-01-01", date_to="2024-03-31"), role="admin"),
+    Workload("orders.analytics.categories", "GET", "/orders/admin/analytics/categories",
+             _get("/orders/admin/analytics/categories", date_from="2024-01-01", date_to="2024-03-31"), role="admin"),
+    Workload("orders.create", "POST", "/orders/",
+             lambda ctx, i: {"url": "/orders/", "json": {"items": [
+                 {"product_id": ctx.rng.choice(ctx.in_stock), "quantity": 1}]}},
+             role="customer"),
+    Workload("orders.create.replay", "POST", "/orders/",
+             lambda ctx, i: {"url": "/orders/", "headers": {"Idempotency-Key": f"bench-{ctx.run_id}"},
+                             "json": {"items": [{"product_id": ctx.in_stock[0], "quantity": 1}]}},
+             role="customer"),
+    Workload("orders.status", "PUT", "/orders/{order_id}/status",
+             lambda ctx, i: {"url": f"/orders/{ctx.rng.randint(1, ctx.orders)}/status", "json": {"status": "shipped"}},
+             role="admin"),
+    Workload("categories.create", "POST", "/categories/",
+             lambda ctx, i: {"url": "/categories/", "json": {"name": f"Bench {ctx.run_id} {i}"}}, role="admin"),
+    Workload("categories.update", "PUT", "/categories/{category_id}",
+             lambda ctx, i: {"url": f"/categories/{_category(ctx)}",
+                             "json": {"description": f"Atualizada {i}"}}, role="admin"),
+    Workload("categories.delete", "DELETE", "/categories/{category_id}",
+             lambda ctx, i: {"url": f"/categories/{ctx.disposable_categories[i]}"}, role="admin"),
+    Workload("products.create", "POST", "/products/",
+             lambda ctx, i: {"url": "/products/", "json": {
+                 "name": f"Bench {i}", "price": 10.0, "stock": 10, "category_id": _category(ctx)}},
+             role="admin"),
+    Workload("products.update", "PUT", "/products/{product_id}",
+             lambda ctx, i: {"url": f"/products/{_product(ctx)}", "json": {"price": round(ctx.rng.uniform(5, 5000), 2)}},
+             role="admin"),
+    Workload("products.stock", "PATCH", "/products/stock",
+             lambda ctx, i: {"url": "/products/stock", "json": {"adjustments": [
+                 {"product_id": _product(ctx), "delta": 1} for _ in range(10)]}},
+             role="admin"),
+    Workload("products.import", "POST", "/products/import",
+             lambda ctx, i: {"url": "/products/import", "headers": {"Content-Type": "application/x-ndjson"},
+                             "content": "\n".join(json.dumps({"id": _product(ctx), "price": 10.0}) for _ in range(100))},
+             role="admin"),
+    Workload("products.delete", "DELETE", "/products/{product_id}",
+             lambda ctx, i: {"url": f"/products/{ctx.disposable_products[i]}"}, role="admin"),
+]
+
+def uncovered_routes(app) -> set:
+    return router_routes(app) - {(w.method, w.route) for w in WORKLOADS}
+
+def prepare(url: str, requests: int) -> Context:
+    """Lê os tamanhos do banco e cria produtos/categorias descartáveis para os DELETEs"""
+    from app.models import Category, Order, Product, User
+
+    engine = create_engine(url)
+    try:
+        with engine.begin() as conn:
+            customer_id = conn.execute(select(User.id).where(User.email == CUSTOMER_EMAIL)).scalar_one()
+            max_category = conn.execute(select(func.max(Category.id))).scalar()
+            max_product = conn.execute(select(func.max(Product.id))).scalar()
+            ctx = Context(
+                rng=random.Random(0),
+                run_id=str(int(time.time() * 1000)),
+                category_ids=list(conn.execute(select(Category.id).order_by(Category.id)).scalars()),
+                product_ids=list(conn.execute(select(Product.id).order_by(Product.id)).scalars()),
+                orders=conn.execute(select(func.max(Order.id))).scalar(),
+                in_stock=list(conn.execute(select(Product.id).where(Product.stock >= 100).limit(1000)).scalars()),
+                own_orders=list(conn.execute(select(Order.id).where(Order.user_id == customer_id).limit(1000)).scalars()),
+            )
+            if not ctx.own_orders:
+                # Com a distribuição Zipf o cliente pode não ter pedidos na massa
+                ctx.own_orders = [conn.execute(
+                    insert(Order).values(user_id=customer_id, total=0.0).returning(Order.id)
+                ).scalar_one()]
+            # Categoria descartável vazia e produtos descartáveis fora de qualquer pedido
+            ctx.disposable_categories = list(range(max_category + 1, max_category + requests + 1))
+            conn.execute(insert(Category), [
+                {"id": i, "name": f"Descartável {ctx.run_id} {i}"} for i in ctx.disposable_categories
+            ])
+            ctx.disposable_products = list(range(max_product + 1, max_product + requests + 1))
+            conn.execute(insert(Product), [
+                {"id": i, "name": f"Descartável {i}", "price": 1.0, "stock": 0, "category_id": 1}
+                for i in ctx.disposable_products
+            ])
+    finally:
+        engine.dispose()
+    return ctx
+
+def _summary(latencies: List[float], statements: List[int], errors: int, elapsed: float) -> dict:
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "sql_per_request": round(sum(statements) / len(statements), 2) if statements else None,
+    }
+
+async def run_workload(client, workload: Workload, ctx: Context, requests: int, concurrency: int, tokens: dict) -> dict:
+    total = min(requests, workload.max_requests or requests)
+    headers = {"Authorization": f"Bearer {tokens[workload.role]}"} if workload.role else {}
+    latencies, statements = [], []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while (i := next(counter)) < total:
+            kwargs = workload.build(ctx, i)
+            kwargs["headers"] = {**headers, **kwargs.get("headers", {})}
+            began = time.perf_counter()
+            response = await client.request(workload.method, **kwargs)
+            latencies.append((time.perf_counter() - began) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+            match = SQL_COUNT.search(response.headers.get("server-timing", ""))
+            if match:
+                statements.append(int(match.group(1)))
+
+    began = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+    return _summary(latencies, statements, errors, time.perf_counter() - began)
+
+async def run_all(client, ctx: Context, requests: int, concurrency: int, only: Optional[str] = None) -> Dict[str, dict]:
+    tokens = {}
+    for role, email in (("customer", CUSTOMER_EMAIL), ("admin", "admin@bench.com")):
+        response = await client.post("/auth/login", json={"email": email, "password": "bench123"})
+        tokens[role] = response.json()["access_token"]
+    results = {}
+    for workload in WORKLOADS:
+        if only and not re.search(only, workload.name):
+            continue
+        results[workload.name] = await run_workload(client, workload, ctx, requests, concurrency, tokens)
+        print(f"  {workload.name:<26} " + "  ".join(
+            f"{key}={value}" for key, value in results[workload.name].items() if key != "requests"
+        ))
+    return results
+
+def run_inprocess(url: str, ctx: Context, requests: int, concurrency: int, only: Optional[str] = None) -> Dict[str, dict]:
+    from sqlalchemy.orm import sessionmaker
+    from app.database import get_db
+    from app.main import app
+    from app.utils.instrumentation import instrument_engine
+
+    engine = create_engine(url, pool_size=concurrency, max_overflow=concurrency)
+    instrument_engine(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            return await run_all(client, ctx, requests, concurrency, only)
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        return asyncio.run(run())
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+
+def run_uvicorn(url: str, ctx: Context, requests: int, concurrency: int, port: int, only: Optional[str] = None):
+    async def run(base_url):
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+            return await run_all(client, ctx, requests, concurrency, only)
+
+    with run_server(port, {"DATABASE_URL": url}) as base_url:
+        return asyncio.run(run(base_url))
+
+def compare(base: dict, new: dict, threshold: float, min_delta_ms: float = 1.0) -> List[str]:
+    """
+    Regressões de new em relação a base: p95 e RPS em %, SQL por request e
+    erros em valor absoluto (SQL_TOLERANCE absorve a variação de hits do cache)
+    """
+    regressions = []
+    for mode, workloads in new["runs"].items():
+        for name, after in workloads.items():
+            before = base["runs"].get(mode, {}).get(name)
+            if before is None:
+                continue
+            label = f"{mode}/{name}"
+            if (after["p95_ms"] - before["p95_ms"] > min_delta_ms
+                    and after["p95_ms"] > before["p95_ms"] * (1 + threshold / 100)):
+                regressions.append(f"{label}: p95 {before['p95_ms']} → {after['p95_ms']} ms")
+            if after["rps"] < before["rps"] * (1 - threshold / 100):
+                regressions.append(f"{label}: rps {before['rps']} → {after['rps']}")
+            if (before["sql_per_request"] is not None and after["sql_per_request"] is not None
+                    and after["sql_per_request"] > before["sql_per_request"] + SQL_TOLERANCE):
+                regressions.append(f"{label}: SQL/request {before['sql_per_request']} → {after['sql_per_request']}")
+            if after["errors"] > before["errors"]:
+                regressions.append(f"{label}: erros {before['errors']} → {after['errors']}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run")
+    run.add_argument("--url", default="sqlite:///./bench_suite.db")
+    run.add_argument("--reuse", action="store_true", help="Não repopula o banco")
+    run.add_argument("--users", type=int, default=1000)
+    run.add_argument("--categories", type=int, default=50)
+    run.add_argument("--products", type=int, default=10_000)
+    run.add_argument("--orders", type=int, default=50_000)
+    run.add_argument("--mode", choices=("inprocess", "uvicorn", "both"), default="inprocess")
+    run.add_argument("--requests", type=int, default=200, help="Requests por workload")
+    run.add_argument("--concurrency", type=int, default=16)
+    run.add_argument("--only", help="Regex sobre os nomes dos workloads")
+    run.add_argument("--port", type=int, default=8767)
+    run.add_argument("--output", default="benchmark.json")
+
+    diff = commands.add_parser("compare")
+    diff.add_argument("base")
+    diff.add_argument("new")
+    diff.add_argument("--threshold", type=float, default=10, help="Variação tolerada de p95/RPS, em %%")
+    diff.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignora variações de p95 menores que isso")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        regressions = compare(base, new, args.threshold, args.min_delta_ms)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ Sem regressões acima de {args.threshold}%")
+        return
+
+    from app.main import app
+    uncovered = uncovered_routes(app)
+    for method, path in sorted(uncovered):
+        print(f"⚠️  Rota sem workload: {method} {path}")
+
+    if not args.reuse:
+        from benchmarks.datagen import Scale, generate
+        generate(create_engine(args.url), Scale(args.users, args.categories, args.products, args.orders))
+
+    modes = ("inprocess", "uvicorn") if args.mode == "both" else (args.mode,)
+    runs = {}
+    for mode in modes:
+        print(f"{mode}: {args.requests} requests por workload, {args.concurrency} clientes")
+        ctx = prepare(args.url, args.requests)
+        if mode == "inprocess":
+            runs[mode] = run_inprocess(args.url, ctx, args.requests, args.concurrency, args.only)
+        else:
+            runs[mode] = run_uvicorn(args.url, ctx, args.requests, args.concurrency, args.port, args.only)
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "meta": {
+                "started_at": datetime.utcnow().isoformat(),
+                "url": args.url,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "dataset": {"users": args.users, "categories": args.categories,
+                            "products": args.products, "orders": args.orders, "reused": args.reuse},
+            },
+            "runs": runs,
+        }, f, indent=2)
+    print(f"Resultados em {args.output}")
+
+if __name__ == "__main__":
+    main()
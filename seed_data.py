@@ -1,8 +1,13 @@
+import argparse
+
+from sqlalchemy import create_engine
+
 from app.database import SessionLocal, engine, Base
 from app.models.user import User
 from app.models.category import Category
 from app.models.product import Product
 from app.utils.security import get_password_hash
+from benchmarks.datagen import ADMIN_EMAIL as SCALE_ADMIN_EMAIL, PASSWORD as SCALE_PASSWORD, Scale, generate
 
 def seed_database():
     # CRIA AS TABELAS PRIMEIRO
@@ -83,5 +88,34 @@ def seed_database():
     finally:
         db.close()
 
+def seed_scale(bind, users=1000, categories=50, products=100_000, orders=1_000_000, batch_size=10_000, seed=42):
+    """
+    Recria o banco com uma massa de dados em escala (benchmarks).
+
+    Atalho para benchmarks.datagen: usuário 1 é o admin (SCALE_ADMIN_EMAIL);
+    os demais são user<N>@bench.com, todos com a mesma senha. Apaga todas
+    as tabelas de bind (drop_all): nunca aponte para o banco da aplicação.
+    """
+    return generate(bind, Scale(users, categories, products, orders), seed=seed, batch_size=batch_size)
+
 if __name__ == "__main__":
-    seed_database()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Popula o banco (demo, ou massa em escala com --products/--orders)")
+    parser.add_argument("--url", default="sqlite:///./bench.db",
+                        help="Banco da massa em escala, recriado do zero (padrão: bench.db, nunca DATABASE_URL)")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--products", type=int)
+    parser.add_argument("--orders", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.products is None and args.orders is None:
+        seed_database()
+    else:
+        seed_scale(
+            create_engine(args.url), args.users, args.categories, args.products or 0, args.orders or 0,
+            seed=args.seed
+        )
+        print(f"✅ {args.users} usuários, {args.categories} categorias, {args.products or 0} produtos, "
+              f"{args.orders or 0} pedidos")
+        print(f"👤 Admin: {SCALE_ADMIN_EMAIL} / {SCALE_PASSWORD} (usuários: user<N>@bench.com)")
\ No newline at end of file
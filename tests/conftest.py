@@ -1,10 +1,13 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.database import Base, get_db
 from app.models.user import User
+from app.utils.cache import catalog_cache
+from app.utils.dependencies import principal_cache
+from app.utils.instrumentation import instrument_engine
 from app.utils.security import get_password_hash
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -12,6 +15,7 @@ SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
+instrument_engine(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 @pytest.fixture(scope="function")
@@ -34,12 +38,40 @@ def client(db):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    catalog_cache.clear()
+    principal_cache.clear()
     
     with TestClient(app) as test_client:
         yield test_client
     
     app.dependency_overrides.clear()
 
+@pytest.fixture(scope="function")
+def async_client(db):
+    """Cliente de teste com os routers async (ASYNC_MODE) sobre aiosqlite"""
+    from fastapi import FastAPI
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+    from app.database import get_async_db
+    from app.routers import aio
+    
+    async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+    AsyncTestingSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False)
+    
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as session:
+            yield session
+    
+    async_app = FastAPI()
+    for module in (aio.auth, aio.categories, aio.products, aio.orders):
+        async_app.include_router(module.router)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    catalog_cache.clear()
+    principal_cache.clear()
+    
+    with TestClient(async_app) as test_client:
+        yield test_client
+
 @pytest.fixture
 def test_user(db):
     user = User(
@@ -81,3 +113,17 @@ def admin_token(client, test_admin):
         json={"email": "admin@test.com", "password": "admin123"}
     )
     return response.json()["access_token"]
+
+@pytest.fixture
+def query_counter():
+    """Conta os statements SQL executados no engine de teste"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
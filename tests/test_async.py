@@ -0,0 +1,96 @@
+from app.models.category import Category
+from app.models.product import Product
+
+def _login(client, email, password):
+    response = client.post("/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def test_async_register_and_me(async_client):
+    response = async_client.post(
+        "/auth/register",
+        json={"email": "async@test.com", "full_name": "Async User", "password": "password123"}
+    )
+    assert response.status_code == 201
+    
+    headers = _login(async_client, "async@test.com", "password123")
+    response = async_client.get("/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "async@test.com"
+
+def test_async_product_crud(async_client, test_admin, db):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    headers = _login(async_client, "admin@test.com", "admin123")
+    
+    response = async_client.post(
+        "/products",
+        json={"name": "Async Product", "price": 10.0, "stock": 5, "category_id": category.id},
+        headers=headers
+    )
+    assert response.status_code == 201
+    product_id = response.json()["id"]
+    
+    response = async_client.get(f"/products/{product_id}")
+    assert response.status_code == 200
+    assert response.json()["category"]["name"] == "Test Category"
+    conditional = {"If-None-Match": response.headers["etag"]}
+    assert async_client.get(f"/products/{product_id}", headers=conditional).status_code == 304
+    
+    response = async_client.get("/products", params={"cursor": ""})
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()["items"]] == [product_id]
+    
+    response = async_client.post(
+        "/products/import",
+        content=f'{{"id": {product_id}, "stock": 7}}\n{{"name": "Bulk", "price": 1.0, "stock": 1, "category_id": {category.id}}}',
+        headers=headers
+    )
+    assert response.json() == {"inserted": 1, "updated": 1, "errors": []}
+    assert async_client.get(f"/products/{product_id}").json()["stock"] == 7
+    
+    assert async_client.delete(f"/products/{product_id}", headers=headers).status_code == 204
+    assert async_client.get(f"/products/{product_id}").status_code == 404
+
+def test_async_create_and_list_orders(async_client, test_user, test_admin, db):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    product = Product(name="Test Product", price=100.00, stock=3, category_id=category.id)
+    db.add(product)
+    db.commit()
+    headers = _login(async_client, "test@test.com", "test123")
+    
+    response = async_client.post(
+        "/orders",
+        json={"items": [{"product_id": product.id, "quantity": 2}]},
+        headers={**headers, "Idempotency-Key": "retry-me"}
+    )
+    assert response.status_code == 201
+    assert response.json()["items"][0]["product_name"] == "Test Product"
+    
+    replay = async_client.post(
+        "/orders",
+        json={"items": [{"product_id": product.id, "quantity": 2}]},
+        headers={**headers, "Idempotency-Key": "retry-me"}
+    )
+    assert replay.status_code == 201
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert replay.json() == response.json()
+    
+    response = async_client.post(
+        "/orders",
+        json={"items": [{"product_id": product.id, "quantity": 2}]},
+        headers=headers
+    )
+    assert response.status_code == 400
+    
+    response = async_client.get("/orders", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    
+    admin_headers = _login(async_client, "admin@test.com", "admin123")
+    response = async_client.get("/orders/admin/export", params={"format": "csv"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.text.splitlines()[1].split(",")[-3:] == ["Test Product", "2", "100.0"]
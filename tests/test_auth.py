@@ -1,3 +1,7 @@
+import threading
+from app.config import settings
+from app.utils.security import get_password_hash, verify_password
+
 def test_register_user(client):
     response = client.post(
         "/auth/register",
@@ -64,3 +68,66 @@ def test_get_current_user_invalid_token(client):
         headers={"Authorization": "Bearer invalid_token"}
     )
     assert response.status_code == 401
+
+def test_current_user_lookup_is_cached(client, user_token, query_counter):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    
+    query_counter.clear()
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "test@test.com"
+    assert query_counter == []
+
+def test_deactivated_user_is_rejected_despite_cache(client, user_token, test_user, db):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    
+    test_user.is_active = False
+    db.commit()
+    
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 400
+    assert "inativo" in response.json()["detail"]
+
+def test_principal_cache_is_invalidated_on_commit_only(client, user_token, test_user, db):
+    from app.utils.dependencies import principal_cache
+    headers = {"Authorization": f"Bearer {user_token}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    
+    # Flush sem commit não mexe no cache; rollback descarta a invalidação
+    test_user.is_active = False
+    db.flush()
+    assert principal_cache.get(test_user.email) is not None
+    db.rollback()
+    assert principal_cache.get("test@test.com").is_active
+    
+    test_user.is_admin = True
+    db.flush()
+    assert principal_cache.get(test_user.email) is not None
+    db.commit()
+    assert principal_cache.get(test_user.email) is None
+
+def test_promoted_user_gets_admin_access(client, user_token, test_user, db):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    assert client.get("/orders/admin/all", headers=headers).status_code == 403
+    
+    test_user.is_admin = True
+    db.commit()
+    
+    assert client.get("/orders/admin/all", headers=headers).status_code == 200
+
+def test_login_returns_503_when_password_pool_is_full(client, test_user, monkeypatch):
+    monkeypatch.setattr("app.utils.security._pending", threading.Semaphore(0))
+    response = client.post(
+        "/auth/login",
+        json={"email": "test@test.com", "password": "test123"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_password_hash_uses_configured_cost(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    hashed = get_password_hash("secret")
+    assert hashed.startswith("$2b$04$")
+    assert verify_password("secret", hashed)
@@ -0,0 +1,30 @@
+from sqlalchemy import create_engine
+
+from app.main import app
+from benchmarks.suite import compare, prepare, run_inprocess, uncovered_routes
+from seed_data import seed_scale
+
+def test_suite_covers_every_route_without_errors(tmp_path):
+    assert not uncovered_routes(app)
+
+    url = f"sqlite:///{tmp_path}/suite.db"
+    engine = create_engine(url)
+    seed_scale(engine, users=5, categories=3, products=50, orders=40)
+    engine.dispose()
+
+    results = run_inprocess(url, prepare(url, requests=2), requests=2, concurrency=2)
+    assert {name for name, result in results.items() if result["errors"]} == set()
+    assert results["products.get"]["sql_per_request"] >= 0
+    assert results["orders.get"]["p99_ms"] >= results["orders.get"]["p50_ms"]
+
+def test_compare_flags_regressions():
+    def run(p95, rps, sql, errors=0):
+        return {"runs": {"inprocess": {"products.get": {
+            "p95_ms": p95, "rps": rps, "sql_per_request": sql, "errors": errors
+        }}}}
+
+    base = run(10.0, 500, 1.0)
+    assert compare(base, run(10.5, 480, 1.0), threshold=10) == []
+    assert compare(base, run(10.5, 480, 1.02), threshold=10) == []
+    regressions = compare(base, run(20.0, 300, 2.0, errors=1), threshold=10)
+    assert [r.split(":")[1].split()[0] for r in regressions] == ["p95", "rps", "SQL/request", "erros"]
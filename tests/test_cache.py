@@ -0,0 +1,32 @@
+from app.utils.cache import Cache, MemoryCache
+
+def test_memory_cache_evicts_least_recently_used():
+    backend = MemoryCache(max_entries=2)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    backend.get("a")
+    backend.set("c", 3, ttl=60)
+    
+    assert backend.get("a") == 1
+    assert backend.get("b") is None
+    assert backend.get("c") == 3
+
+def test_memory_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: now[0])
+    backend = MemoryCache()
+    backend.set("a", 1, ttl=10)
+    
+    now[0] += 9
+    assert backend.get("a") == 1
+    now[0] += 2
+    assert backend.get("a") is None
+
+def test_cache_key_is_normalized_and_invalidated():
+    cache = Cache(MemoryCache(), ttl=60)
+    key = cache.key("products", "list", max_price=10.0, category_id=1)
+    assert key == cache.key("products", "list", category_id=1, max_price=10.0)
+    
+    cache.set(key, [1])
+    cache.invalidate("products")
+    assert cache.get(cache.key("products", "list", category_id=1, max_price=10.0)) is None
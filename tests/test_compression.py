@@ -0,0 +1,87 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.models.category import Category
+from app.models.product import Product
+from app.utils.compression import CompressionMiddleware, negotiate
+
+def _client(minimum_size=100):
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=["zstd", "br", "gzip"],
+        levels={"gzip": 6, "br": 4, "zstd": 3},
+        minimum_size=minimum_size,
+        content_types=["application/json", "text/*"],
+    )
+
+    @app.get("/text")
+    def text(size: int):
+        return PlainTextResponse("a" * size)
+
+    @app.get("/image")
+    def image():
+        return Response(b"\x89PNG" + b"0" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f"linha {i}\n" * 50 for i in range(20)), media_type="text/csv")
+
+    return TestClient(app)
+
+def test_negotiate_respects_quality_and_server_order():
+    assert negotiate("gzip, br", ["zstd", "br", "gzip"]) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert negotiate("br;q=0, *;q=0.1", ["br", "gzip"]) == "gzip"
+    assert negotiate("identity", ["gzip"]) is None
+    assert negotiate("", ["gzip"]) is None
+
+def test_compression_threshold_and_allowlist():
+    client = _client()
+    headers = {"Accept-Encoding": "gzip"}
+
+    response = client.get("/text", params={"size": 1000}, headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < 1000
+    assert response.text == "a" * 1000
+
+    response = client.get("/text", params={"size": 50}, headers=headers)
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/image", headers=headers)
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/text", params={"size": 1000}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+def test_streaming_response_is_compressed_incrementally():
+    client = _client()
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw).decode() == "".join(f"linha {i}\n" * 50 for i in range(20))
+
+def test_app_compresses_catalog_but_not_304(client, db):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    db.add_all([
+        Product(name=f"Product {i}", description="Descrição longa " * 10, price=10.0, stock=1, category_id=category.id)
+        for i in range(20)
+    ])
+    db.commit()
+
+    response = client.get("/products/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 20
+
+    response = client.get(
+        "/products/", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]}
+    )
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
@@ -0,0 +1,36 @@
+from collections import Counter
+
+from sqlalchemy import create_engine, text
+
+from benchmarks.datagen import Scale, generate
+
+def _dump(engine, query):
+    with engine.connect() as conn:
+        return conn.execute(text(query)).all()
+
+def test_generator_is_deterministic_and_skewed(tmp_path):
+    scale = Scale(users=20, categories=5, products=200, orders=2000)
+    engines = [create_engine(f"sqlite:///{tmp_path}/{name}.db") for name in ("a", "b")]
+    try:
+        counts = [generate(engine, scale, seed=7, batch_size=500) for engine in engines]
+        assert counts[0] == counts[1]
+        assert counts[0]["orders"] == 2000 and counts[0]["users"] == 20
+
+        query = "SELECT order_id, product_id, quantity, price FROM order_items ORDER BY id"
+        items = _dump(engines[0], query)
+        assert items == _dump(engines[1], query)
+
+        # Zipf: os 10 produtos mais vendidos (5%) concentram boa parte dos itens
+        popularity = Counter(product_id for _, product_id, _, _ in items)
+        assert sum(count for _, count in popularity.most_common(10)) > len(items) * 0.4
+
+        # Totais consistentes com os itens e senha única para todos
+        mismatched = _dump(engines[0], """
+            SELECT o.id FROM orders o JOIN order_items i ON i.order_id = o.id
+            GROUP BY o.id, o.total HAVING ABS(o.total - SUM(i.price * i.quantity)) > 0.01
+        """)
+        assert mismatched == []
+        assert len(_dump(engines[0], "SELECT DISTINCT hashed_password FROM users")) == 1
+    finally:
+        for engine in engines:
+            engine.dispose()
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import threading
+
+from app.models.category import Category
+from app.models.outbox import OutboxEvent
+from app.models.product import Product
+from app.utils.events import EventBus, OutboxWorker, enqueue
+
+def test_order_commit_writes_event_and_worker_delivers_it(client, user_token, admin_token, db):
+    category = Category(name="Test Category")
+    db.add(category)
+    db.commit()
+    product = Product(name="Test Product", price=10.0, stock=4, category_id=category.id)
+    db.add(product)
+    db.commit()
+
+    bus = EventBus()
+    received = []
+    for _ in range(10):
+        bus.subscribe("order.created", received.append)
+    bus.subscribe("order.status_changed", received.append)
+
+    order = client.post("/orders", json={"items": [{"product_id": product.id, "quantity": 3}]},
+                        headers={"Authorization": f"Bearer {user_token}"}).json()
+    client.put(f"/orders/{order['id']}/status", json={"status": "paid"},
+               headers={"Authorization": f"Bearer {admin_token}"})
+
+    # Nada roda no request: os eventos ficam na outbox até o worker drenar
+    assert received == []
+    rows = db.query(OutboxEvent).order_by(OutboxEvent.id).all()
+    assert [row.topic for row in rows] == ["order.created", "order.status_changed"]
+    assert json.loads(rows[0].payload)["items"] == [{"product_id": product.id, "quantity": 3, "stock_after": 1}]
+
+    worker = OutboxWorker(db.get_bind(), bus, batch_size=1)
+    assert worker.drain() == 2
+    assert len(received) == 11
+    assert received[-1].payload == {"order_id": order["id"], "user_id": order["user_id"],
+                                    "previous": "pending", "status": "paid"}
+    db.expire_all()
+    assert db.query(OutboxEvent).count() == 0
+
+def test_failing_subscriber_is_retried_then_discarded(db):
+    bus = EventBus()
+    calls = []
+
+    @bus.subscribe("order.created")
+    def flaky(event):
+        calls.append(event.attempts)
+        raise RuntimeError("fora do ar")
+
+    enqueue(db, "order.created", {"order_id": 1})
+    db.commit()
+    worker = OutboxWorker(db.get_bind(), bus, max_attempts=2, retry_backoff=0)
+    worker.drain_once()
+    worker.drain_once()
+    worker.drain_once()
+
+    assert calls == [0, 1]
+    row = db.query(OutboxEvent).one()
+    db.refresh(row)
+    assert row.attempts == 2 and row.failed_at is not None
+    assert row.last_error == "RuntimeError: fora do ar"
+    assert worker.stats()["failed"] == 1
+
+def test_worker_wakes_up_after_commit(db):
+    bus = EventBus()
+    delivered = threading.Event()
+    bus.subscribe("order.created", lambda event: delivered.set())
+    worker = OutboxWorker(db.get_bind(), bus, poll_interval=30)
+
+    async def scenario():
+        worker.start()
+        await asyncio.sleep(0.1)
+        enqueue(db, "order.created", {"order_id": 1})
+        db.commit()
+        # Bem antes do poll_interval: o commit acorda o worker
+        woke = await asyncio.to_thread(delivered.wait, 5)
+        await worker.stop()
+        return woke
+
+    assert asyncio.run(scenario()) is True
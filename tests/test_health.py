@@ -0,0 +1,72 @@
+import json
+import logging
+import time
+
+from sqlalchemy import create_engine
+
+from app.utils.cache import Cache, MemoryCache
+from app.utils.health import ReadinessProbe
+from app.utils.pool import InstrumentedQueuePool
+
+def _probe(engine, ttl=0.0):
+    return ReadinessProbe(
+        engine, lambda: [("sync", engine)], Cache(MemoryCache(), ttl=60),
+        timeout=0.2, ttl=ttl, max_saturation=1.0
+    )
+
+def test_liveness_and_readiness_endpoints(client):
+    assert client.get("/health").json() == {"status": "ok"}
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    checks = response.json()["checks"]
+    assert checks["database"]["ok"] is True
+    assert checks["pool"]["sync"]["saturation"] is not None
+    assert {"backend", "entries", "hit_ratio"} <= checks["cache"].keys()
+
+def test_readiness_fails_fast_when_pool_is_exhausted():
+    engine = create_engine(
+        "sqlite:///./test.db", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=5
+    )
+    try:
+        probe = _probe(engine)
+        assert probe.check()[0] is True
+
+        held = engine.connect()
+        started = time.perf_counter()
+        ready, report = probe.check()
+        # Falha no prazo do probe, não no pool_timeout (5s)
+        assert time.perf_counter() - started < 1
+        assert ready is False
+        assert report["status"] == "unavailable"
+        assert report["checks"]["pool"]["saturated"] == ["sync"]
+        assert report["checks"]["database"] == {"ok": False, "status": "timeout"}
+
+        # A checagem presa não é repetida enquanto não terminar
+        assert probe.check()[1]["checks"]["database"] == {"ok": False, "status": "busy"}
+        held.close()
+    finally:
+        engine.dispose()
+
+def test_readiness_result_is_cached():
+    engine = create_engine("sqlite:///./test.db", poolclass=InstrumentedQueuePool)
+    try:
+        probe = _probe(engine, ttl=60)
+        first = probe.check()
+        assert probe.check() is first
+    finally:
+        engine.dispose()
+
+def test_readiness_failure_does_not_leak_connection_details(tmp_path, caplog):
+    missing = tmp_path / "no-such-dir" / "app.db"
+    engine = create_engine(f"sqlite:///{missing}", poolclass=InstrumentedQueuePool)
+    try:
+        with caplog.at_level(logging.ERROR, logger="app.utils.health"):
+            ready, report = _probe(engine).check()
+        assert ready is False
+        assert report["checks"]["database"] == {"ok": False, "status": "unavailable"}
+        assert str(tmp_path) not in json.dumps(report)
+        # O detalhe fica só no log
+        assert "OperationalError" in caplog.text
+    finally:
+        engine.dispose()
@@ -0,0 +1,23 @@
+import subprocess
+import sys
+
+from sqlalchemy import create_engine, inspect
+
+from benchmarks.index_advisor import run_advisor
+
+def test_router_queries_use_indexes(tmp_path):
+    findings, uncovered = run_advisor(f"sqlite:///{tmp_path}/advisor.db", products=200, orders=100)
+    assert not uncovered
+    assert findings == []
+
+def test_alembic_upgrade_matches_models(tmp_path):
+    url = f"sqlite:///{tmp_path}/migrations.db"
+    env = {"DATABASE_URL": url, "SECRET_KEY": "x", "PATH": ""}
+    for command in (["upgrade", "head"], ["check"]):
+        result = subprocess.run(
+            [sys.executable, "-m", "alembic", *command], env=env, capture_output=True, text=True
+        )
+        assert result.returncode == 0, result.stderr
+    
+    indexes = {index["name"] for index in inspect(create_engine(url)).get_indexes("orders")}
+    assert "ix_orders_user_id_created_at_id" in indexes
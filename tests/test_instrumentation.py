@@ -0,0 +1,61 @@
+import re
+
+import fastapi.routing
+
+from app.models.category import Category
+from app.models.product import Product
+from app.utils.instrumentation import request_metrics
+
+def _server_timing(response) -> dict:
+    return {
+        match.group(1): match.group(0)
+        for match in re.finditer(r"([\w-]+);[^,]*", response.headers["server-timing"])
+    }
+
+def test_server_timing_reports_statements(client, db, query_counter):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    db.add_all([Product(name=f"Product {i}", price=10.0, stock=1, category_id=category.id) for i in range(3)])
+    db.commit()
+
+    query_counter.clear()
+    response = client.get("/products/")
+    assert response.status_code == 200
+    timing = _server_timing(response)
+    assert f'desc="{len(query_counter)} statements"' in timing["db"]
+    assert {"db", "db-slowest", "serialize", "total"} <= timing.keys()
+    # Validação do response_model e render medidos pelo TimedRoute
+    assert float(re.search(r"dur=([\d.]+)", timing["serialize"]).group(1)) > 0
+
+    # Cache hit: nenhum statement
+    response = client.get("/products/")
+    assert 'desc="0 statements"' in _server_timing(response)["db"]
+
+def test_serialization_timing_does_not_patch_fastapi(client):
+    assert fastapi.routing.serialize_response.__module__ == "fastapi.routing"
+    assert client.get("/openapi.json").status_code == 200
+
+def test_metrics_aggregate_per_route(client, db):
+    request_metrics.clear()
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    for product_id in (category.id, 999):
+        client.get(f"/products/{product_id}")
+    client.get("/no-such-path")
+
+    snapshot = client.get("/metrics/requests").json()
+    route = snapshot["GET /products/{product_id}"]
+    assert route["duration_ms"]["count"] == 2
+    assert route["statements"]["count"] == 2
+    assert route["slowest_statement"].startswith("SELECT")
+    assert "unmatched" in snapshot
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_request_duration_ms_count{route="GET /products/{product_id}"} 2' in body
+    assert 'http_request_sql_statements_bucket{route="GET /products/{product_id}",le="+Inf"} 2' in body
+    assert "db_pool_wait_ms_count" in body
+    assert "catalog_cache_misses_total" in body
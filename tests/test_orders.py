@@ -1,5 +1,15 @@
 from app.models.category import Category
 from app.models.product import Product
+from app.models.order import Order, OrderItem, OrderStatus
+from app.config import settings
+from app.utils.export import order_export_query, stream_order_export
+from sqlalchemy import insert
+import csv
+import io
+import json
+import os
+import pytest
+from datetime import datetime
 
 def test_create_order(client, user_token, db):
     category = Category(name="Test Category", description="Test")
@@ -55,3 +65,394 @@ def test_list_my_orders(client, user_token, db):
     )
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+def _checkout_statements(client, db, query_counter, user_token, lines):
+    category = Category(name=f"Category {lines}", description="Test")
+    db.add(category)
+    db.commit()
+    
+    products = [
+        Product(name=f"Product {lines}-{i}", price=10.00, stock=100, category_id=category.id)
+        for i in range(lines)
+    ]
+    db.add_all(products)
+    db.commit()
+    product_ids = [product.id for product in products]
+    
+    query_counter.clear()
+    response = client.post(
+        "/orders",
+        json={"items": [{"product_id": pid, "quantity": 1} for pid in product_ids]},
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+    assert response.status_code == 201
+    assert len(response.json()["items"]) == lines
+    return len(query_counter)
+
+def test_create_order_statement_count_is_constant(client, user_token, db, query_counter):
+    client.get("/auth/me", headers={"Authorization": f"Bearer {user_token}"})
+    single = _checkout_statements(client, db, query_counter, user_token, 1)
+    many = _checkout_statements(client, db, query_counter, user_token, 25)
+    assert many == single
+
+def test_create_order_duplicate_lines_check_total_stock(client, user_token, db):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    
+    product = Product(name="Test Product", price=100.00, stock=5, category_id=category.id)
+    db.add(product)
+    db.commit()
+    
+    response = client.post(
+        "/orders",
+        json={
+            "items": [
+                {"product_id": product.id, "quantity": 3},
+                {"product_id": product.id, "quantity": 3}
+            ]
+        },
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+    assert response.status_code == 400
+    assert "insuficiente" in response.json()["detail"]
+
+def _create_orders(db, user, count, items_per_order=3):
+    category = Category(name=f"Category orders {count}", description="Test")
+    db.add(category)
+    db.commit()
+    
+    products = [
+        Product(name=f"Product {count}-{i}", price=10.00, stock=100, category_id=category.id)
+        for i in range(items_per_order)
+    ]
+    db.add_all(products)
+    db.commit()
+    
+    for _ in range(count):
+        order = Order(user_id=user.id, total=10.00 * items_per_order)
+        order.items = [
+            OrderItem(product_id=product.id, quantity=1, price=10.00)
+            for product in products
+        ]
+        db.add(order)
+    db.commit()
+    db.expire_all()
+
+@pytest.mark.parametrize("strategy", ["selectin", "joined"])
+def test_list_orders_statement_count_is_bounded(client, user_token, test_user, db, query_counter, monkeypatch, strategy):
+    monkeypatch.setattr(settings, "ORDER_LOADING_STRATEGY", strategy)
+    headers = {"Authorization": f"Bearer {user_token}"}
+    client.get("/auth/me", headers=headers)
+    
+    _create_orders(db, test_user, 2)
+    query_counter.clear()
+    response = client.get("/orders", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    small_page = len(query_counter)
+    
+    _create_orders(db, test_user, 20)
+    query_counter.clear()
+    response = client.get("/orders", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 22
+    assert all(item["product_name"].startswith("Product") for order in data for item in order["items"])
+    
+    assert len(query_counter) == small_page
+    assert len(query_counter) <= 2
+
+def test_list_orders_cursor_pagination(client, user_token, test_user, db):
+    _create_orders(db, test_user, 5, items_per_order=1)
+    
+    # Pedidos com o mesmo created_at desempatam pelo id
+    created_at = datetime(2024, 1, 1)
+    for order in db.query(Order).all():
+        order.created_at = created_at
+    db.commit()
+    
+    ids = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(
+            "/orders",
+            params={"cursor": cursor, "limit": 2},
+            headers={"Authorization": f"Bearer {user_token}"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        ids.extend(order["id"] for order in data["items"])
+        cursor = data["next_cursor"]
+    
+    assert ids == sorted(ids, reverse=True)
+    assert len(ids) == 5
+
+def test_export_orders_ndjson_and_csv(client, admin_token, test_user, db):
+    _create_orders(db, test_user, 4, items_per_order=2)
+    orders = db.query(Order).order_by(Order.id).all()
+    for day, order in enumerate(orders, start=1):
+        order.created_at = datetime(2024, 1, day)
+    orders[0].status = OrderStatus.PAID
+    db.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    
+    response = client.get("/orders/admin/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [json.loads(line) for line in response.text.splitlines()]
+    assert [order["id"] for order in exported] == [order.id for order in orders]
+    assert [len(order["items"]) for order in exported] == [2, 2, 2, 2]
+    assert exported[0]["status"] == "paid"
+    
+    response = client.get(
+        "/orders/admin/export",
+        params={"format": "csv", "created_from": "2024-01-02T00:00:00", "created_to": "2024-01-04T00:00:00"},
+        headers=headers
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert {int(row["order_id"]) for row in rows} == {orders[1].id, orders[2].id}
+    assert len(rows) == 4
+    assert rows[0]["product_name"].startswith("Product")
+    
+    response = client.get("/orders/admin/export", params={"status": "paid"}, headers=headers)
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [orders[0].id]
+
+def test_export_orders_requires_admin(client, user_token):
+    response = client.get("/orders/admin/export", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403
+
+def _rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+
+def test_export_orders_memory_is_bounded(db, test_user):
+    if not os.path.exists("/proc/self/status"):
+        pytest.skip("RSS lido de /proc (Linux)")
+    
+    orders = 60_000
+    db.execute(insert(Category), [{"id": 1, "name": "Export"}])
+    db.execute(insert(Product), [{"id": 1, "name": "Product", "price": 10.0, "stock": 1, "category_id": 1}])
+    for offset in range(0, orders, 10_000):
+        db.execute(insert(Order), [
+            {"id": i, "user_id": test_user.id, "total": 20.0, "status": OrderStatus.PENDING,
+             "created_at": datetime(2024, 1, 1), "updated_at": datetime(2024, 1, 1)}
+            for i in range(offset + 1, offset + 10_001)
+        ])
+        db.execute(insert(OrderItem), [
+            {"order_id": i, "product_id": 1, "quantity": 1, "price": 10.0}
+            for i in range(offset + 1, offset + 10_001) for _ in range(2)
+        ])
+    db.commit()
+    
+    # Aquece o caminho (imports, cache de statements) antes de medir
+    for _ in stream_order_export(db.get_bind(), order_export_query(), "ndjson"):
+        break
+    
+    baseline = peak = _rss_mb()
+    exported = lines = 0
+    for chunk in stream_order_export(db.get_bind(), order_export_query(), "ndjson"):
+        exported += len(chunk)
+        lines += chunk.count(b"\n")
+        peak = max(peak, _rss_mb())
+    
+    assert lines == orders
+    # Exportação bem maior que o crescimento de memória: nada é acumulado
+    assert exported > 15 * 1024 * 1024
+    assert peak - baseline < 10
+
+def _deliver_events(db):
+    """O agregado de analytics é atualizado pelo worker da outbox"""
+    from app.utils.events import OutboxWorker, event_bus
+    OutboxWorker(db.get_bind(), event_bus).drain()
+
+def test_order_analytics_follow_checkout_and_status_changes(client, user_token, admin_token, db, query_counter):
+    from app.utils.order_summary import category_summary, daily_summary, rebuild_order_summary, sync_order_summary
+
+    books, games = Category(name="Livros"), Category(name="Jogos")
+    db.add_all([books, games])
+    db.commit()
+    book = Product(name="Livro", price=10.0, stock=50, category_id=books.id)
+    game = Product(name="Jogo", price=100.0, stock=50, category_id=games.id)
+    db.add_all([book, game])
+    db.commit()
+
+    auth = {"Authorization": f"Bearer {user_token}"}
+    admin = {"Authorization": f"Bearer {admin_token}"}
+    client.get("/auth/me", headers=auth)
+    query_counter.clear()
+    first = client.post("/orders", json={"items": [
+        {"product_id": book.id, "quantity": 2}, {"product_id": game.id, "quantity": 1}
+    ]}, headers=auth).json()
+    # O checkout não toca no agregado (a linha do dia seria disputada por todos os pedidos)
+    assert not [statement for statement in query_counter if "order_daily_summary" in statement]
+    client.post("/orders", json={"items": [{"product_id": book.id, "quantity": 1}]}, headers=auth)
+    client.put(f"/orders/{first['id']}/status", json={"status": "paid"}, headers=admin)
+    assert client.get("/orders/admin/analytics/daily", headers=admin).json() == []
+    _deliver_events(db)
+
+    daily = client.get("/orders/admin/analytics/daily", headers=admin).json()
+    assert [(row["status"], row["orders"], row["units"], row["revenue"]) for row in daily] == [
+        ("paid", 1, 3, 120.0), ("pending", 1, 1, 10.0)
+    ]
+    categories = client.get("/orders/admin/analytics/categories", params={"status": "paid"}, headers=admin).json()
+    assert [(row["category_id"], row["orders"], row["revenue"]) for row in categories] == [
+        (books.id, 1, 20.0), (games.id, 1, 100.0)
+    ]
+    assert client.get("/orders/admin/analytics/daily", headers=auth).status_code == 403
+
+    # Reentrega não conta o pedido de novo
+    incremental = daily_summary(db), category_summary(db)
+    sync_order_summary(db, first["id"])
+    assert (daily_summary(db), category_summary(db)) == incremental
+    # O agregado incremental bate com o recalculado a partir dos pedidos
+    rebuild_order_summary(db.connection())
+    assert (daily_summary(db), category_summary(db)) == incremental
+
+def test_create_order_idempotency_key_replays_without_touching_products(client, user_token, db, query_counter):
+    category = Category(name="Test Category")
+    db.add(category)
+    db.commit()
+    product = Product(name="Test Product", price=50.0, stock=10, category_id=category.id)
+    db.add(product)
+    db.commit()
+
+    headers = {"Authorization": f"Bearer {user_token}", "Idempotency-Key": "checkout-1"}
+    body = {"items": [{"product_id": product.id, "quantity": 3}]}
+    first = client.post("/orders", json=body, headers=headers)
+    assert first.status_code == 201
+    assert "idempotent-replayed" not in first.headers
+
+    query_counter.clear()
+    retry = client.post("/orders", json=body, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert not [statement for statement in query_counter if "products" in statement]
+
+    db.expire_all()
+    assert db.query(Order).count() == 1
+    assert db.get(Product, product.id).stock == 7
+
+    # Mesma chave com outro corpo
+    other = client.post("/orders", json={"items": [{"product_id": product.id, "quantity": 1}]}, headers=headers)
+    assert other.status_code == 422
+
+    # Pedido que falha não consome a chave
+    headers["Idempotency-Key"] = "checkout-2"
+    assert client.post("/orders", json={"items": [{"product_id": product.id, "quantity": 99}]},
+                       headers=headers).status_code == 400
+    assert client.post("/orders", json={"items": [{"product_id": product.id, "quantity": 99}]},
+                       headers=headers).status_code == 400
+    assert client.post("/orders", json={"items": [{"product_id": product.id, "quantity": 7}]},
+                       headers=headers).status_code == 201
+
+def test_concurrent_duplicate_waits_for_in_flight_key(tmp_path):
+    import threading
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from app.database import Base
+    from app.utils.idempotency import claim_key, save_response, stored_response
+
+    engine = create_engine(f"sqlite:///{tmp_path}/idempotency.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        first, second = Session(engine), Session(engine)
+        assert claim_key(first, "k", "fp") is True
+
+        outcome = {}
+        def duplicate():
+            outcome["claimed"] = claim_key(second, "k", "fp")
+            outcome["replay"] = stored_response(second, "k", "fp")
+        thread = threading.Thread(target=duplicate)
+        thread.start()
+        thread.join(0.3)
+        assert thread.is_alive()  # bloqueado pela transação em andamento
+
+        save_response(first, "k", {"id": 1})
+        first.commit()
+        thread.join(5)
+        assert outcome == {"claimed": False, "replay": {"id": 1}}
+        first.close()
+        second.close()
+    finally:
+        engine.dispose()
+
+def test_claim_key_falls_back_to_plain_insert_on_other_dialects(db, monkeypatch):
+    from app.utils import idempotency
+    monkeypatch.setattr(idempotency, "_UPSERTS", {})
+
+    assert idempotency.claim_key(db, "k", "fp") is True
+    # A violação da chave única desfaz só o savepoint: a transação segue válida
+    assert idempotency.claim_key(db, "k", "fp") is False
+    idempotency.save_response(db, "k", {"id": 1})
+    db.commit()
+    assert idempotency.stored_response(db, "k", "fp") == {"id": 1}
+
+def test_order_analytics_keep_checkout_category_after_product_moves(client, user_token, admin_token, db):
+    from app.utils.order_summary import category_summary, daily_summary, rebuild_order_summary
+
+    old, new = Category(name="Antiga"), Category(name="Nova")
+    db.add_all([old, new])
+    db.commit()
+    product = Product(name="Produto", price=30.0, stock=10, category_id=old.id)
+    db.add(product)
+    db.commit()
+
+    admin = {"Authorization": f"Bearer {admin_token}"}
+    order = client.post("/orders", json={"items": [{"product_id": product.id, "quantity": 1}]},
+                        headers={"Authorization": f"Bearer {user_token}"}).json()
+    assert client.put(f"/products/{product.id}", json={"category_id": new.id}, headers=admin).status_code == 200
+    client.put(f"/orders/{order['id']}/status", json={"status": "paid"}, headers=admin)
+    _deliver_events(db)
+
+    def by_status(status):
+        rows = client.get("/orders/admin/analytics/categories", params={"status": status}, headers=admin).json()
+        return [(row["category_id"], row["orders"]) for row in rows]
+
+    assert by_status("pending") == []
+    assert by_status("paid") == [(old.id, 1)]
+
+    incremental = daily_summary(db), category_summary(db)
+    rebuild_order_summary(db.connection())
+    assert (daily_summary(db), category_summary(db)) == incremental
+
+def test_concurrent_status_change_is_rejected_without_publishing_event(client, user_token, admin_token, db):
+    from sqlalchemy import event, text
+    from app.models.outbox import OutboxEvent
+    from app.utils.order_summary import daily_summary
+
+    category = Category(name="Test Category")
+    db.add(category)
+    db.commit()
+    product = Product(name="Test Product", price=10.0, stock=5, category_id=category.id)
+    db.add(product)
+    db.commit()
+    order = client.post("/orders", json={"items": [{"product_id": product.id, "quantity": 1}]},
+                        headers={"Authorization": f"Bearer {user_token}"}).json()
+
+    engine = db.get_bind()
+    raced = []
+
+    def concurrent_admin(conn, cursor, statement, parameters, context, executemany):
+        # Outro admin troca o status entre a leitura do pedido e a escrita deste request
+        if not raced and statement.startswith("UPDATE orders"):
+            raced.append(True)
+            with engine.connect() as other:
+                other.execute(text("UPDATE orders SET status = 'SHIPPED' WHERE id = :id"), {"id": order["id"]})
+                other.commit()
+
+    event.listen(engine, "before_cursor_execute", concurrent_admin)
+    try:
+        response = client.put(f"/orders/{order['id']}/status", json={"status": "paid"},
+                              headers={"Authorization": f"Bearer {admin_token}"})
+    finally:
+        event.remove(engine, "before_cursor_execute", concurrent_admin)
+
+    assert response.status_code == 409
+    assert [row.topic for row in db.query(OutboxEvent)] == ["order.created"]
+    # O pedido é contado uma única vez, no status atual
+    _deliver_events(db)
+    assert [(row["status"], row["orders"]) for row in daily_summary(db)] == [("shipped", 1)]
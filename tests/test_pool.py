@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import create_engine, exc
+from app.utils.pool import InstrumentedQueuePool, pool_metrics
+
+def test_pool_metrics_track_checkouts_and_timeouts():
+    engine = create_engine(
+        "sqlite:///./test.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05
+    )
+    try:
+        held = engine.connect()
+        metrics = pool_metrics(engine)
+        assert metrics["checked_out"] == 1
+        
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        
+        held.close()
+        metrics = pool_metrics(engine)
+        assert metrics["checked_out"] == 0
+        assert metrics["timeouts"] == 1
+        assert metrics["wait_ms"]["count"] == 2
+        assert metrics["wait_ms"]["buckets"]["+Inf"] == 2
+        assert metrics["wait_ms"]["sum"] >= 50
+    finally:
+        engine.dispose()
+
+def test_pool_metrics_endpoint(client):
+    response = client.get("/metrics/pool")
+    assert response.status_code == 200
+    sync_metrics = response.json()["sync"]
+    assert {"size", "checked_out", "overflow", "timeouts", "wait_ms"} <= sync_metrics.keys()
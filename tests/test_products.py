@@ -1,3 +1,7 @@
+import json
+from datetime import timezone
+from email.utils import format_datetime
+
 from app.models.category import Category
 from app.models.product import Product
 
@@ -90,3 +94,317 @@ def test_search_products_by_name(client, db):
     data = response.json()
     assert len(data) == 1
     assert "Notebook" in data[0]["name"]
+
+def test_list_products_cursor_pagination(client, db):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    
+    db.add_all([
+        Product(name=f"Product {i}", price=10.00, stock=10, category_id=category.id)
+        for i in range(7)
+    ])
+    db.commit()
+    
+    names = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get("/products", params={"cursor": cursor, "limit": 3})
+        assert response.status_code == 200
+        data = response.json()
+        names.extend(product["name"] for product in data["items"])
+        cursor = data["next_cursor"]
+    
+    assert names == [f"Product {i}" for i in range(7)]
+
+def test_list_products_invalid_cursor(client):
+    response = client.get("/products", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+def test_get_product_served_from_cache(client, db, query_counter):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    
+    product = Product(name="Cached", price=10.00, stock=10, category_id=category.id)
+    db.add(product)
+    db.commit()
+    
+    assert client.get(f"/products/{product.id}").status_code == 200
+    query_counter.clear()
+    response = client.get(f"/products/{product.id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Cached"
+    assert query_counter == []
+    
+    stats = client.get("/cache/stats").json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_product_update_invalidates_cache(client, admin_token, db):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    
+    product = Product(name="Old Name", price=10.00, stock=10, category_id=category.id)
+    db.add(product)
+    db.commit()
+    
+    assert client.get("/products?search=old").json()[0]["name"] == "Old Name"
+    assert client.get(f"/products/{product.id}").json()["name"] == "Old Name"
+    
+    response = client.put(
+        f"/products/{product.id}",
+        json={"name": "Old Name v2"},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    
+    assert client.get("/products?search=old").json()[0]["name"] == "Old Name v2"
+    assert client.get(f"/products/{product.id}").json()["name"] == "Old Name v2"
+    
+    response = client.put(
+        f"/categories/{category.id}",
+        json={"name": "Renamed Category"},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+    assert client.get(f"/products/{product.id}").json()["category"]["name"] == "Renamed Category"
+
+def test_get_product_conditional(client, admin_token, db, query_counter):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    
+    product = Product(name="Conditional", price=10.00, stock=10, category_id=category.id)
+    db.add(product)
+    db.commit()
+    
+    response = client.get(f"/products/{product.id}")
+    etag = response.headers["etag"]
+    last_modified = format_datetime(product.updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+    assert "last-modified" not in response.headers
+    assert etag.startswith('W/"')
+    assert response.headers["cache-control"] == "public, no-cache"
+    
+    # 304 direto do cache: sem query e sem corpo
+    query_counter.clear()
+    response = client.get(f"/products/{product.id}", headers={"If-None-Match": f'"x", {etag}'})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert query_counter == []
+    
+    # If-Modified-Since não é suportado: nunca produz 304
+    response = client.get(f"/products/{product.id}", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 200
+    
+    # Renomear a categoria muda a representação (e a ETag) sem tocar em updated_at
+    client.put(
+        f"/categories/{category.id}",
+        json={"name": "Renamed Category"},
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    response = client.get(f"/products/{product.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["category"]["name"] == "Renamed Category"
+    assert response.headers["etag"] != etag
+
+def test_list_conditional(client, admin_token, db):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    db.add(Product(name="Listed", price=10.00, stock=10, category_id=category.id))
+    db.commit()
+    
+    for path in ("/products/", "/categories/", f"/categories/{category.id}"):
+        response = client.get(path)
+        assert response.status_code == 200
+        assert "last-modified" not in response.headers
+        assert client.get(path, headers={"If-None-Match": response.headers["etag"]}).status_code == 304
+    
+    etag = client.get("/products/").headers["etag"]
+    product_id = client.get("/products/").json()[0]["id"]
+    client.delete(f"/products/{product_id}", headers={"Authorization": f"Bearer {admin_token}"})
+    response = client.get("/products/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == []
+
+def test_search_products_full_text(client, admin_token, db):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    
+    db.add_all([
+        Product(name="Mouse Logitech", description="Sem fio, bateria longa", price=150.00, stock=10, category_id=category.id),
+        Product(name="Teclado Mecânico", description="Switch azul", price=300.00, stock=10, category_id=category.id),
+        Product(name="Fone Bluetooth", description="Sem fio", price=200.00, stock=10, category_id=category.id),
+    ])
+    db.commit()
+    
+    # Busca na descrição, com prefixo e sem acento
+    names = [p["name"] for p in client.get("/products?search=sem fi").json()]
+    assert sorted(names) == ["Fone Bluetooth", "Mouse Logitech"]
+    assert [p["name"] for p in client.get("/products?search=mecanico").json()] == ["Teclado Mecânico"]
+    
+    # Relevância: "fio" aparece no nome e na descrição do segundo produto
+    db.add(Product(name="Fio de Cobre", description="Fio flexível", price=20.00, stock=10, category_id=category.id))
+    db.commit()
+    names = [p["name"] for p in client.get("/products?search=fio").json()]
+    assert names[0] == "Fio de Cobre"
+    assert len(names) == 3
+    
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    teclado = db.query(Product).filter(Product.name == "Teclado Mecânico").one()
+    client.put(f"/products/{teclado.id}", json={"name": "Keyboard"}, headers=headers)
+    assert client.get("/products?search=teclado").json() == []
+    assert len(client.get("/products?search=keyb").json()) == 1
+    
+    client.delete(f"/products/{teclado.id}", headers=headers)
+    assert client.get("/products?search=keyb").json() == []
+
+def test_product_facets(client, db, query_counter):
+    books = Category(name="Livros", description="Test")
+    games = Category(name="Jogos", description="Test")
+    db.add_all([books, games])
+    db.commit()
+    
+    db.add_all([
+        Product(name="Livro A", price=30.00, stock=5, category_id=books.id),
+        Product(name="Livro B", price=80.00, stock=0, category_id=books.id),
+        Product(name="Jogo A", price=300.00, stock=2, category_id=games.id),
+        Product(name="Jogo B", price=6000.00, stock=1, category_id=games.id),
+    ])
+    db.commit()
+    
+    query_counter.clear()
+    data = client.get("/products/facets").json()
+    assert len(query_counter) == 1
+    assert "product_facets" in query_counter[0]
+    assert data["total"] == 4
+    assert data["in_stock"] == 3
+    assert data["categories"] == [
+        {"category_id": books.id, "count": 2, "in_stock": 1},
+        {"category_id": games.id, "count": 2, "in_stock": 2},
+    ]
+    buckets = {(b["min"], b["max"]): b["count"] for b in data["price_buckets"] if b["count"]}
+    assert buckets == {(0, 50): 1, (50, 100): 1, (250, 500): 1, (5000, None): 1}
+    
+    # Mesmos filtros de GET /products/
+    data = client.get("/products/facets", params={"category_id": books.id}).json()
+    assert data["total"] == 2
+    data = client.get("/products/facets", params={"min_price": 50, "max_price": 500}).json()
+    assert data["total"] == 2
+    assert data["in_stock"] == 1
+    data = client.get("/products/facets", params={"search": "jogo"}).json()
+    assert data["categories"] == [{"category_id": games.id, "count": 2, "in_stock": 2}]
+
+def test_product_facets_follow_writes(client, admin_token, user_token, db):
+    category = Category(name="Test Category", description="Test")
+    other = Category(name="Other Category", description="Test")
+    db.add_all([category, other])
+    db.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    
+    created = client.post(
+        "/products",
+        json={"name": "Item", "price": 40.00, "stock": 1, "category_id": category.id},
+        headers=headers
+    ).json()
+    client.post(
+        "/products",
+        json={"name": "Outro", "price": 40.00, "stock": 3, "category_id": category.id},
+        headers=headers
+    )
+    
+    # Reserva de estoque (UPDATE em massa) zerando o estoque do primeiro produto
+    response = client.post(
+        "/orders",
+        json={"items": [{"product_id": created["id"], "quantity": 1}]},
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+    assert response.status_code == 201
+    data = client.get("/products/facets").json()
+    assert (data["total"], data["in_stock"]) == (2, 1)
+    
+    client.put(
+        f"/products/{created['id']}",
+        json={"price": 400.00, "category_id": other.id},
+        headers=headers
+    )
+    data = client.get("/products/facets").json()
+    assert data["categories"] == [
+        {"category_id": category.id, "count": 1, "in_stock": 1},
+        {"category_id": other.id, "count": 1, "in_stock": 0},
+    ]
+    
+    client.delete(f"/products/{created['id']}", headers=headers)
+    data = client.get("/products/facets").json()
+    assert data["total"] == 1
+    assert [c["category_id"] for c in data["categories"]] == [category.id]
+
+def test_bulk_import_ndjson(client, admin_token, db, query_counter):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    existing = Product(name="Existing", description="Old", price=10.00, stock=1, category_id=category.id)
+    db.add(existing)
+    db.commit()
+    
+    lines = [
+        json.dumps({"name": f"Imported {i}", "price": 5.0 + i, "stock": i, "category_id": category.id})
+        for i in range(5)
+    ]
+    lines += [
+        json.dumps({"id": existing.id, "price": 12.5, "description": None}),
+        json.dumps({"name": "Sem preço", "stock": 1, "category_id": category.id}),
+        json.dumps({"name": "Sem categoria", "price": 1.0, "stock": 1, "category_id": 999}),
+        json.dumps({"id": 999, "price": 1.0}),
+        "{not json",
+    ]
+    query_counter.clear()
+    response = client.post(
+        "/products/import?batch_size=100",
+        content="\n".join(lines),
+        headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 5
+    assert report["updated"] == 1
+    assert [(e["row"], e["error"].split(":")[0]) for e in report["errors"]] == [
+        (7, "price"), (8, "Categoria 999 não encontrada"), (9, "Produto 999 não encontrado"), (10, "Registro malformado"),
+    ]
+    # Um lote: categorias, produtos existentes, INSERT multi-row e upsert
+    writes = [s for s in query_counter if s.startswith(("INSERT INTO products", "UPDATE products"))]
+    assert len(writes) == 2
+    
+    db.expire_all()
+    updated = db.query(Product).filter(Product.id == existing.id).one()
+    assert (updated.name, updated.price, updated.description) == ("Existing", 12.5, None)
+    assert db.query(Product).count() == 6
+    assert client.get("/products/facets").json()["total"] == 6
+
+def test_bulk_import_csv_in_batches(client, admin_token, db):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+    
+    rows = [f'Produto {i},"Linha 1\nLinha 2, com vírgula",{i + 1}.5,{i},{category.id}' for i in range(7)]
+    body = "name,description,price,stock,category_id\n" + "\n".join(rows) + "\n"
+    response = client.post(
+        "/products/import?batch_size=3",
+        content=body,
+        headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 7, "updated": 0, "errors": []}
+    product = db.query(Product).filter(Product.name == "Produto 6").one()
+    assert product.description == "Linha 1\nLinha 2, com vírgula"
+    assert product.price == 7.5
+
+def test_bulk_import_requires_admin(client, user_token):
+    response = client.post(
+        "/products/import", content="{}", headers={"Authorization": f"Bearer {user_token}"}
+    )
+    assert response.status_code == 403
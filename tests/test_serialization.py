@@ -0,0 +1,72 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from app.config import settings
+from app.models.category import Category
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.utils.cache import catalog_cache
+
+# FAST_JSON_RESPONSES depende do orjson, que não está em requirements.txt
+pytest.importorskip("orjson")
+
+def _seed(db, user):
+    category = Category(name="Test Category", description=None)
+    db.add(category)
+    db.commit()
+    products = [
+        Product(name=f"Produto {i}", description="Sem fio" if i % 2 else None, price=10.5 * (i + 1),
+                stock=i, category_id=category.id, created_at=datetime(2024, 1, 1, 10, 0, 0, 123456))
+        for i in range(5)
+    ]
+    db.add_all(products)
+    db.commit()
+    for i in range(3):
+        order = Order(user_id=user.id, total=10.0, created_at=datetime(2024, 1, 1 + i))
+        order.items = [OrderItem(product_id=products[i].id, quantity=1, price=10.0)]
+        db.add(order)
+    db.commit()
+
+def _fetch(client, path, params, headers, monkeypatch, fast):
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", fast)
+    catalog_cache.clear()
+    response = client.get(path, params=params, headers=headers)
+    assert response.status_code == 200
+    # object_pairs_hook preserva a ordem das chaves para a comparação
+    return json.loads(response.text, object_pairs_hook=list)
+
+def test_fast_path_matches_response_models(client, admin_token, test_admin, db, monkeypatch):
+    _seed(db, test_admin)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    
+    for path, params in [
+        ("/products", {}),
+        ("/products", {"cursor": "", "limit": 2}),
+        ("/products", {"search": "fio"}),
+        ("/categories", {}),
+        ("/categories", {"cursor": ""}),
+        ("/orders", {}),
+        ("/orders/admin/all", {"cursor": "", "limit": 2}),
+    ]:
+        expected = _fetch(client, path, params, headers, monkeypatch, fast=False)
+        assert _fetch(client, path, params, headers, monkeypatch, fast=True) == expected, path
+
+def test_fast_path_skips_orm_hydration(client, user_token, test_user, db, monkeypatch, query_counter):
+    _seed(db, test_user)
+    headers = {"Authorization": f"Bearer {user_token}"}
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    client.get("/auth/me", headers=headers)
+    
+    query_counter.clear()
+    response = client.get("/orders", headers=headers)
+    assert [len(order["items"]) for order in response.json()] == [1, 1, 1]
+    # Pedidos + itens com nome do produto
+    assert len(query_counter) == 2
+    
+    # Cache hit também sai pela resposta pronta
+    client.get("/products")
+    query_counter.clear()
+    assert len(client.get("/products").json()) == 5
+    assert query_counter == []
@@ -0,0 +1,183 @@
+import threading
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import sessionmaker
+from app.models.category import Category
+from app.models.product import Product
+from app.utils.stock import (
+    InsufficientStockError, UnknownProductsError, adjust_stock, fold_adjustments, reserve_stock
+)
+
+def _create_products(db, *stocks):
+    category = Category(name="Test Category", description="Test")
+    db.add(category)
+    db.commit()
+
+    products = [
+        Product(name=f"Product {i}", price=10.00, stock=stock, category_id=category.id)
+        for i, stock in enumerate(stocks)
+    ]
+    db.add_all(products)
+    db.commit()
+    return [product.id for product in products]
+
+def test_reserve_stock_decrements(db):
+    first, second = _create_products(db, 10, 5)
+
+    reserve_stock(db, {first: 3, second: 5})
+    db.commit()
+
+    assert db.get(Product, first).stock == 7
+    assert db.get(Product, second).stock == 0
+
+def test_reserve_stock_reports_each_shortage_and_rolls_back(db):
+    first, second, third = _create_products(db, 10, 1, 0)
+
+    with pytest.raises(InsufficientStockError) as exc_info:
+        reserve_stock(db, {first: 3, second: 2, third: 1})
+
+    shortages = exc_info.value.shortages
+    assert [s.product_id for s in shortages] == [second, third]
+    assert shortages[0].requested == 2
+    assert shortages[0].available == 1
+    assert db.get(Product, first).stock == 10
+
+def test_reserve_stock_reports_shortage_restocked_after_rollback(db):
+    first, second = _create_products(db, 10, 0)
+    engine = db.get_bind()
+
+    def restock(session):
+        # Reposição concorrente entre o UPDATE que falhou e a releitura
+        with engine.connect() as other:
+            other.execute(text("UPDATE products SET stock = 5 WHERE id = :id"), {"id": second})
+            other.commit()
+
+    event.listen(db, "after_rollback", restock, once=True)
+    with pytest.raises(InsufficientStockError) as exc_info:
+        reserve_stock(db, {first: 1, second: 1})
+
+    assert [s.product_id for s in exc_info.value.shortages] == [second]
+    assert exc_info.value.detail == "Estoque insuficiente para Product 1. Disponível: 5"
+
+def test_concurrent_reservations_never_oversell(db):
+    stock = 50
+    (product_id,) = _create_products(db, stock)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+
+    threads_count = 16
+    attempts_per_thread = 10
+    successes = []
+    failures = []
+    barrier = threading.Barrier(threads_count)
+
+    def worker():
+        session = Session()
+        barrier.wait()
+        try:
+            for _ in range(attempts_per_thread):
+                try:
+                    reserve_stock(session, {product_id: 1})
+                    session.commit()
+                    successes.append(1)
+                except InsufficientStockError:
+                    failures.append(1)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    db.expire_all()
+    assert len(successes) == stock
+    assert len(failures) == threads_count * attempts_per_thread - stock
+    assert db.get(Product, product_id).stock == 0
+
+def test_fold_adjustments_applies_in_order():
+    deltas, levels = fold_adjustments([
+        (1, 5, None), (1, -2, None),
+        (2, 4, None), (2, None, 10), (2, -3, None),
+    ])
+    assert deltas == {1: 3}
+    assert levels == {2: 7}
+
+    with pytest.raises(ValueError):
+        fold_adjustments([(1, None, 1), (1, -2, None)])
+
+def test_adjust_stock_returns_levels_and_is_atomic(db):
+    first, second, third = _create_products(db, 10, 5, 2)
+
+    assert adjust_stock(db, {first: -4, second: 3}, {third: 50}) == {first: 6, second: 8, third: 50}
+    db.commit()
+
+    with pytest.raises(InsufficientStockError) as exc_info:
+        adjust_stock(db, {first: -7, second: 1}, {third: 0})
+    assert [(s.product_id, s.requested, s.available) for s in exc_info.value.shortages] == [(first, 7, 6)]
+    db.expire_all()
+    assert [db.get(Product, pid).stock for pid in (first, second, third)] == [6, 8, 50]
+
+    with pytest.raises(UnknownProductsError) as exc_info:
+        adjust_stock(db, {first: 1, 999: 1}, {})
+    assert exc_info.value.product_ids == [999]
+
+def test_adjust_stock_endpoint(client, admin_token, user_token, db, query_counter):
+    first, second = _create_products(db, 10, 5)
+    body = {"adjustments": [
+        {"product_id": first, "delta": -3},
+        {"product_id": second, "stock": 20},
+        {"product_id": first, "delta": 1},
+    ]}
+
+    assert client.patch(
+        "/products/stock", json=body, headers={"Authorization": f"Bearer {user_token}"}
+    ).status_code == 403
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    client.get("/auth/me", headers=headers)
+    query_counter.clear()
+    response = client.patch("/products/stock", json=body, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == [{"product_id": first, "stock": 8}, {"product_id": second, "stock": 20}]
+    # SELECT de trava + UPDATE dos deltas + UPDATE dos valores absolutos
+    assert len(query_counter) == 3
+
+    response = client.patch(
+        "/products/stock", json={"adjustments": [{"product_id": first, "delta": -9}]}, headers=headers
+    )
+    assert response.status_code == 400
+    response = client.patch(
+        "/products/stock", json={"adjustments": [{"product_id": first, "delta": 1, "stock": 1}]}, headers=headers
+    )
+    assert response.status_code == 422
+
+def test_adjustments_concurrent_with_reservations(db):
+    stock = 100
+    (product_id,) = _create_products(db, stock)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind())
+    rounds = 20
+    barrier = threading.Barrier(8)
+
+    def worker(operation):
+        session = Session()
+        barrier.wait()
+        try:
+            for _ in range(rounds):
+                operation(session)
+                session.commit()
+        finally:
+            session.close()
+
+    reserve = lambda session: reserve_stock(session, {product_id: 1})
+    restock = lambda session: adjust_stock(session, {product_id: 2}, {})
+    threads = [threading.Thread(target=worker, args=(reserve if i % 2 else restock,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Nenhuma baixa de pedido é sobrescrita pelos ajustes relativos
+    db.expire_all()
+    assert db.get(Product, product_id).stock == stock + 4 * rounds * 2 - 4 * rounds
+